@@ -1,9 +1,26 @@
 import os
+import time
 import discord
+from utils.runtime import GatewayProfile, report_startup
 import logging
 from datetime import datetime
-from discord.ext import commands
+from discord.ext import commands, tasks
 from utils.database import Database
+from utils.outcomes import create_outcome_engine
+from utils.outbound import OutboundScheduler
+from utils.log_digest import LogAggregator
+from utils.scheduler import Scheduler
+from utils.sticky import StickyManager
+from utils.autocomplete import AutocompleteRegistry
+from utils.command_sync import CommandSyncer
+from utils.loop_monitor import LoopMonitor
+from utils.pressure import PressurePolicy
+from utils.metrics import MetricsRegistry, MetricsServer, json_body
+from utils.health import HealthCheck
+from utils.shutdown import GracefulShutdown
+from utils.actors import GuildActors
+from utils.tracing import Tracer, TracingCommandTree, instrument, instrument_http
+from utils.auto_defer import AutoDeferrer, AutoDeferCommandTree
 import colorlog
 from dotenv import load_dotenv
 
@@ -45,7 +62,56 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Load configuration from environment variables
-DEV_GUILD_ID = int(os.getenv('DEV_GUILD_ID'))
+DEV_GUILD_ID = int(os.getenv('DEV_GUILD_ID')) if os.getenv('DEV_GUILD_ID') else None
+# Dev mode syncs commands to DEV_GUILD_ID only, which applies instantly
+DEV_MODE = os.getenv('DEV_MODE', 'false').lower() in ('1', 'true', 'yes')
+# Seconds between writes of the cached database to disk
+DB_FLUSH_INTERVAL = float(os.getenv('DB_FLUSH_INTERVAL', 5))
+
+# Extensions loaded at startup, in logical groups
+EXTENSIONS = [
+    # Core functionality and help system
+    'cogs.Core.help',
+
+    # Economy system - daily rewards, balance checking, shop
+    'cogs.Economy.daily',
+    'cogs.Economy.balance',
+    'cogs.Economy.shop',
+    'cogs.Economy.colour',
+
+    # Gaming features - casino games and leaderboards
+    'cogs.Games.roulette',
+    'cogs.Games.blackjack',
+    'cogs.Games.slots',
+    'cogs.Games.leaderboard',
+    'cogs.Games.barreltime',
+
+    # Moderation tools and user management
+    'cogs.Moderation.moderation',
+    'cogs.Moderation.setup',
+    'cogs.Moderation.warning_expiry',
+    'cogs.Moderation.pruning',
+    'cogs.Moderation.owner',
+
+    # Social features and user engagement
+    'cogs.Core.greet',
+    'cogs.Core.introsticky',
+    'cogs.Core.tiers',
+    'cogs.Core.whisper',
+    'cogs.Core.bump',
+]
+
+class BotCommandTree(TracingCommandTree, AutoDeferCommandTree):
+    """
+    Command tree that refuses new commands while the bot shuts down and tracks
+    running ones, tracing each and deferring those slow to respond.
+    """
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        if await self.client.shutdown.refuse(interaction):
+            return
+        with self.client.shutdown.track():
+            await super()._call(interaction)
 
 class Bot(commands.Bot):
     """
@@ -56,66 +122,200 @@ class Bot(commands.Bot):
     """
     
     def __init__(self):
-        # Enable all intents for maximum functionality
-        intents = discord.Intents.all()
-        super().__init__(command_prefix="!", intents=intents)
+        # Only enable the intents and caches the loaded extensions need (GATEWAY_PROFILE=full enables everything)
+        self.profile = GatewayProfile.from_env(EXTENSIONS)
+        super().__init__(command_prefix="!", tree_cls=BotCommandTree, **self.profile.client_kwargs())
+        logger.info("Using the %s", self.profile.describe())
+
+        # Spans for interactions, events, database calls and Discord requests, sampled per trace
+        self.tracer = Tracer(sample_rate=float(os.getenv('TRACE_SAMPLE_RATE', 0.1)))
+        self.event_sample_rate = float(os.getenv('TRACE_EVENT_SAMPLE_RATE', 0.01))
+        instrument_http(self.http, self.tracer)
         
-        # Initialize database connection
-        self.db = Database()
+        # Initialize database connection, keeping at most HOT_USER_BUDGET users in memory
+        self.db = Database(hot_user_budget=int(os.getenv('HOT_USER_BUDGET', 10000)))
+        instrument(self.db, "db", self.tracer)
+
+        # Per-guild queues that serialise wagers and other check-then-write changes
+        self.actors = GuildActors()
+
+        # Shared RNG and game tables for the casino cogs
+        self.outcomes = create_outcome_engine(os.getenv('OUTCOME_MODE'), os.getenv('OUTCOME_SEED'))
+
+        # Rate limited, coalescing queue for every bot-initiated channel message
+        self.outbound = OutboundScheduler()
+
+        # Batches log channel events per guild into digest embeds
+        self.log_digest = LogAggregator(self, window=float(os.getenv('LOG_DIGEST_WINDOW', 10)))
+
+        # Durable timer for reminders and other delayed jobs
+        self.scheduler = Scheduler(self)
+
+        # Debounced sticky messages (intro template and staff stickies)
+        self.stickies = StickyManager(self, quiet_period=float(os.getenv('STICKY_QUIET_PERIOD', 5)))
+
+        # Indexed, cached autocomplete shared by every cog
+        self.autocomplete = AutocompleteRegistry()
+
+        # Defers commands that haven't responded within AUTO_DEFER_AFTER seconds (0 disables)
+        self.auto_defer = AutoDeferrer(threshold=float(os.getenv('AUTO_DEFER_AFTER', 2)))
+
+        # Only syncs application commands when the command tree changes
+        self.command_syncer = CommandSyncer(self)
+
+        # Loop lag sampler and slow callback detector
+        self.loop_monitor = LoopMonitor(
+            interval=float(os.getenv('LOOP_LAG_INTERVAL', 0.5)),
+            threshold=float(os.getenv('SLOW_CALLBACK_THRESHOLD', 0.25)),
+        )
+
+        # Sheds cosmetic work while loop lag or the outbound queue are over their thresholds
+        self.pressure = PressurePolicy(
+            self,
+            lag_enter=float(os.getenv('SHED_LAG_ENTER', 0.5)),
+            lag_exit=float(os.getenv('SHED_LAG_EXIT', 0.1)),
+            outbound_enter=int(os.getenv('SHED_OUTBOUND_ENTER', 200)),
+            outbound_exit=int(os.getenv('SHED_OUTBOUND_EXIT', 50)),
+            min_seconds=float(os.getenv('SHED_MIN_SECONDS', 30)),
+        )
+
+        # Service metrics, served over HTTP (METRICS_PORT=0 disables the server)
+        self.metrics = MetricsRegistry()
+        self.metrics_server = MetricsServer(
+            self.metrics, host=os.getenv('METRICS_HOST', '127.0.0.1'), port=int(os.getenv('METRICS_PORT', 9108))
+        )
+        self.metrics_server.route('/slow-callbacks', self.slow_callbacks_route)
+
+        # Liveness and readiness probes, served next to the metrics
+        self.db_migrated = False
+        self.last_flush = None
+        self.health = HealthCheck(self, flush_stale_after=max(60, DB_FLUSH_INTERVAL * 10))
+        self.metrics_server.route('/healthz', self.health.healthz)
+        self.metrics_server.route('/readyz', self.health.readyz)
+
+        # Drains interactions, jobs and queued messages before disconnecting
+        self.shutdown = GracefulShutdown(self, deadline=float(os.getenv('SHUTDOWN_DEADLINE', 15)))
         
     async def setup_hook(self):
         """
         Set up the bot by running database migration and loading all cogs.
         This runs once when the bot starts up.
         """
+        # Shut down cleanly on SIGTERM/SIGINT
+        self.shutdown.install_signal_handlers()
+
+        # Serve health checks first, so startup can be probed (not ready until connected)
+        if self.metrics_server.port:
+            await self.metrics_server.start()
+
         # Run database migration to ensure schema is up to date
         self.db.migrate_database()
+        self.db_migrated = True
         logger.info("Database migration completed")
+
+        # Check the gold ledger agrees with the balances in the database
+        mismatches = self.db.ledger.audit(self.db.get_gold_balances())
+        if mismatches:
+            logger.warning("Gold ledger disagrees with the database for %s users, e.g. %s", len(mismatches), mismatches[:5])
         
         # Load all cogs in logical groups
         logger.info("Loading bot extensions...")
-        
-        # Core functionality and help system
-        await self.load_extension('cogs.Core.help')
-        
-        # Economy system - daily rewards, balance checking, shop
-        await self.load_extension('cogs.Economy.daily')
-        await self.load_extension('cogs.Economy.balance')
-        await self.load_extension('cogs.Economy.shop')
-        await self.load_extension('cogs.Economy.colour')
-        
-        # Gaming features - casino games and leaderboards  
-        await self.load_extension('cogs.Games.roulette')
-        await self.load_extension('cogs.Games.blackjack')
-        await self.load_extension('cogs.Games.slots')
-        await self.load_extension('cogs.Games.leaderboard')
-        await self.load_extension('cogs.Games.barreltime')
-        
-        # Moderation tools and user management
-        await self.load_extension('cogs.Moderation.moderation')
-        await self.load_extension('cogs.Moderation.setup')
-        await self.load_extension('cogs.Moderation.warning_expiry')
-        
-        # Social features and user engagement
-        await self.load_extension('cogs.Core.greet')
-        await self.load_extension('cogs.Core.introsticky')
-        await self.load_extension('cogs.Core.tiers')
-        await self.load_extension('cogs.Core.whisper')
-        await self.load_extension('cogs.Core.bump')
+        for extension in EXTENSIONS:
+            await self.load_extension(extension)
         
         logger.info("All extensions loaded successfully")
+
+        # Start the job scheduler now every cog has registered its job types
+        self.scheduler.start()
+
+        # Write database changes to disk on a timer
+        self.flush_database.start()
+
+        # Watch the event loop, shed load when it struggles and export every service's metrics
+        self.loop_monitor.start()
+        self.pressure.start()
+        self.register_metrics()
+
+        # Sync application commands once per process, and only if they changed
+        if DEV_MODE and not DEV_GUILD_ID:
+            logger.error("DEV_MODE is set but DEV_GUILD_ID is not, syncing globally instead")
+        await self.sync_commands()
+
+    async def sync_commands(self) -> bool:
+        """Sync application commands if the tree changed since the last sync, returns whether it synced."""
+        return await self.command_syncer.sync(dev_guild_id=DEV_GUILD_ID if DEV_MODE else None)
         
     async def on_ready(self):
         """
         Event handler that runs when the bot successfully connects to Discord.
-        Syncs slash commands and logs connection status.
+        Logs connection status, commands are synced in setup_hook so
+        reconnects don't resync them.
         """
         logger.info(f'Logged in as {self.user} (ID: {self.user.id})')
         logger.info('------')
+        report_startup(self, self.profile)
+
+    def register_metrics(self):
+        """Register the stats of every bot-level service (cogs register their own)."""
+        self.metrics.register('loop', self.loop_monitor.stats)
+        self.metrics.register('pressure', self.pressure.stats)
+        self.metrics.register('outbound', self.outbound.stats)
+        self.metrics.register('log_digest', self.log_digest.stats)
+        self.metrics.register('scheduler', self.scheduler.stats)
+        self.metrics.register('stickies', self.stickies.stats)
+        self.metrics.register('autocomplete', self.autocomplete.stats)
+        self.metrics.register('auto_defer', self.auto_defer.stats)
+        self.metrics.register('ledger', self.db.ledger.stats)
+        self.metrics.register('db_users', self.db.get_user_stats)
+        self.metrics.register('db', lambda: {'pending_writes': self.db.pending_writes()})
+        self.metrics.register('archive', self.db.archive.stats)
+        self.metrics.register('actors', self.actors.stats)
+        self.metrics.register('tracing', self.tracer.stats)
+        self.metrics.register('health', self.health.stats)
 
-        # Sync application commands (slash commands) globally
-        await self.tree.sync()
-        logger.info("Successfully synced global commands")
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        """Run each gateway event listener in its own root span."""
+        with self.tracer.span(f"event {event_name}", "consumer", sample_rate=self.event_sample_rate):
+            await super()._run_event(coro, event_name, *args, **kwargs)
+
+    async def slow_callbacks_route(self):
+        """Recent slow callbacks with their stacks, newest first."""
+        return 200, 'application/json', json_body(self.loop_monitor.recent(stacks=True))
+
+    @tasks.loop(seconds=DB_FLUSH_INTERVAL)
+    async def flush_database(self):
+        """Write cached database changes to disk."""
+        try:
+            await self.db.flush_async()
+            self.last_flush = time.time()
+        except Exception:
+            logger.exception("Failed to flush the database, retrying next interval")
+
+    async def close(self):
+        """
+        Stop taking interactions and drain in-flight work, close the connection,
+        then write anything still cached in the database.
+        """
+        if self.shutdown.finished:
+            return await super().close()
+        if self.shutdown.stopping:
+            return  # Another close is already draining
+        try:
+            await self.shutdown.drain()
+        except Exception:
+            logger.exception("Error while draining, closing anyway")
+        self.flush_database.cancel()
+        self.loop_monitor.stop()
+        self.pressure.stop()
+        await self.metrics_server.close()
+        await super().close()
+        # Ordered after any flush the cancelled loop left writing in its thread
+        await self.db.flush_async()
+        self.db.ledger.close()
+        self.db.cold.close()
+        self.tracer.close()
+        self.shutdown.finished = True
+        logger.info("Database flushed, shutdown complete")
 
 def main():
     """
@@ -1,7 +1,8 @@
-import discord, asyncio, logging
+import discord, logging
 from discord import app_commands
 from discord.ext import commands
-from datetime import datetime
+from datetime import datetime, timedelta
+from utils.outbound import PRIORITY_HIGH
 
 class Bump(commands.Cog):
     """
@@ -15,16 +16,19 @@ class Bump(commands.Cog):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
         self.logger.info("Bump reminder system loaded successfully")
-        self.reminder_tasks = {}  # Track active reminder tasks per guild 
+        # Reminders are persisted jobs so they survive restarts
+        self.bot.scheduler.register("bump_reminder", self.send_bump_reminder)
 
-    async def bump_reminder_after_delay(self, guild_id):
+    def cog_unload(self):
+        self.bot.scheduler.unregister("bump_reminder")
+
+    async def send_bump_reminder(self, guild_id):
         """
-        Send a bump reminder after the 2-hour cooldown period.
+        Send a bump reminder once the 2-hour cooldown period is over.
         
-        Waits exactly 2 hours (7200 seconds) then sends a reminder
+        Run by the scheduler 2 hours after a bump, sends a reminder
         to the configured bump role in the bot channel.
         """
-        await asyncio.sleep(7200)  # Wait 2 hours for bump cooldown
         guild = self.bot.get_guild(guild_id)
 
         # Verify guild still exists
@@ -67,14 +71,9 @@ class Bump(commands.Cog):
         )
         embed.timestamp = datetime.utcnow()
 
-        # Send the reminder to the configured channel
-        try:
-            await channel.send(content=f"{bump_role.mention}", embed=embed)
-            self.logger.info("Sent bump reminder to %s in #%s", guild.name, channel.name)
-        except discord.Forbidden:
-            self.logger.warning("Cannot send messages in %s #%s", guild.name, channel.name)
-        except Exception as e:
-            self.logger.exception("Error sending bump reminder to %s: %s", guild.name, e)
+        # Queue the reminder for the configured channel
+        self.bot.outbound.send(channel, content=f"{bump_role.mention}", embed=embed, priority=PRIORITY_HIGH)
+        self.logger.info("Queued bump reminder for %s in #%s", guild.name, channel.name)
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -99,24 +98,16 @@ class Bump(commands.Cog):
                         description=f"We will remind you once you can bump again!",
                         color=discord.Color.gold()
                     )
-                    await message.channel.send(embed=thank_embed)
-                    self.logger.info("Detected bump, sent thank you message.")  
+                    self.bot.outbound.send(message.channel, embed=thank_embed)
+                    self.logger.info("Detected bump, queued thank you message.")  
 
                 except Exception as e:
                     self.logger.exception("Error sending thank you message after bump: %s", e)
 
-                # Manage reminder scheduling for this guild
+                # Schedule the reminder for this guild, replacing any pending one
                 guild_id = message.guild.id 
-                
-                # Cancel any existing reminder task for this guild
-                if guild_id in self.reminder_tasks:
-                    task = self.reminder_tasks[guild_id]  
-                    if not task.done():
-                        task.cancel()  
-                        self.logger.info("Cancelled previous bump reminder for guild %s", guild_id)
-            
-                # Schedule a new reminder task for this guild
-                self.reminder_tasks[guild_id] = asyncio.create_task(self.bump_reminder_after_delay(guild_id))
+                run_at = datetime.utcnow() + timedelta(hours=2)
+                self.bot.scheduler.schedule("bump_reminder", guild_id, run_at, {"guild_id": guild_id})
                 self.logger.info("Scheduled new bump reminder for guild %s in 2 hours.", guild_id)
 
 async def setup(bot):
@@ -51,16 +51,11 @@ class JoinLeaveListener(commands.Cog):
                 if channel is None:
                     self.logger.warning("Welcome channel not found (ID: %s) in %s", channel_id, guild.name)
                 else:
-                    try:
-                        await channel.send(content=user.mention, embed=embed)
-                    except discord.Forbidden:
-                        self.logger.warning("Missing permissions in #%s in %s", channel.name, guild.name)
-                    except discord.HTTPException as e:
-                        self.logger.error("Failed to send to welcome channel in %s: %s", guild.name, e)
+                    self.bot.outbound.send(channel, content=user.mention, embed=embed)
         
-            # Create user database entry for new members (skip bots)
+            # Create user database entry for new members, or restore a returning member's (skip bots)
             if not user.bot:
-                self.bot.db.get_user(guild_id, user_id)
+                self.bot.db.mark_returned(guild_id, user_id)
 
             # Send delayed guidance message in general channel for new members
             if not user.bot:
@@ -99,10 +94,7 @@ class JoinLeaveListener(commands.Cog):
                         value="The Cavern operates a gold based economy. Get your `/daily` reward streak going and checkout what we have in the `/shop`, (or gamble it away with `/games`)",
                         inline=False
                     )
-                    try:
-                        await general_channel.send(content=user.mention, embed=embed2)
-                    except Exception as e:
-                        self.logger.warning("Failed to send delayed general welcome: %s", e)
+                    self.bot.outbound.send(general_channel, content=user.mention, embed=embed2)
         except Exception as e:
             self.logger.exception("Error handling member join for user_id=%s in guild_id=%s", user.id, getattr(user.guild, 'id', None))
 
@@ -112,7 +104,7 @@ class JoinLeaveListener(commands.Cog):
         Handle member leaving The Cavern.
         
         Sends a themed goodbye message in the configured goodbye channel
-        and ensures user data is preserved in the database.
+        and marks their user data as departed in the database.
         """
         self.logger.info("Member left: user_id=%s in guild_id=%s", user.id, user.guild.id)
         try:
@@ -141,16 +133,12 @@ class JoinLeaveListener(commands.Cog):
                 if channel is None:
                     self.logger.warning("Goodbye channel not found (ID: %s) in %s", channel_id, guild.name)
                 else:
-                    try:
-                        await channel.send(embed=embed)
-                    except discord.Forbidden:
-                        self.logger.warning("Missing permissions in #%s in %s", channel.name, guild.name)
-                    except discord.HTTPException as e:
-                        self.logger.error("Failed to send to goodbye channel in %s: %s", guild.name, e)
+                    self.bot.outbound.send(channel, embed=embed)
 
-            # Ensure user data exists in database (preserves data for possible return)
+            # Note when they left so pruning can archive their data later, without
+            # creating a record for members who never had one
             if not user.bot:
-                self.bot.db.get_user(guild_id, user_id)
+                self.bot.db.mark_departed(guild_id, user_id)
         except Exception as e:
             self.logger.exception("Error handling member remove for user_id=%s in guild_id=%s", user.id, getattr(user.guild, 'id', None))
 
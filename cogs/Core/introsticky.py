@@ -18,10 +18,11 @@ sticky_template = (
 
 class IntroSticky(commands.Cog):
     """
-    Introduction channel sticky message system for The Cavern.
+    Sticky message system for The Cavern.
     
     Maintains a persistent template message at the bottom of the
-    introductions channel to guide new members on how to introduce themselves.
+    introductions channel to guide new members on how to introduce themselves,
+    plus any number of staff-configured sticky messages in other channels.
     """
     
     def __init__(self, bot):
@@ -29,61 +30,135 @@ class IntroSticky(commands.Cog):
         self.logger = logging.getLogger(__name__)
         self.logger.info("Intro sticky system loaded successfully")
 
+    async def cog_load(self):
+        # Register the intro template and custom stickies of every guild
+        for guild_id_str, guild_data in self.bot.db.data.items():
+            guild_id = int(guild_id_str)
+            self.register_intro(guild_id, guild_data.get("intros_channel"), guild_data.get("last_intro_id"))
+            for channel_id, sticky in guild_data.get("stickies", {}).items():
+                self.bot.stickies.register(guild_id, int(channel_id), sticky["content"], sticky.get("message_id"), persist=self.persist_sticky)
+        self.logger.info("Registered %s sticky channels", len(self.bot.stickies.stickies))
+
+    def cog_unload(self):
+        for channel_id in list(self.bot.stickies.stickies):
+            self.bot.stickies.unregister(channel_id)
+
+    # Hand the latest message ids and waiting reposts to the reloaded cog
+    def export_state(self):
+        stickies = self.bot.stickies.stickies.values()
+        return {
+            "message_ids": {sticky.channel_id: sticky.message_id for sticky in stickies},
+            "pending": [sticky.channel_id for sticky in stickies if sticky.timer and not sticky.timer.done()],
+        }
+
+    def import_state(self, state):
+        for channel_id, message_id in state["message_ids"].items():
+            sticky = self.bot.stickies.get(channel_id)
+            if sticky and message_id:
+                sticky.message_id = message_id
+        # Restart the quiet period of reposts that were waiting
+        for channel_id in state["pending"]:
+            self.bot.stickies.touch(channel_id)
+
+    # Register a guild's intros channel with the sticky engine
+    def register_intro(self, guild_id: int, channel_id, message_id=None):
+        if channel_id:
+            self.bot.stickies.register(guild_id, int(channel_id), sticky_template, message_id, persist=self.persist_intro)
+
+    # Save the intro template's new message id after a repost
+    def persist_intro(self, sticky):
+        self.bot.db.set_intro_id(sticky.guild_id, sticky.message_id)
+
+    # Save a custom sticky's new message id after a repost
+    def persist_sticky(self, sticky):
+        self.bot.db.set_sticky_message(sticky.guild_id, sticky.channel_id, sticky.message_id)
+
+    @commands.Cog.listener()
+    async def on_intros_channel_update(self, guild_id: int, channel_id: int):
+        """Move the intro template when staff change the intros channel."""
+        for sticky in self.bot.stickies.for_guild(guild_id):
+            if sticky.persist == self.persist_intro:
+                self.bot.stickies.unregister(sticky.channel_id)
+        self.register_intro(guild_id, channel_id)
+        self.logger.info("Intro sticky moved to channel %s in guild %s", channel_id, guild_id)
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """
-        Maintain sticky template message in introductions channel.
+        Keep sticky messages at the bottom of their channels.
         
-        When a message is sent in the configured intros channel, deletes the
-        previous template message and posts a new one to keep it at the bottom.
+        Any member message in a sticky channel restarts that channel's quiet
+        period, once it passes the old sticky is deleted and a new one posted.
         """
-        self.logger.info("Processing message for intro sticky in guild_id=%s, user_id=%s", getattr(message.guild, 'id', None), getattr(message.author, 'id', None))
         try:
             # Skip bot messages and DMs
             if message.author.bot or not message.guild:
                 return
 
-            guild = message.guild
-            guild_id = message.guild.id
+            self.bot.stickies.touch(message.channel.id)
+        except Exception as e:
+            self.logger.exception("Error handling sticky message event in guild_id=%s, user_id=%s", getattr(message.guild, 'id', None), getattr(message.author, 'id', None))
 
-            # Check if this guild has an intros channel configured
-            channel_id = self.bot.db.get_intros_channel(guild_id)
+    sticky = app_commands.Group(
+        name='sticky',
+        description='Manage sticky messages (Staff only)',
+        allowed_installs=discord.app_commands.AppInstallationType(guild=True),
+        allowed_contexts=discord.app_commands.AppCommandContext(guild=True)
+    )
 
-            if not channel_id:
-                self.logger.warning("No intros channel set for guild %s", guild.name)
-                return
-        
-            # Only process messages in the designated intros channel
-            if str(message.channel.id) != str(channel_id):
-                return
-        
-            # Verify the intros channel still exists
-            channel = guild.get_channel(int(channel_id))
-            if channel is None:
-                self.logger.warning("Intro channel not found (ID: %s) in %s", channel_id, guild.name)
-                return
+    @sticky.command(name="set", description="Keep a message at the bottom of a channel (Staff only)")
+    @app_commands.describe(channel="The channel to keep the message in", message="The sticky message")
+    async def set_sticky(self, interaction: discord.Interaction, channel: discord.TextChannel, message: str):
+        self.logger.info("Command invoked by user_id=%s in guild_id=%s to set sticky in channel_id=%s", interaction.user.id, interaction.guild.id, channel.id)
+        try:
+            guild_id = interaction.guild.id
 
-            # Handle sticky message rotation
-            last_sticky_id = self.bot.db.get_intro_id(guild_id)
+            # Replace any existing sticky in the channel
+            previous = self.bot.stickies.unregister(channel.id)
+            self.bot.db.set_sticky(guild_id, channel.id, message, previous.message_id if previous else None)
+            sticky = self.bot.stickies.register(guild_id, channel.id, message, previous.message_id if previous else None, persist=self.persist_sticky)
 
-            if last_sticky_id is None:
-                # No previous sticky message, create the first one
-                self.logger.info("Creating first sticky message for intro channel in %s", guild.name)
-                sticky = await channel.send(sticky_template)
-                self.bot.db.set_intro_id(guild_id, sticky.id)
+            await interaction.response.send_message(f"Sticky message set in {channel.mention}!", ephemeral=True)
+            await self.bot.stickies.repost(sticky)
+        except Exception as e:
+            self.logger.exception("Error occurred while setting sticky for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
+            error = "An error occurred while setting the sticky message. Please try again later."
+            # The confirmation may already have been sent before the repost or cleanup failed
+            if interaction.response.is_done():
+                await interaction.followup.send(error, ephemeral=True)
             else:
-                # Delete the previous sticky message if it exists
+                await interaction.response.send_message(error, ephemeral=True)
+
+    @sticky.command(name="remove", description="Remove a channel's sticky message (Staff only)")
+    @app_commands.describe(channel="The channel to remove the sticky message from")
+    async def remove_sticky(self, interaction: discord.Interaction, channel: discord.TextChannel):
+        self.logger.info("Command invoked by user_id=%s in guild_id=%s to remove sticky in channel_id=%s", interaction.user.id, interaction.guild.id, channel.id)
+        try:
+            guild_id = interaction.guild.id
+
+            # Only custom stickies can be removed, the intro template follows the intros channel
+            if str(channel.id) not in self.bot.db.get_stickies(guild_id):
+                await interaction.response.send_message(f"{channel.mention} doesn't have a sticky message!", ephemeral=True)
+                return
+
+            sticky = self.bot.stickies.unregister(channel.id)
+            self.bot.db.remove_sticky(guild_id, channel.id)
+            await interaction.response.send_message(f"Removed the sticky message from {channel.mention}.", ephemeral=True)
+
+            # Clean up the last posted sticky
+            if sticky and sticky.message_id:
                 try:
-                    last_message = await message.channel.fetch_message(int(last_sticky_id))
-                    await last_message.delete()
+                    await channel.get_partial_message(sticky.message_id).delete()
                 except (discord.NotFound, discord.Forbidden):
-                    pass  # Message already deleted or can't be deleted
-        
-                # Post new sticky message at the bottom
-                sticky = await message.channel.send(sticky_template)
-                self.bot.db.set_intro_id(guild_id, sticky.id)
+                    pass
         except Exception as e:
-            self.logger.exception("Error handling intro sticky message event in guild_id=%s, user_id=%s", getattr(message.guild, 'id', None), getattr(message.author, 'id', None))
+            self.logger.exception("Error occurred while removing sticky for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
+            error = "An error occurred while removing the sticky message. Please try again later."
+            # The confirmation may already have been sent before the repost or cleanup failed
+            if interaction.response.is_done():
+                await interaction.followup.send(error, ephemeral=True)
+            else:
+                await interaction.response.send_message(error, ephemeral=True)
 
 
 async def setup(bot):
@@ -1,22 +1,76 @@
 import discord
 from discord.ext import commands
+import asyncio
 import logging
+from utils.roles import edit_roles
 
 logger = logging.getLogger(__name__)
 
+# Seconds tier announcements are collected for while the bot sheds load
+ANNOUNCE_BATCH_WINDOW = 60
+# Promotions listed per batched announcement embed
+ANNOUNCE_BATCH_SIZE = 40
+
 class TierListener(commands.Cog):
     """
     User tier and activity tracking system for The Cavern.
     
     Monitors user message activity and automatically promotes users to higher
     tiers based on message count thresholds, assigning appropriate roles.
+    While the bot sheds load, promotions are announced together once a minute
+    per channel instead of one message each.
     """
     
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
+        # Batched announcements waiting per channel id, as (channel, lines)
+        self.pending_announcements = {}
+        self.announce_tasks = {}
         self.logger.info("Tier system cog loaded successfully")
 
+    def cog_unload(self):
+        self.flush_all_announcements()
+
+    # Post waiting announcements before the bot drains its outbound queue
+    async def prepare_shutdown(self):
+        batched = sum(len(lines) for _, lines in self.pending_announcements.values())
+        self.flush_all_announcements()
+        return {"tier_announcements_flushed": batched}
+
+    # Announce a tier upgrade, batched with others in the channel while the bot sheds load
+    def announce(self, channel, member: discord.Member, role: discord.Role, embed: discord.Embed):
+        if not self.bot.pressure.shedding:
+            self.bot.outbound.send(channel, content=f"{member.mention}", embed=embed)
+            return
+        _, lines = self.pending_announcements.setdefault(channel.id, (channel, []))
+        lines.append(f"{member.mention} reached {role.mention}")
+        if channel.id not in self.announce_tasks:
+            self.announce_tasks[channel.id] = asyncio.create_task(self.announce_later(channel))
+
+    async def announce_later(self, channel):
+        await asyncio.sleep(ANNOUNCE_BATCH_WINDOW)
+        del self.announce_tasks[channel.id]
+        self.flush_announcements(channel.id)
+
+    # Post a channel's batched announcements
+    def flush_announcements(self, channel_id: int):
+        channel, lines = self.pending_announcements.pop(channel_id, (None, []))
+        for start in range(0, len(lines), ANNOUNCE_BATCH_SIZE):
+            embed = discord.Embed(
+                title="New tiers reached, thanks for drinking with us!",
+                description="\n".join(lines[start:start + ANNOUNCE_BATCH_SIZE]),
+                color=discord.Color.dark_teal()
+            )
+            self.bot.outbound.send(channel, embed=embed)
+
+    def flush_all_announcements(self):
+        for task in self.announce_tasks.values():
+            task.cancel()
+        self.announce_tasks.clear()
+        for channel_id in list(self.pending_announcements):
+            self.flush_announcements(channel_id)
+
     @commands.Cog.listener()
     async def on_message(self, message):
         """
@@ -70,7 +124,7 @@ class TierListener(commands.Cog):
 
                 # Assign the tier role to the user
                 try:
-                    await message.author.add_roles(role, reason="Tier 2 upgrade")
+                    await edit_roles(message.author, add=[role], reason="Tier 2 upgrade")
                 except Exception as e:
                     self.logger.error(f"Failed to add tier 2 role: {e}")
 
@@ -86,8 +140,8 @@ class TierListener(commands.Cog):
                 if channel is None:
                     self.logger.warning(f"General channel not set or not found for guild {guild_id}")
                     return
-                await channel.send(content=f"{message.author.mention}", embed=embed)
-                self.logger.info(f"Tier 2 upgrade announced successfully")
+                self.announce(channel, message.author, role, embed)
+                self.logger.info(f"Tier 2 upgrade announcement queued")
 
             # Check for tier 3 upgrade (1000 messages)  
             elif message_count >= 1000 and tier == 2:
@@ -109,7 +163,7 @@ class TierListener(commands.Cog):
 
                 # Assign the tier role to the user
                 try:
-                    await message.author.add_roles(role, reason="Tier 3 upgrade")
+                    await edit_roles(message.author, add=[role], reason="Tier 3 upgrade")
                 except Exception as e:
                     self.logger.error(f"Failed to add tier 3 role: {e}")
 
@@ -125,8 +179,8 @@ class TierListener(commands.Cog):
                 if channel is None:
                     self.logger.warning(f"General channel not set or not found for guild {guild_id}")
                     return
-                await channel.send(content=f"{message.author.mention}", embed=embed)
-                self.logger.info(f"Tier 3 upgrade announced successfully")
+                self.announce(channel, message.author, role, embed)
+                self.logger.info(f"Tier 3 upgrade announcement queued")
         except Exception as e:
             self.logger.exception("Error handling tier system message event in guild_id=%s, user_id=%s", getattr(message.guild, 'id', None), getattr(message.author, 'id', None))
 
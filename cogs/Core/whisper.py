@@ -56,8 +56,8 @@ class Whisper(commands.Cog):
             )
             embed.set_footer(text="Whispers are completely anonymous, even to the dev!")
 
-            # Send the whisper to the channel
-            await channel.send(embed=embed)
+            # Queue the whisper for the channel
+            self.bot.outbound.send(channel, embed=embed)
             await interaction.response.send_message("We sent your message in the whisper channel.", ephemeral=True)
         except Exception as e:
             self.logger.exception("Error occurred while processing whisper command for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
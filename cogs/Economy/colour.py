@@ -2,6 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
+from utils.roles import edit_roles
 
 class Colour(commands.Cog):
     """
@@ -15,6 +16,22 @@ class Colour(commands.Cog):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
         self.logger.info("Colour role system loaded successfully")
+        self.bot.autocomplete.register("colour_roles", self.colour_choices)
+
+    def cog_unload(self):
+        self.bot.autocomplete.unregister("colour_roles")
+
+    # List a guild's colour roles that still exist for the autocomplete index
+    def colour_choices(self, guild: discord.Guild):
+        for role_id, role_name in self.bot.db.get_colour_roles(guild.id).items():
+            if guild.get_role(int(role_id)):
+                yield role_name, role_id
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        # Deleted colour roles drop out of the autocomplete index
+        if self.bot.db.is_colour_role(role.guild.id, role.id):
+            self.bot.autocomplete.invalidate("colour_roles", role.guild.id)
 
     colourrole = app_commands.Group(
         name='colorrole', 
@@ -44,6 +61,7 @@ class Colour(commands.Cog):
             
             # Add the role to the database
             self.bot.db.add_colour_role(guild_id, role.id, role.name)
+            self.bot.autocomplete.invalidate("colour_roles", guild_id)
             
             await interaction.response.send_message(f"Successfully added {role.mention} as a colour role!", ephemeral=True)
         except Exception as e:
@@ -64,6 +82,7 @@ class Colour(commands.Cog):
             
             # Remove the role from the database
             self.bot.db.remove_colour_role(guild_id, role.id)
+            self.bot.autocomplete.invalidate("colour_roles", guild_id)
             
             await interaction.response.send_message(f"Successfully removed {role.mention} from color roles!", ephemeral=True)
         except Exception as e:
@@ -72,18 +91,8 @@ class Colour(commands.Cog):
 
     async def colour_autocomplete(self, interaction: discord.Interaction, current: str):
         try:
-            # Get the guild id and its colour roles
-            guild_id = interaction.guild.id
-            colour_roles = self.bot.db.get_colour_roles(guild_id)
-            
-            # Set the choices to the colours in the guild
-            choices = []
-            for role_id, role_name in colour_roles.items():
-                role = interaction.guild.get_role(int(role_id))
-                if role and current.lower() in role_name.lower():
-                    choices.append(app_commands.Choice(name=role_name, value=role_id))
-            
-            return choices[:25]
+            # Look up matching colours in the guild's cached index
+            return self.bot.autocomplete.search("colour_roles", interaction.guild, interaction.user.id, current)
         except Exception as e:
             self.logger.exception("Error occurred for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
             return []
@@ -122,7 +131,7 @@ class Colour(commands.Cog):
             self.logger.exception("Error occurred for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
             await interaction.response.send_message("An error occurred while listing color roles. Please try again later.", ephemeral=True)
 
-    @colour.command(name="set", description="Get a color role")
+    @colour.command(name="set", description="Get a color role", extras={"defer_ephemeral": True})
     @app_commands.autocomplete(colour=colour_autocomplete)
     async def set_colour(self, interaction: discord.Interaction, colour: str):
         self.logger.info("Command invoked by user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
@@ -144,39 +153,26 @@ class Colour(commands.Cog):
                 await interaction.response.send_message("That role no longer exists!", ephemeral=True)
                 return
             
-            # Get the list of colour roles from the db
-            colour_roles = self.bot.db.get_colour_roles(guild_id)
-
-            # Go through the user's roles and remove them if they match a colour from the db
-            for role_id in colour_roles.keys():
-                existing_role = interaction.guild.get_role(int(role_id))
-                if existing_role and existing_role in user.roles:
-                    await user.remove_roles(existing_role)
-            
-            # Add the new colour role
-            await user.add_roles(role)
+            # Swap out any other colour roles for the new one in a single edit
+            colour_role_ids = self.bot.db.get_colour_role_ids(guild_id)
+            await edit_roles(user, add=[role], remove_ids=colour_role_ids - {role.id}, reason="Colour role change")
             
             await interaction.response.send_message(f"You now have the {role.mention} color!", ephemeral=True)
         except Exception as e:
             self.logger.exception("Error occurred for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
             await interaction.response.send_message("An error occurred while setting your color role. Please try again later.", ephemeral=True)
 
-    @colour.command(name="clear", description="Remove your current color role")
+    @colour.command(name="clear", description="Remove your current color role", extras={"defer_ephemeral": True})
     async def clear_colour(self, interaction: discord.Interaction):
         self.logger.info("Command invoked by user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
         try:
             guild_id = interaction.guild.id
             member = interaction.user
             
-            # Remove all colour roles from the user
-            colour_roles = self.bot.db.get_colour_roles(guild_id)
-            removed_roles = []
-            
-            for role_id in colour_roles.keys():
-                role = interaction.guild.get_role(int(role_id))
-                if role and role in member.roles:
-                    await member.remove_roles(role)
-                    removed_roles.append(role.name)
+            # Remove all colour roles from the user in a single edit
+            colour_role_ids = self.bot.db.get_colour_role_ids(guild_id)
+            removed_roles = [role.name for role in member.roles if role.id in colour_role_ids]
+            await edit_roles(member, remove_ids=colour_role_ids, reason="Colour role cleared")
             
             if removed_roles:
                 await interaction.response.send_message(f"Removed color roles: {', '.join(removed_roles)}", ephemeral=True)
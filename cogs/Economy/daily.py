@@ -46,7 +46,7 @@ class Daily(commands.Cog):
 
                 # Process the daily claim
                 self.bot.db.claim_daily(guild_id, user_id)
-                self.bot.db.add_gold(guild_id, user_id, reward)
+                self.bot.db.add_gold(guild_id, user_id, reward, source="daily")
 
                 # Get updated balance for display
                 gold = self.bot.db.get_user(guild_id, user_id)['gold']
@@ -2,6 +2,8 @@ import discord, asyncio, math, logging
 from discord import app_commands
 from discord.ext import commands, tasks
 from datetime import datetime, timedelta
+from utils.log_digest import SEVERITY_NORMAL, SEVERITY_HIGH
+from utils.roles import edit_roles, voice_kwargs
 
 class Shop(commands.Cog):
     """
@@ -23,7 +25,8 @@ class Shop(commands.Cog):
 
     buy = app_commands.Group(name="buy", description="Buy items from the shop")
 
-    @buy.command(name="mimic", description="Temporarily change a user's nickname.")
+    # Opens a modal, which a deferred interaction can't do
+    @buy.command(name="mimic", description="Temporarily change a user's nickname.", extras={"auto_defer": False})
     @app_commands.describe(user="The user to cast a mimic's curse upon", duration="How long to curse them for")
     @app_commands.choices(duration=[
         app_commands.Choice(name="1 Hour", value="1h"),
@@ -78,7 +81,7 @@ class Shop(commands.Cog):
             self.logger.exception("Error occurred while processing trigger purchase for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
             await interaction.response.send_message("An error occurred while processing the trigger purchase. Please try again later.", ephemeral=True)
 
-    @buy.command(name="barrel_time", description="Send a user to the barrel for 5 minutes (**800** gold)")
+    @buy.command(name="barrel_time", description="Send a user to the barrel for 5 minutes (**800** gold)", extras={"defer_ephemeral": True})
     @app_commands.describe(user="The user to send to the barrel")
     async def buy_barrel_time(self, interaction: discord.Interaction, user: discord.User):
         self.logger.info("Command invoked by user_id=%s in guild_id=%s to buy barrel_time for user_id=%s", interaction.user.id, interaction.guild.id, user.id)
@@ -132,11 +135,8 @@ class Shop(commands.Cog):
             if barrel_role_id:
                 barrel_role = interaction.guild.get_role(int(barrel_role_id))
                 if barrel_role:
-                    await target.add_roles(barrel_role)
-                    try:
-                        await target.edit(mute=True)
-                    except Exception as e:
-                        self.logger.error(f"Failed to mute {target.name} user: {e}")
+                    # Add the role and server mute them (if they're in voice) in one edit
+                    await edit_roles(target, add=[barrel_role], reason="Barrel time", **voice_kwargs(target, mute=True))
 
             await interaction.response.send_message(f"You have put {target.mention} in the barrel!", ephemeral=True)
             # Discord log for barrel purchase
@@ -161,7 +161,9 @@ class Shop(commands.Cog):
                 guild = self.bot.get_guild(guild_id)
                 if not guild:
                     continue
-                for user_id_str, user_data in guild_data["users"].items():
+                # Users with an expiry are pinned in memory, so only hot users need checking.
+                # Copied since other commands can page users in and out while this awaits
+                for user_id_str, user_data in list(guild_data["users"].items()):
                     mimic_expiry = user_data.get("mimic_expiry")
                     if mimic_expiry:
                         try:
@@ -169,12 +171,19 @@ class Shop(commands.Cog):
                         except Exception:
                             continue
                         if expiry_time <= now:
-                            member = guild.get_member(int(user_id_str))
+                            member = await self.get_member(guild, int(user_id_str))
                             if member:
                                 try:
                                     await member.edit(nick=None, reason="Mimic expired")
                                 except Exception as e:
                                     self.logger.error(f"Failed to revert nickname for {member}: {e}")
+                                    await self.send_log_embed(
+                                        guild,
+                                        title="Mimic Revert Failed",
+                                        details=f"Could not reset {member.mention}'s nickname: {e}",
+                                        color=discord.Color.red(),
+                                        severity=SEVERITY_HIGH
+                                    )
                                 self.bot.db.set_mimic_expiry(guild_id, int(user_id_str), None)
                                 # Discord log for mimic revert
                                 await self.send_log_embed(
@@ -191,17 +200,23 @@ class Shop(commands.Cog):
                         except Exception:
                             continue
                         if expiry_time <= now:
-                            member = guild.get_member(int(user_id_str))
+                            member = await self.get_member(guild, int(user_id_str))
                             if member:
                                 try:
                                     barrel_role_id = self.bot.db.get_mute_role(guild_id)
                                     if barrel_role_id:
                                         barrel_role = guild.get_role(int(barrel_role_id))
                                         if barrel_role:
-                                            await member.remove_roles(barrel_role)
-                                            await member.edit(mute=False)
+                                            await edit_roles(member, remove=[barrel_role], reason="Barrel time ended", **voice_kwargs(member, mute=False))
                                 except Exception as e:
                                     self.logger.error(f"Failed to revert barrel time for {member}: {e}")
+                                    await self.send_log_embed(
+                                        guild,
+                                        title="Barrel Revert Failed",
+                                        details=f"Could not release {member.mention} from the barrel: {e}",
+                                        color=discord.Color.red(),
+                                        severity=SEVERITY_HIGH
+                                    )
                             self.bot.db.set_barrel_expiry(guild_id, int(user_id_str), None)
                             # Discord log for barrel revert
                             await self.send_log_embed(
@@ -213,21 +228,23 @@ class Shop(commands.Cog):
         except Exception as e:
             self.logger.exception("Error occurred in revert_task loop")
 
+    # Get a member from the cache, fetching them if members aren't chunked
+    async def get_member(self, guild, user_id):
+        member = guild.get_member(user_id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(user_id)
+            except (discord.NotFound, discord.HTTPException):
+                return None
+        return member
+
     @revert_task.before_loop
     async def before_revert(self):
         await self.bot.wait_until_ready()
 
-    async def send_log_embed(self, guild, title, details, color=discord.Color.orange()):
-        log_channel_id = self.bot.db.get_log_channel(guild.id)
-        if not log_channel_id:
-            return
-        channel = guild.get_channel(int(log_channel_id))
-        if not channel:
-            return
-        embed = discord.Embed(title=title, color=color)
-        embed.add_field(name="Details", value=details, inline=False)
-        embed.timestamp = datetime.utcnow()
-        await channel.send(embed=embed)
+    async def send_log_embed(self, guild, title, details, color=discord.Color.orange(), severity=SEVERITY_NORMAL):
+        # Buffered into the guild's log digest, high severity events are posted immediately
+        self.bot.log_digest.log(guild, title, details, color=color, severity=severity)
 
 async def setup(bot):
     """Load the Shop cog into the bot."""
@@ -284,7 +301,7 @@ class MimicModal(discord.ui.Modal, title="Mimic Nickname"):
             return
         
         # Deduct gold
-        self.bot.db.remove_gold(guild_id, buyer_id, price)
+        self.bot.db.remove_gold(guild_id, buyer_id, price, source="shop", counterparty=user_id)
 
         # Set mimic expiry in DB
         expiry = (datetime.utcnow() + timedelta(hours=hours)).isoformat()
@@ -303,10 +320,7 @@ class MimicModal(discord.ui.Modal, title="Mimic Nickname"):
                     color=discord.Color.purple()
                 )
                 embed.set_footer(text=f"This curse will last for {hours}h")
-                try:
-                    await channel.send(embed=embed)
-                except Exception as e:
-                    self.logger.error(f"Failed to send mimic curse announcement: {e}")
+                self.bot.outbound.send(channel, embed=embed)
         # Discord log for mimic purchase
         if self.log_func and self.log_guild:
             await self.log_func(
@@ -1,10 +1,11 @@
 from discord.ui import Button, View
 import discord, operator
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 from datetime import datetime
-from random import shuffle, choice
-import logging
+import asyncio, logging, os, string, time
+from typing import Optional
+from utils.sessions import SessionManager
 
 # Get the value of a hand
 def hand_value(hand):
@@ -36,152 +37,147 @@ def format_hand(hand):
     return "  ".join(f"`{card.name}`" for card in hand)
 
 
-class BlackjackView(discord.ui.View):
-    def __init__(self, bot, user_id: int, guild_id: int, bet: int, player_hand, dealer_hand, deck):
-        # Declare the variables
-        self.bot = bot
-        self.user_id = user_id
+# Cards are saved as one letter each, the card's position in DeckOfCards.suits_ranks
+CARD_CODES = string.ascii_letters
+
+def encode_cards(hand):
+    return "".join(CARD_CODES[DeckOfCards.suits_ranks.index((card.suit, card.rank))] for card in hand)
+
+def decode_cards(codes):
+    return [Card(DeckOfCards.suits_ranks[CARD_CODES.index(code)]) for code in codes]
+
+
+class BlackjackGame:
+    """
+    A game of blackjack in progress.
+
+    The bet is moved into the player's escrow when the cards are dealt and
+    held there until the game ends. A game saves as a handful of short fields (each hand is a
+    string with one letter per card), and the deck is rebuilt from the cards
+    that haven't been dealt yet.
+    """
+
+    def __init__(self, guild_id: int, user_id: int, bet: int, deck, player_hand, dealer_hand, channel_id=None, message_id=None, last_active=None):
         self.guild_id = guild_id
+        self.user_id = user_id
         self.bet = bet
+        self.deck = deck
         self.player_hand = player_hand
         self.dealer_hand = dealer_hand
-        self.deck = deck
-        self.stopped = False
-        super().__init__()
-        
-    @discord.ui.button(label="Hit", style=discord.ButtonStyle.green)
-    async def hit(self, interaction: discord.Interaction, button: Button):
-        if self.stopped:
-            return
-        
-        # Add a card to the player's hand and add the value to their total
-        self.player_hand.append(self.deck.give_random_card())
-        player_val = hand_value(self.player_hand)
-
-        # If the player is bust
-        if player_val > 21:
-            # Stop the game and disable the buttons
-            self.stopped = True
-            self.disable_all()
-
-            # Remove the player's bet and add a loss
-            self.bot.db.remove_gold(self.guild_id, self.user_id, self.bet)
-            self.bot.db.add_blackjack_losses(self.guild_id, self.user_id)
-
-            # End the game as a loss
-            await self.end_game(
-                interaction=interaction, 
-                result="Bust! You lose.", 
-                multiplier=0
-                )
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.last_active = last_active or time.time()
+
+    # Shuffle a new deck and deal two cards each
+    @classmethod
+    def deal(cls, guild_id: int, user_id: int, bet: int, outcomes):
+        deck = DeckOfCards(outcomes)
+        deck.shuffle_deck()
+        player_hand = [deck.give_random_card(), deck.give_random_card()]
+        dealer_hand = [deck.give_random_card(), deck.give_random_card()]
+        return cls(guild_id, user_id, bet, deck, player_hand, dealer_hand)
+
+    # Rebuild a saved game
+    @classmethod
+    def from_state(cls, guild_id: int, user_id: int, state: dict, outcomes):
+        player_hand = decode_cards(state["player"])
+        dealer_hand = decode_cards(state["dealer"])
+        deck = DeckOfCards(outcomes)
+        deck.remove_cards(player_hand + dealer_hand)
+        deck.shuffle_deck()
+        return cls(
+            guild_id, user_id, int(state["bet"]), deck, player_hand, dealer_hand,
+            state.get("channel_id"), state.get("message_id"), state.get("last_active")
+        )
 
-        else:
-            # Format the player's hand and get the dealer's revealed card
-            formatted_hand = format_hand(self.player_hand)
-            dealer_shows = self.dealer_hand[0].name
-
-            # Create the embed to edit the original response
-            embed = discord.Embed(
-                title="🃏 Blackjack",
-                color=discord.Color.orange()
-            )
-            # Add the player's hand and dealer's shown card as a field
-            embed.add_field(name="Your Hand", value=f"{formatted_hand} ({player_val})", inline=False)
-            embed.add_field(name="Dealer Shows", value=f"`{dealer_shows}`", inline=False)
-            embed.add_field(name="Bet", value=f"**{self.bet}** gold")
-            
-            # Edit the original response to the command
-            await interaction.response.edit_message(embed=embed, view=self)
-    
-    @discord.ui.button(label="Stand", style=discord.ButtonStyle.blurple)
-    async def stand(self, interaction: discord.Interaction, button: Button):
-        if self.stopped:
-            return
-        
-        self.stopped = True
-        self.disable_all()
+    # Save the game
+    def to_state(self) -> dict:
+        return {
+            "bet": self.bet,
+            "player": encode_cards(self.player_hand),
+            "dealer": encode_cards(self.dealer_hand),
+            "channel_id": self.channel_id,
+            "message_id": self.message_id,
+            "last_active": round(self.last_active),
+        }
+
+    @property
+    def player_value(self):
+        return hand_value(self.player_hand)
+
+    # Draw a card for the player, returns the new value of their hand
+    def hit(self):
+        self.player_hand.append(self.deck.give_random_card())
+        return hand_value(self.player_hand)
 
+    # Play out the dealer's hand, returns the result and payout multiplier
+    def stand(self):
         # Force the dealer to hit below 17
         while hand_value(self.dealer_hand) < 17:
             self.dealer_hand.append(self.deck.give_random_card())
-        
-        # Get the value of the player and dealer hands
+
         player_val = hand_value(self.player_hand)
         dealer_val = hand_value(self.dealer_hand)
 
         # If the dealer is bust, user wins
         if dealer_val > 21:
-            self.bot.db.add_blackjack_wins(self.guild_id, self.user_id)
-            await self.end_game(
-                interaction=interaction,
-                result="Dealer busts! You win!",
-                multiplier=1.5
-            )
+            return "Dealer busts! You win!", 1.5
         # If the player is above the dealer and below 21, user wins
-        elif player_val > dealer_val:
-            self.bot.db.add_blackjack_wins(self.guild_id, self.user_id)
-            await self.end_game(
-                interaction=interaction,
-                result="You win!",
-                multiplier=1.5
-            )
+        if player_val > dealer_val:
+            return "You win!", 1.5
         # If the player is below the dealer and both below 21, dealer wins
-        elif dealer_val > player_val:
-            self.bot.db.add_blackjack_losses(self.guild_id, self.user_id)
-            await self.end_game(
-                interaction=interaction,
-                result="You lose!",
-                multiplier=0
-            )
-        # If the player is below the dealer and both below 21, dealer wins
-        else:
-            self.bot.db.add_blackjack_losses(self.guild_id, self.user_id)
-            await self.end_game(
-                interaction=interaction,
-                result="It's a draw!",
-                multiplier=1
-            )
-        
-    async def end_game(self, interaction: discord.Interaction, result: str, multiplier: int):
-        # Get the value of the player and dealer hands
-        player_val = hand_value(self.player_hand)
-        dealer_val = hand_value(self.dealer_hand)
+        if dealer_val > player_val:
+            return "You lose!", 0
+        return "It's a draw!", 1
 
-        # Payout
-        payout = round(self.bet * multiplier)
-        if multiplier > 1:
-            payout_text = f"You won **{payout}** gold!"
-            self.bot.db.add_gold(self.guild_id, self.user_id, payout)
-        elif multiplier == 1:
-            payout_text = f"You gain nothing"
-        else:
-            payout_text = f"You lost **{self.bet}** gold"
 
-        # Get the user's wins and losses
-        user_winloss = self.bot.db.get_blackjack_winloss(self.guild_id, self.user_id)
+class BlackjackButton(discord.ui.DynamicItem[discord.ui.Button], template=r"blackjack:(?P<action>hit|stand):(?P<user_id>[0-9]+)"):
+    """
+    Hit or Stand button on a player's game.
 
-        # Format the player/dealer hands
-        player_hand_formatted = format_hand(self.player_hand)
-        dealer_hand_formatted = format_hand(self.dealer_hand)
+    The action and the player are part of the custom ID, so the buttons keep
+    working after a restart and no view is kept in memory per game.
+    """
 
-        embed = discord.Embed(
-            title=f"🃏 Blackjack - {result}",
-            color=discord.Color.green() if multiplier > 1 else discord.Color.orange() if multiplier == 1 else discord.Color.red()
+    def __init__(self, action: str, user_id: int):
+        super().__init__(
+            discord.ui.Button(
+                label=action.capitalize(),
+                style=discord.ButtonStyle.green if action == "hit" else discord.ButtonStyle.blurple,
+                custom_id=f"blackjack:{action}:{user_id}",
             )
-        embed.add_field(name="Your Hand", value=f"{player_hand_formatted} ({player_val})", inline=False)
-        embed.add_field(name="Dealer Hand", value=f"{dealer_hand_formatted} ({dealer_val})", inline=False)
-        
-        embed.add_field(name="Payout", value=f"{payout_text}")
-        embed.set_footer(text=f"W/L: {user_winloss[0]}/{user_winloss[1]}   Winrate: {user_winloss[2]}%")
+        )
+        self.action = action
+        self.user_id = user_id
 
-        await interaction.response.edit_message(embed=embed, view=None)
-    
-    async def on_timeout(self):
-        self.disable_all()
-    
-    def disable_all(self):
-        for item in self.children:
-            item.disabled = True
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], int(match["user_id"]))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if await interaction.client.shutdown.refuse(interaction):
+            return False
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("This isn't your game! Start your own with `/blackjack`.", ephemeral=True)
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("Blackjack")
+        if cog is None:
+            await interaction.response.send_message("The blackjack table is closed right now. Please try again later.", ephemeral=True)
+            return
+        # Buttons don't go through the command tree, so trace them here
+        attributes = {"discord.interaction.type": "component", "discord.guild_id": interaction.guild_id or 0, "discord.user_id": interaction.user.id}
+        with interaction.client.tracer.span(f"component blackjack:{self.action}", "server", attributes), interaction.client.shutdown.track():
+            await cog.play(interaction, self.action)
+
+
+class BlackjackView(discord.ui.View):
+    def __init__(self, user_id: int):
+        super().__init__(timeout=None)
+        self.add_item(BlackjackButton("hit", user_id))
+        self.add_item(BlackjackButton("stand", user_id))
 
 
 class Blackjack(commands.Cog):
@@ -190,103 +186,266 @@ class Blackjack(commands.Cog):
     
     Full-featured card game with hit/stand buttons, dealer AI,
     and comprehensive win/loss tracking. Supports betting with gold.
+    Games in progress are kept per player, saved to the database
+    and resumed after a restart.
     """
     
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
+        self.sessions = SessionManager(
+            capacity=int(os.getenv("BLACKJACK_MAX_SESSIONS", "500")),
+            timeout=float(os.getenv("BLACKJACK_SESSION_TIMEOUT", "180")),
+        )
         self.logger.info("Blackjack game loaded successfully")
 
+    async def cog_load(self):
+        self.bot.add_dynamic_items(BlackjackButton)
+
+        # Resume saved games, oldest first so the LRU order carries over
+        overflow = []
+        saved = sorted(self.bot.db.get_blackjack_sessions(), key=lambda s: s[2].get("last_active") or 0)
+        for guild_id, user_id, state in saved:
+            try:
+                game = BlackjackGame.from_state(guild_id, user_id, state, self.bot.outcomes)
+            except (KeyError, ValueError, TypeError):
+                # Give back the bet of a game that can't be resumed
+                self.logger.exception("Dropping unreadable blackjack session for user_id=%s in guild_id=%s", user_id, guild_id)
+                self.bot.db.release_hold(guild_id, user_id, "blackjack", source="blackjack")
+                self.bot.db.set_blackjack_session(guild_id, user_id, None)
+                continue
+            overflow.extend(self.sessions.add((guild_id, user_id), game))
+
+        if overflow:
+            asyncio.create_task(self.abandon_when_ready(overflow, "table full"))
+        self.sweep_sessions.start()
+        self.bot.metrics.register("blackjack_sessions", self.sessions.stats)
+        self.logger.info("Resumed %s blackjack sessions", len(self.sessions))
+
+    def cog_unload(self):
+        # Games in progress stay saved and resume when the cog is loaded again
+        self.sweep_sessions.cancel()
+        self.bot.metrics.unregister("blackjack_sessions")
+        self.bot.remove_dynamic_items(BlackjackButton)
+
+    # Hand the games in progress to the reloaded cog, in least recently used order
+    def export_state(self):
+        return {
+            "games": [(key, game.to_state()) for key, game in self.sessions.sessions.items()],
+            "stats": self.sessions.stats(),
+        }
+
+    def import_state(self, state):
+        games = []
+        for (guild_id, user_id), game_state in state["games"]:
+            try:
+                games.append(((guild_id, user_id), BlackjackGame.from_state(guild_id, user_id, game_state, self.bot.outcomes)))
+            except (KeyError, ValueError, TypeError):
+                self.logger.exception("Could not carry over blackjack game for user_id=%s in guild_id=%s", user_id, guild_id)
+        self.sessions.restore(games, state["stats"])
+        self.logger.info("Carried over %s blackjack sessions", len(games))
+
+    # Save every game in progress so it resumes after a restart
+    async def prepare_shutdown(self):
+        self.sweep_sessions.cancel()
+        for game in list(self.sessions.sessions.values()):
+            self.bot.db.set_blackjack_session(game.guild_id, game.user_id, game.to_state())
+        return {"blackjack_sessions_saved": len(self.sessions)}
+
     @app_commands.command(name="blackjack", description="Play a game of blackjack!")
     @app_commands.describe(bet="The amount of gold you want to bet (Max: 100)")
     @app_commands.checks.cooldown(3, 180)
     async def blackjack(self, interaction: discord.Interaction, bet: int):
         self.logger.info("Command invoked by user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
+        # Whether the bet is in escrow without a registered or settled game yet
+        held = False
         try:
             # Get the user and guild IDs
             user_id = interaction.user.id
             guild_id = interaction.guild.id
 
-            # Get the user's gold
-            gold = self.bot.db.get_user_gold(guild_id, user_id)
-
-            # Check if the user has enough gold to bet
-            if gold < bet:
-                await interaction.response.send_message(f"You don't have enough gold to bet! You have **{gold}** gold.", ephemeral=True)
+            # One game at a time per player
+            if (guild_id, user_id) in self.sessions:
+                await interaction.response.send_message("You already have a game of blackjack going! Finish it before starting another.", ephemeral=True)
                 return
 
             # Check if the bet is valid
             if bet <= 0 or bet >= 100:
                 await interaction.response.send_message("Invalid bet! The bet must be 1-100 gold.", ephemeral=True)
                 return
-            
-            # Create the deck of cards for the game and shuffle it
-            deck = DeckOfCards()
-            deck.shuffle_deck()
 
-            # Create the player's and dealer's hand
-            player_hand = [deck.give_random_card(), deck.give_random_card()]
-            dealer_hand = [deck.give_random_card(), deck.give_random_card()]
-
-            # Format the hands
-            player_hand_formatted = format_hand(player_hand)
-            dealer_hand_formatted = format_hand(dealer_hand)
+            # Hold the bet in escrow until the game ends, checking the user has the gold
+            # in the same step so another wager in this guild can't spend it first
+            held = await self.bot.actors.run(guild_id, self.bot.db.hold_gold, guild_id, user_id, bet, "blackjack", source="blackjack")
+            if not held:
+                gold = self.bot.db.get_user_gold(guild_id, user_id)
+                if gold >= bet:
+                    # Another /blackjack from this player got its bet in first
+                    await interaction.response.send_message("You already have a game of blackjack going! Finish it before starting another.", ephemeral=True)
+                else:
+                    await interaction.response.send_message(f"You don't have enough gold to bet! You have **{gold}** gold.", ephemeral=True)
+                return
 
-            # Get the player's and dealer's hands' value
-            player_val = hand_value(player_hand)
-            dealer_val = hand_value(dealer_hand)
+            # Shuffle a deck and deal the player's and dealer's hands
+            game = BlackjackGame.deal(guild_id, user_id, bet, self.bot.outcomes)
 
             # Check if the player has already bust
-            if player_val > 21:
-                # Remove the player's bet and add a loss
-                self.bot.db.remove_gold(guild_id, user_id, bet)
-                self.bot.db.add_blackjack_losses(guild_id, user_id)
-
-                # Get the user's wins and losses
-                user_wins = self.bot.db.get_blackjack_wins(guild_id, user_id)
-                user_losses = self.bot.db.get_blackjack_losses(guild_id, user_id)
-                user_games = user_wins + user_losses
-                user_winrate = round((user_wins / (user_games) * 100), 1) if user_games > 0 else 0
-
-                # Create the embed for the response
-                embed = discord.Embed(
-                    title="🃏 Blackjack - Bust!",
-                    color=discord.Color.red()
-                )
-                embed.add_field(name="Your Hand", value=f"{player_hand_formatted} ({player_val})", inline=False)
-                embed.add_field(name="Dealer Hand", value=f"{dealer_hand_formatted} ({dealer_val})", inline=False)
-                embed.add_field(name="Payout", value=f"You lost **{bet}** gold", inline=False)
-                embed.set_footer(text=f"W/L: {user_wins}/{user_losses}   Winrate: {user_winrate}%")
-
-                # Send the embed in response
-                await interaction.response.send_message(embed=embed)
+            if game.player_value > 21:
+                payout_text = await self.bot.actors.run(guild_id, self.settle, game, 0)
+                held = False
+                await interaction.response.send_message(embed=self.result_embed(game, "Bust!", 0, payout_text))
                 return
             
-            # Create the discord view
-            view = BlackjackView(
-                bot=self.bot,
-                user_id=user_id,
-                guild_id=guild_id,
-                bet=bet,
-                player_hand=player_hand,
-                dealer_hand=dealer_hand,
-                deck=deck
-            )
-
-            # Create the embed for the game
-            embed = discord.Embed(
-                title="🃏 Blackjack",
-                color=discord.Color.orange()
-            )
-            embed.add_field(name="Your Hand", value=f"{player_hand_formatted} ({player_val})", inline=False)
-            embed.add_field(name="Dealer Shows", value=f"{dealer_hand[0].name}", inline=False)
-            embed.add_field(name="Bet", value=f"**{bet}** gold")
-            
             # Respond to the command
-            await interaction.response.send_message(embed=embed, view=view)
+            response = await interaction.response.send_message(embed=self.table_embed(game), view=BlackjackView(user_id))
+
+            # Register and save the game so it can be found by player and resumed after a restart
+            game.channel_id = interaction.channel_id
+            # An auto deferred reply comes back as the followup message
+            game.message_id = getattr(response, "message_id", None) or response.id
+            evicted = self.sessions.add((guild_id, user_id), game)
+            self.bot.db.set_blackjack_session(guild_id, user_id, game.to_state())
+            held = False
+
+            # Make room at a full table by finishing the least recently played games
+            for old_game in evicted:
+                await self.abandon(old_game, "table full")
         except Exception as e:
             self.logger.exception("Error occurred for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
+            if held:
+                await self.bot.actors.run(interaction.guild.id, self.bot.db.release_hold, interaction.guild.id, interaction.user.id, "blackjack", source="blackjack")
             await interaction.response.send_message("An error occurred while playing blackjack. Please try again later.", ephemeral=True)
+
+    # Handle a Hit or Stand press on a player's game
+    async def play(self, interaction: discord.Interaction, action: str):
+        key = (interaction.guild.id, interaction.user.id)
+        game = self.sessions.get(key)
+        if game is None or (game.message_id and interaction.message and interaction.message.id != game.message_id):
+            await interaction.response.send_message("This game has already ended.", ephemeral=True)
+            return
+
+        try:
+            if action == "hit":
+                # Add a card to the player's hand
+                player_val = game.hit()
+
+                # If the player is bust, end the game as a loss
+                if player_val > 21:
+                    self.sessions.remove(key)
+                    payout_text = await self.bot.actors.run(game.guild_id, self.settle, game, 0)
+                    if payout_text is None:
+                        await interaction.response.send_message("This game has already ended.", ephemeral=True)
+                        return
+                    await interaction.response.edit_message(embed=self.result_embed(game, "Bust! You lose.", 0, payout_text), view=None)
+                    return
+
+                self.sessions.touch(key)
+                self.bot.db.set_blackjack_session(game.guild_id, game.user_id, game.to_state())
+                await interaction.response.edit_message(embed=self.table_embed(game))
+            else:
+                # Take the game off the table before waiting, so a second press can't settle it too
+                self.sessions.remove(key)
+                result, multiplier = game.stand()
+                payout_text = await self.bot.actors.run(game.guild_id, self.settle, game, multiplier)
+                if payout_text is None:
+                    await interaction.response.send_message("This game has already ended.", ephemeral=True)
+                    return
+                await interaction.response.edit_message(embed=self.result_embed(game, result, multiplier, payout_text), view=None)
+        except Exception as e:
+            self.logger.exception("Error occurred for user_id=%s in guild_id=%s", interaction.user.id, interaction.guild.id)
+            if not interaction.response.is_done():
+                await interaction.response.send_message("An error occurred while playing blackjack. Please try again later.", ephemeral=True)
+
+    # Pay out a finished game from the bet in escrow and record the result, returns the
+    # payout text, or None if the game was already settled. Run on the guild's actor
+    def settle(self, game: BlackjackGame, multiplier: float) -> Optional[str]:
+        self.sessions.remove((game.guild_id, game.user_id))
+
+        winnings = round(game.bet * multiplier)
+        payout = game.bet + winnings if multiplier > 1 else game.bet if multiplier == 1 else 0
+        if not self.bot.db.settle_hold(game.guild_id, game.user_id, "blackjack", payout, source="blackjack"):
+            return None
+
+        if multiplier > 1:
+            self.bot.db.add_blackjack_wins(game.guild_id, game.user_id)
+            payout_text = f"You won **{winnings}** gold!"
+        elif multiplier == 1:
+            # The bet was given back
+            self.bot.db.add_blackjack_losses(game.guild_id, game.user_id)
+            payout_text = f"You gain nothing"
+        else:
+            self.bot.db.add_blackjack_losses(game.guild_id, game.user_id)
+            payout_text = f"You lost **{game.bet}** gold"
+
+        self.bot.db.set_blackjack_session(game.guild_id, game.user_id, None)
+        return payout_text
+
+    # Finish a game its player walked away from by standing on their hand
+    async def abandon(self, game: BlackjackGame, reason: str):
+        result, multiplier = game.stand()
+        payout_text = await self.bot.actors.run(game.guild_id, self.settle, game, multiplier)
+        if payout_text is None:
+            return
+        self.logger.info("Blackjack game for user_id=%s in guild_id=%s ended (%s)", game.user_id, game.guild_id, reason)
+
+        # Show the result on the game's message, without fetching it
+        channel = self.bot.get_channel(game.channel_id) if game.channel_id else None
+        if channel is None or not game.message_id:
+            return
+        try:
+            embed = self.result_embed(game, f"{result} ({reason.capitalize()})", multiplier, payout_text)
+            await channel.get_partial_message(game.message_id).edit(embed=embed, view=None)
+        except discord.HTTPException:
+            pass  # Message deleted or can't be edited
+
+    async def abandon_when_ready(self, games, reason: str):
+        await self.bot.wait_until_ready()
+        for game in games:
+            await self.abandon(game, reason)
+
+    # Finish games nobody has played for a while
+    @tasks.loop(seconds=30)
+    async def sweep_sessions(self):
+        expired = self.sessions.expire()
+        for game in expired:
+            try:
+                await self.abandon(game, "timed out")
+            except Exception:
+                self.logger.exception("Failed to finish idle blackjack game for user_id=%s in guild_id=%s", game.user_id, game.guild_id)
+        if expired:
+            self.logger.info("Finished %s idle blackjack games, %s still active", len(expired), len(self.sessions))
+
+    @sweep_sessions.before_loop
+    async def before_sweep_sessions(self):
+        await self.bot.wait_until_ready()
+
+    # Embed for a game in progress
+    def table_embed(self, game: BlackjackGame) -> discord.Embed:
+        embed = discord.Embed(
+            title="🃏 Blackjack",
+            color=discord.Color.orange()
+        )
+        # Add the player's hand and dealer's shown card as a field
+        embed.add_field(name="Your Hand", value=f"{format_hand(game.player_hand)} ({game.player_value})", inline=False)
+        embed.add_field(name="Dealer Shows", value=f"`{game.dealer_hand[0].name}`", inline=False)
+        embed.add_field(name="Bet", value=f"**{game.bet}** gold")
+        return embed
+
+    # Embed for a finished game
+    def result_embed(self, game: BlackjackGame, result: str, multiplier: float, payout_text: str) -> discord.Embed:
+        # Get the user's wins and losses
+        user_winloss = self.bot.db.get_blackjack_winloss(game.guild_id, game.user_id)
+
+        embed = discord.Embed(
+            title=f"🃏 Blackjack - {result}",
+            color=discord.Color.green() if multiplier > 1 else discord.Color.orange() if multiplier == 1 else discord.Color.red()
+            )
+        embed.add_field(name="Your Hand", value=f"{format_hand(game.player_hand)} ({hand_value(game.player_hand)})", inline=False)
+        embed.add_field(name="Dealer Hand", value=f"{format_hand(game.dealer_hand)} ({hand_value(game.dealer_hand)})", inline=False)
+        
+        embed.add_field(name="Payout", value=f"{payout_text}")
+        embed.set_footer(text=f"W/L: {user_winloss[0]}/{user_winloss[1]}   Winrate: {user_winloss[2]}%")
+        return embed
     
     @blackjack.error
     async def blackjack_error(self, interaction: discord.Interaction, error):
@@ -370,8 +529,9 @@ class DeckOfCards(object):
         for i in range(1, 53)
     ]
 
-    # Initialises a deck of cards when called
-    def __init__(self):
+    # Initialises a deck of cards when called, drawing from the shared outcome engine
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
         # Convert the suits_ranks list to card objects
         self.deck = [
             Card(tup)
@@ -380,14 +540,14 @@ class DeckOfCards(object):
 
     # Shuffle the deck
     def shuffle_deck(self):
-        shuffle(self.deck)
+        self.outcomes.shuffle(self.deck)
         return self.deck
 
+    # Take cards that have already been dealt out of the deck
+    def remove_cards(self, cards):
+        dealt = {(card.suit, card.rank) for card in cards}
+        self.deck = [card for card in self.deck if (card.suit, card.rank) not in dealt]
+
     # Get a random card and remove it from the deck
     def give_random_card(self):
-        card = choice(self.deck)
-
-        for card_obj in self.deck:
-            if card_obj.name == card.name:
-                self.deck.remove(card_obj)
-        return card
+        return self.outcomes.draw(self.deck)
@@ -28,13 +28,20 @@ class Leaderboard(commands.Cog):
     )
     async def leaderboard(self, interaction: discord.Interaction, category: str):
         self.logger.info("Command invoked by user_id=%s in guild_id=%s, category=%s", interaction.user.id, interaction.guild.id, category)
+        # Replies go out as a followup once the response has been deferred
+        reply = interaction.response.send_message
         try:
             # Get the user and guild IDs
             user_id = interaction.user.id
             guild_id = interaction.guild.id
 
-            # Get guild data
-            guild_data = self.bot.db.get_guild(guild_id)
+            # Under load, answer Discord first and render the leaderboard after
+            if self.bot.pressure.shedding:
+                await interaction.response.defer(thinking=True)
+                reply = interaction.followup.send
+
+            # Get every user in the guild, including those paged out to the cold store
+            guild_users = [(uid, udata) for _, uid, udata in self.bot.db.iter_users(guild_id)]
 
             # Check the category
             if category == "gold":
@@ -45,7 +52,7 @@ class Leaderboard(commands.Cog):
 
                 # Count users in order of their gold
                 sorted_users = sorted(
-                    guild_data["users"].items(),
+                    guild_users,
                     key=lambda x: x[1]["gold"],
                     reverse=True
                 )
@@ -63,10 +70,8 @@ class Leaderboard(commands.Cog):
                 for rank, (uid, udata) in enumerate(sorted_users[:10], start=1):
                     # Convert user id into an int
                     uid = int(uid)
-                    # Get the user
-                    user = self.bot.get_user(uid)
-                    # Get the user's username
-                    username = user.mention
+                    # Mention the user by id (they may not be in the member cache)
+                    username = f"<@{uid}>"
                     # Get the user's gold
                     gold = udata["gold"]
                     # Add the user to the leaderboard lines
@@ -81,7 +86,7 @@ class Leaderboard(commands.Cog):
                 embed.set_footer(text=f"You are #{user_place} in the leaderboard with {user_gold} gold.")
 
                 # Send a message to the user
-                await interaction.response.send_message(embed=embed)
+                await reply(embed=embed)
             
             elif category == "blackjack":
                 # Get the user's blackjack
@@ -91,7 +96,7 @@ class Leaderboard(commands.Cog):
 
                 # Count users in order of their blackjack wins
                 sorted_users = sorted(
-                    guild_data["users"].items(),
+                    guild_users,
                     key=lambda x: x[1]["blackjack_wins"],
                     reverse=True
                 )
@@ -109,10 +114,8 @@ class Leaderboard(commands.Cog):
                 for rank, (uid, udata) in enumerate(sorted_users[:10], start=1):
                     # Convert user id into an int
                     uid = int(uid)
-                    # Get the user
-                    user = self.bot.get_user(uid)
-                    # Get the user's username
-                    username = user.mention
+                    # Mention the user by id (they may not be in the member cache)
+                    username = f"<@{uid}>"
                     # Get the user's wins
                     wins = udata["blackjack_wins"]
                     # Add the user to the leaderboard lines
@@ -127,7 +130,7 @@ class Leaderboard(commands.Cog):
                 embed.set_footer(text=f"You are #{user_place} in the leaderboard with {user_wins} wins.")
 
                 # Send a message to the user
-                await interaction.response.send_message(embed=embed)
+                await reply(embed=embed)
 
             elif category == "roulette":
                 # Get the user's roulette
@@ -137,7 +140,7 @@ class Leaderboard(commands.Cog):
 
                 # Count users in order of their roulette wins
                 sorted_users = sorted(
-                    guild_data["users"].items(),
+                    guild_users,
                     key=lambda x: x[1]["roulette_wins"],
                     reverse=True
                 )
@@ -155,10 +158,8 @@ class Leaderboard(commands.Cog):
                 for rank, (uid, udata) in enumerate(sorted_users[:10], start=1):
                     # Convert user id into an int
                     uid = int(uid)
-                    # Get the user
-                    user = self.bot.get_user(uid)
-                    # Get the user's username
-                    username = user.mention
+                    # Mention the user by id (they may not be in the member cache)
+                    username = f"<@{uid}>"
                     # Get the user's wins
                     wins = udata["roulette_wins"]
                     # Add the user to the leaderboard lines
@@ -173,7 +174,7 @@ class Leaderboard(commands.Cog):
                 embed.set_footer(text=f"You are #{user_place} in the leaderboard with {user_wins} wins.")
 
                 # Send a message to the user
-                await interaction.response.send_message(embed=embed)
+                await reply(embed=embed)
 
             elif category == "slots":
                 # Get the user's slots
@@ -183,7 +184,7 @@ class Leaderboard(commands.Cog):
 
                 # Count users in order of their slots wins
                 sorted_users = sorted(
-                    guild_data["users"].items(),
+                    guild_users,
                     key=lambda x: x[1]["slots_wins"],
                     reverse=True
                 )
@@ -201,10 +202,8 @@ class Leaderboard(commands.Cog):
                 for rank, (uid, udata) in enumerate(sorted_users[:10], start=1):
                     # Convert user id into an int
                     uid = int(uid)
-                    # Get the user
-                    user = self.bot.get_user(uid)
-                    # Get the user's username
-                    username = user.mention
+                    # Mention the user by id (they may not be in the member cache)
+                    username = f"<@{uid}>"
                     # Get the user's wins
                     wins = udata["slots_wins"]
                     # Add the user to the leaderboard lines
@@ -219,10 +218,10 @@ class Leaderboard(commands.Cog):
                 embed.set_footer(text=f"You are #{user_place} in the leaderboard with {user_wins} wins.")
 
                 # Send a message to the user
-                await interaction.response.send_message(embed=embed)
+                await reply(embed=embed)
         except Exception as e:
             self.logger.exception("Error occurred while processing leaderboard command for user_id=%s in guild_id=%s, category=%s", interaction.user.id, interaction.guild.id, category)
-            await interaction.response.send_message("An error occurred while fetching the leaderboard. Please try again later.", ephemeral=True)
+            await reply("An error occurred while fetching the leaderboard. Please try again later.", ephemeral=True)
 
 async def setup(bot):
     """Load the Leaderboard cog into the bot."""
@@ -1,4 +1,4 @@
-import random, discord, logging
+import discord, logging
 from discord import app_commands
 from discord.ext import commands
 
@@ -49,11 +49,8 @@ class Roulette(commands.Cog):
                 await interaction.response.send_message("Invalid bet! The bet must 1-100.", ephemeral=True)
                 return
 
-            # Set the wheel
-            wheel = ["00"] + [str(i) for i in range(0, 37)]
-            result = random.choice(wheel)
-            result_colour = "green" if result in ["00", "0"] else "red" if int(result) % 2 == 0 else "black"
-            result_emoji = "🟢" if result in ["00", "0"] else "🔴" if int(result) % 2 == 0 else "⚫"
+            # Spin the wheel
+            result, result_colour, result_emoji = self.bot.outcomes.spin_wheel()
 
             win = colour.lower() == result_colour
 
@@ -63,7 +60,7 @@ class Roulette(commands.Cog):
                 self.bot.db.add_roulette_wins(guild_id, user_id)
 
                 payout = bet * 15 if colour.lower() == "green" else bet
-                self.bot.db.add_gold(guild_id, user_id, payout)
+                self.bot.db.add_gold(guild_id, user_id, payout, source="roulette", counterparty="house")
 
                 # Create an embed to send to the user
                 embed = discord.Embed(
@@ -78,7 +75,7 @@ class Roulette(commands.Cog):
                 self.bot.db.add_roulette_losses(guild_id, user_id)
 
                 # Remove the bet from the user's gold
-                self.bot.db.remove_gold(guild_id, user_id, bet)
+                self.bot.db.remove_gold(guild_id, user_id, bet, source="roulette", counterparty="house")
 
                 # Create an embed to send to the user
                 embed = discord.Embed(
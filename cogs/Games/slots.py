@@ -1,5 +1,5 @@
 import time
-import discord, random
+import discord
 from discord import app_commands, Button
 from discord.ext import commands
 import asyncio
@@ -14,6 +14,8 @@ class SlotsView(discord.ui.View):
         self.user_id = user_id
         self.guild_id = guild_id
         self.bet = bet
+        # Name of the bet's hold in the user's escrow, set when they spin
+        self.hold = None
         super().__init__()
     
     async def interaction_check(self, interaction):
@@ -21,122 +23,108 @@ class SlotsView(discord.ui.View):
     
     @discord.ui.button(label="Spin", style=discord.ButtonStyle.blurple)
     async def spin(self, interaction: discord.Interaction, button: Button):
-        # Define the slot emojis
-        emojis = ["🍒", "🍋", "🍊", "🍇", "🍉", "7️⃣"]
-        weights = [0.265, 0.25, 0.22, 0.18, 0.08, 0.005]
-
-        # Write the embed for the start of the spin
-        embed = discord.Embed(
-            title="🎰 Slot Machine",
-            color=discord.Color.gold()
-        )
-        embed.add_field(name="Spinning the machine...", value="`?` `?` `?`", inline=False)
-
-        # Send the initial spinning message
-        await interaction.response.edit_message(embed=embed, view=None)
+        # Hold the bet in escrow for the spin, checking the user still has the gold in the
+        # same step so another wager in this guild can't spend it while the reels turn
+        self.hold = f"slots:{interaction.message.id}"
+        held = await self.bot.actors.run(self.guild_id, self.bot.db.hold_gold, self.guild_id, self.user_id, self.bet, self.hold, source="slots")
+        if not held:
+            gold = self.bot.db.get_user_gold(self.guild_id, self.user_id)
+            if gold >= self.bet:
+                await interaction.response.send_message("This machine is already spinning!", ephemeral=True)
+            else:
+                await interaction.response.send_message(f"You don't have enough gold to bet! You have **{gold}** gold.", ephemeral=True)
+            return
 
+        try:
+            await self.play(interaction)
+        except Exception:
+            # Give the bet back if the spin didn't finish, does nothing if it was settled
+            await self.bot.actors.run(self.guild_id, self.bot.db.release_hold, self.guild_id, self.user_id, self.hold, source="slots")
+            raise
+
+    # Settle the bet in escrow, paying back payout gold
+    async def settle(self, payout: int):
+        await self.bot.actors.run(self.guild_id, self.bot.db.settle_hold, self.guild_id, self.user_id, self.hold, payout, source="slots")
+
+    # Spin the reels and pay out
+    async def play(self, interaction: discord.Interaction):
         # Set a list for results
         results = ["?", "?", "?"]
-        message = await interaction.original_response()
-
-        # Loop through the 3 lanes
-        for i in range(3):
-            # 1 second per lane
-            await asyncio.sleep(1)
-            # Get the random result for this lane
-            result = random.choices(emojis, weights=weights)[0]
-            # Set the result into the list
-            results[i] = result
-            # Set the value for the embed field
-            value = " ".join(f"`{j}`" for j in results)
-            # Set the embed for editing
+        # The message being animated, None if the result goes in the response
+        message = None
+
+        # Under load, skip the animation and show the result straight away
+        if self.bot.pressure.shedding:
+            results = [self.bot.outcomes.spin_reel() for _ in range(3)]
+        else:
+            # Write the embed for the start of the spin
             embed = discord.Embed(
                 title="🎰 Slot Machine",
                 color=discord.Color.gold()
             )
-            embed.add_field(name="Spinning the machine...", value=value, inline=False)
-            # Send the embed
-            await message.edit(embed=embed)
+            embed.add_field(name="Spinning the machine...", value="`?` `?` `?`", inline=False)
+
+            # Send the initial spinning message
+            await interaction.response.edit_message(embed=embed, view=None)
+            message = await interaction.original_response()
+
+            # Loop through the 3 lanes
+            for i in range(3):
+                # 1 second per lane
+                await asyncio.sleep(1)
+                # Get the random result for this lane
+                result = self.bot.outcomes.spin_reel()
+                # Set the result into the list
+                results[i] = result
+                # Set the value for the embed field
+                value = " ".join(f"`{j}`" for j in results)
+                # Set the embed for editing
+                embed = discord.Embed(
+                    title="🎰 Slot Machine",
+                    color=discord.Color.gold()
+                )
+                embed.add_field(name="Spinning the machine...", value=value, inline=False)
+                # Send the embed
+                await message.edit(embed=embed)
 
         # Set a,b,c to results
         a, b, c = results
         
         # All lanes are matching 7s
         if a == b == c == "7️⃣":
-            # Set the payout amount
-            payout = self.bet * 49
-            # Add the payout to the user's database
-            self.bot.db.add_gold(self.guild_id, self.user_id, payout)
-            # Set the embed for editing
-            embed = discord.Embed(
-                title="🎰 Slot Machine",
-                color=discord.Color.gold()
-            )
-            embed.add_field(name="Mega Jackpot!", value=f"`{a}` `{b}` `{c}`", inline=False)
-            embed.add_field(name="Payout", value=f"You won **{payout}** gold!", inline=False)
-            # Send the embed
-            await message.edit(embed=embed, view=None)
-
+            title, payout = "Mega Jackpot!", self.bet * 49
         # All lanes are matching melons
-        if a == b == c == "🍉":
-            # Set the payout amount
-            payout = self.bet * 9
-            # Add the payout to the user's database
-            self.bot.db.add_gold(self.guild_id, self.user_id, payout)
-            # Set the embed for editing
-            embed = discord.Embed(
-                title="🎰 Slot Machine",
-                color=discord.Color.gold()
-            )
-            embed.add_field(name="Big Jackpot!", value=f"`{a}` `{b}` `{c}`", inline=False)
-            embed.add_field(name="Payout", value=f"You won **{payout}** gold!", inline=False)
-            # Send the embed
-            await message.edit(embed=embed, view=None)
-        
+        elif a == b == c == "🍉":
+            title, payout = "Big Jackpot!", self.bet * 9
         # All lanes are matching, not 7s or melons
         elif a == b == c:
-            # Set the payout amount
-            payout = self.bet * 7
-            # Add the payout to the user's database
-            self.bot.db.add_gold(self.guild_id, self.user_id, payout)
-            # Set the embed for editing
-            embed = discord.Embed(
-                title="🎰 Slot Machine",
-                color=discord.Color.gold()
-            )
-            embed.add_field(name="Jackpot!", value=f"`{a}` `{b}` `{c}`", inline=False)
-            embed.add_field(name="Payout", value=f"You won **{payout}** gold!", inline=False)
-            # Send the embed
-            await message.edit(embed=embed, view=None)
-
+            title, payout = "Jackpot!", self.bet * 7
         # Two lanes are matching
         elif (a == b) or (b == c) or (c == a):
-            # Set the payout amount
-            payout = self.bet * 2
-            # Add the payout to the user's database
-            self.bot.db.add_gold(self.guild_id, self.user_id, payout)
-            # Set the embed for editing
-            embed = discord.Embed(
-                title="🎰 Slot Machine",
-                color=discord.Color.gold()
-            )
-            embed.add_field(name="Two of a kind!", value=f"`{a}` `{b}` `{c}`", inline=False)
-            embed.add_field(name="Payout", value=f"You won **{payout}** gold!", inline=False)
-            # Send the embed
-            await message.edit(embed=embed, view=None)
-
+            title, payout = "Two of a kind!", self.bet * 2
         # They lost the slot machine
         else:
-            # Remove the gold from the user in the database
-            self.bot.db.remove_gold(self.guild_id, self.user_id, self.bet)
-            # Set the embed for editing
-            embed = discord.Embed(
-                title="🎰 Slot Machine",
-                color=discord.Color.gold()
-            )
-            embed.add_field(name="No win this time, Try again!", value=f"`{a}` `{b}` `{c}`", inline=False)
+            title, payout = "No win this time, Try again!", 0
+
+        # Set the embed for the result
+        embed = discord.Embed(
+            title="🎰 Slot Machine",
+            color=discord.Color.gold()
+        )
+        embed.add_field(name=title, value=f"`{a}` `{b}` `{c}`", inline=False)
+        if payout:
+            # Give the user their bet back plus the payout
+            await self.settle(self.bet + payout)
+            embed.add_field(name="Payout", value=f"You won **{payout}** gold!", inline=False)
+        else:
+            # The bet in escrow goes to the house
+            await self.settle(0)
             embed.add_field(name="Payout", value=f"You lost **{self.bet}** gold!", inline=False)
-            # Send the embed
+
+        # Send the embed
+        if message is None:
+            await interaction.response.edit_message(embed=embed, view=None)
+        else:
             await message.edit(embed=embed, view=None)
 
     # Disable the buttons on discord's response timeout
@@ -153,8 +141,9 @@ class Slots(commands.Cog):
     """
     Slot machine game for The Cavern's casino.
     
-    Interactive slot machine with spin animation, multiple win conditions,
-    and varying payout rates based on symbol combinations.
+    Interactive slot machine with spin animation (skipped while the bot sheds
+    load), multiple win conditions, and varying payout rates based on symbol
+    combinations.
     """
     
     def __init__(self, bot):
@@ -162,6 +151,14 @@ class Slots(commands.Cog):
         self.logger = logging.getLogger(__name__)
         self.logger.info("Slots game loaded successfully")
 
+    async def cog_load(self):
+        # Spins don't survive a restart, give back bets left in escrow by one.
+        # A reload keeps the bot running, so spins in progress then are left alone
+        if not self.bot.is_ready():
+            released = self.bot.db.release_holds("slots:", source="slots")
+            if released:
+                self.logger.info("Gave back %s slots bets left in escrow", released)
+
     @app_commands.command(name="slots", description="Try your luck on the slot machine!")
     @app_commands.describe(bet="The amount of gold you want to bet (Max 100)")
     @app_commands.checks.cooldown(3, 180)
@@ -0,0 +1,132 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+
+from utils.profiler import SamplingProfiler
+
+# Where profile reports are written
+PROFILE_DIR = os.path.join("data", "profiles")
+
+class Owner(commands.Cog):
+    """
+    Bot owner tools for The Cavern.
+
+    Diagnostics and maintenance for the running bot that only the bot's
+    owner can use, such as profiling it or reloading a cog without a restart.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.logger = logging.getLogger(__name__)
+        # Only one profile runs at a time
+        self.profile_lock = asyncio.Lock()
+        self.logger.info("Owner tools loaded successfully")
+
+    # Reply and return False unless the user owns the bot
+    async def check_owner(self, interaction: discord.Interaction) -> bool:
+        if await self.bot.is_owner(interaction.user):
+            return True
+        self.logger.warning("Owner command refused for user_id=%s in guild_id=%s", interaction.user.id, getattr(interaction.guild, 'id', None))
+        await interaction.response.send_message("Only the bot owner can use this command.", ephemeral=True)
+        return False
+
+    # Profile the running bot
+    @app_commands.command(name="profile", description="Profile the bot's CPU and memory use for a while (Owner only)")
+    @app_commands.describe(seconds="How long to profile for (5-120 seconds)")
+    async def profile(self, interaction: discord.Interaction, seconds: app_commands.Range[int, 5, 120] = 30):
+        self.logger.info("Command invoked by user_id=%s in guild_id=%s, seconds=%s", interaction.user.id, getattr(interaction.guild, 'id', None), seconds)
+        if not await self.check_owner(interaction):
+            return
+        if self.profile_lock.locked():
+            await interaction.response.send_message("A profile is already running, try again when it finishes.", ephemeral=True)
+            return
+        try:
+            async with self.profile_lock:
+                await interaction.response.defer(ephemeral=True, thinking=True)
+                report = await SamplingProfiler().run(seconds)
+
+                # Keep a copy on disk as well as attaching it
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                path = os.path.join(PROFILE_DIR, f"profile-{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.txt")
+                await asyncio.to_thread(self.write_report, path, report)
+                self.logger.info("Profile written to %s", path)
+
+                await interaction.followup.send(
+                    f"Profiled for {seconds}s, report saved to `{path}`.",
+                    file=discord.File(path),
+                    ephemeral=True
+                )
+        except Exception as e:
+            self.logger.exception("Error occurred while profiling for user_id=%s", interaction.user.id)
+            await interaction.followup.send("An error occurred while profiling. Please check the logs.", ephemeral=True)
+
+    # Reload an extension, carrying its cogs' in-memory state across
+    @app_commands.command(name="reload", description="Reload a bot extension without restarting (Owner only)")
+    @app_commands.describe(extension="The extension to reload, e.g. cogs.Games.blackjack")
+    async def reload(self, interaction: discord.Interaction, extension: str):
+        self.logger.info("Command invoked by user_id=%s in guild_id=%s, extension=%s", interaction.user.id, getattr(interaction.guild, 'id', None), extension)
+        if not await self.check_owner(interaction):
+            return
+        if extension not in self.bot.extensions:
+            await interaction.response.send_message(f"`{extension}` isn't loaded.", ephemeral=True)
+            return
+        try:
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            started = time.perf_counter()
+
+            # Cogs can hand state to their reloaded selves with export_state/import_state
+            state = {}
+            for name, cog in self.bot.cogs.items():
+                if cog.__module__ == extension and hasattr(cog, "export_state"):
+                    state[name] = cog.export_state()
+
+            # reload_extension rolls back to the old module if the new one fails to load
+            await self.bot.reload_extension(extension)
+
+            carried = []
+            for name, cog_state in state.items():
+                cog = self.bot.get_cog(name)
+                if cog is None or not hasattr(cog, "import_state"):
+                    self.logger.warning("Reloaded %s has no %s cog to take its state", extension, name)
+                    continue
+                try:
+                    cog.import_state(cog_state)
+                    carried.append(name)
+                except Exception:
+                    self.logger.exception("Cog %s failed to import its state after reloading", name)
+            reload_ms = (time.perf_counter() - started) * 1000
+
+            # Only sync commands if the reload changed them
+            synced = await self.bot.sync_commands()
+
+            self.logger.info("Reloaded %s in %.1fms, state carried for %s, commands synced: %s", extension, reload_ms, carried, synced)
+            await interaction.followup.send(
+                f"Reloaded `{extension}` in {reload_ms:.1f}ms."
+                + (f" State carried over for {', '.join(carried)}." if carried else "")
+                + (" Commands changed and were synced." if synced else ""),
+                ephemeral=True
+            )
+        except Exception as e:
+            self.logger.exception("Error occurred while reloading %s", extension)
+            await interaction.followup.send(f"Reloading `{extension}` failed, the old version is still running: `{e}`", ephemeral=True)
+
+    @reload.autocomplete("extension")
+    async def reload_extension_autocomplete(self, interaction: discord.Interaction, current: str):
+        current = current.lower()
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in sorted(self.bot.extensions) if current in name.lower()
+        ][:25]
+
+    def write_report(self, path: str, report: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report)
+
+async def setup(bot):
+    """Load the Owner cog into the bot."""
+    await bot.add_cog(Owner(bot))
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import os
+
+from discord.ext import commands, tasks
+
+# Days after leaving before a member's data is archived (0 never archives departed members)
+PRUNE_DEPARTED_DAYS = int(os.getenv('PRUNE_DEPARTED_DAYS', 30))
+# Delete records with no activity at all (they are recreated as needed)
+PRUNE_DORMANT = os.getenv('PRUNE_DORMANT', 'true').lower() in ('1', 'true', 'yes')
+
+
+class Pruning(commands.Cog):
+    """
+    Automatic pruning of departed and dormant users.
+
+    Runs daily. Members who left more than PRUNE_DEPARTED_DAYS ago are
+    written to a compressed archive segment (and restored if they rejoin),
+    records identical to a new user's are deleted outright, and the database
+    is then compacted so its size follows active membership.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.logger = logging.getLogger(__name__)
+        self.logger.info("Pruning system loaded successfully")
+        # Start the automated daily pruning task
+        self.prune_users.start()
+
+    def cog_unload(self):
+        # Stop the task when the cog is unloaded
+        self.prune_users.cancel()
+
+    @tasks.loop(hours=24)  # Run every 24 hours
+    async def prune_users(self):
+        """Archive departed users, delete dormant ones and compact the database"""
+        self.logger.info("Starting daily user pruning")
+
+        try:
+            db = self.bot.db
+            # Flush first so the sizes before and after are comparable
+            await db.flush_async()
+            size_before = db.get_storage_size()
+            # Scan off the event loop, most users may be in the cold store
+            rows = await asyncio.to_thread(db.get_prunable_users, PRUNE_DEPARTED_DAYS, PRUNE_DORMANT)
+            if not rows:
+                self.logger.info("User pruning completed, nothing to prune")
+                return
+
+            # Archive departed users before deleting anything, off the event loop
+            departed = [row for row in rows if row[2] == "departed"]
+            if departed:
+                path = await asyncio.to_thread(db.archive.write_segment, departed)
+                db.archive.commit(path, departed)
+
+            # Users may have come back or been touched while the archive was written
+            planned = {(guild_id, user_id, reason) for guild_id, user_id, reason, _ in rows}
+            fresh = await asyncio.to_thread(db.get_prunable_users, PRUNE_DEPARTED_DAYS, PRUNE_DORMANT)
+            # and again on the event loop for anyone paged back in during that scan
+            rows = db.recheck_prunable([row for row in fresh if row[:3] in planned], PRUNE_DEPARTED_DAYS, PRUNE_DORMANT)
+            kept = {(guild_id, user_id) for guild_id, user_id, reason, _ in departed} - {row[:2] for row in rows}
+            db.archive.discard(kept)
+            db.delete_users(rows)
+
+            # Write the smaller database out, then shrink the cold store
+            await db.compact()
+
+            self.logger.info(
+                "User pruning completed. Archived %s departed users, deleted %s dormant users, storage %.1f KB -> %.1f KB",
+                sum(1 for row in rows if row[2] == "departed"), sum(1 for row in rows if row[2] == "dormant"),
+                size_before / 1024, db.get_storage_size() / 1024
+            )
+
+        except Exception as e:
+            self.logger.exception("Error occurred during user pruning")
+
+    @prune_users.before_loop
+    async def before_prune_users(self):
+        """Wait until the bot is ready before starting the task"""
+        await self.bot.wait_until_ready()
+
+    @prune_users.error
+    async def prune_users_error(self, error):
+        """Handle errors in the pruning task"""
+        self.logger.exception("Error in pruning task")
+
+async def setup(bot):
+    """Load the Pruning cog into the bot."""
+    await bot.add_cog(Pruning(bot))
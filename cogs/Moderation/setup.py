@@ -84,6 +84,7 @@ class SetupCog(commands.Cog):
                 await interaction.response.send_message(content=f"Successfully set Log Channel to #{channel.name}", ephemeral=True)
             elif type == "intro":
                 self.bot.db.set_intros_channel(guild_id, channel_id)
+                self.bot.dispatch("intros_channel_update", guild_id, channel_id)
                 await interaction.response.send_message(content=f"Successfully set Intro Channel to #{channel.name}", ephemeral=True)
             elif type == "bot":
                 self.bot.db.set_bot_channel(guild_id, channel_id)
@@ -36,42 +36,40 @@ class WarningExpiry(commands.Cog):
             total_expired = 0
             guilds_checked = 0
             
-            # Check all guilds in the database
-            for guild_id_str in self.bot.db.data:
+            # Check every user, including those paged out to the cold store
+            guilds = set()
+            for guild_id_str, user_id_str, user_data in self.bot.db.iter_users():
                 guild_id = int(guild_id_str)
-                guild = self.bot.db.get_guild(guild_id)
-                guilds_checked += 1
+                user_id = int(user_id_str)
+                guilds.add(guild_id)
+                warnings = user_data.get("warnings", [])
                 
-                # Check each user in the guild
-                for user_id_str in guild.get("users", {}):
-                    user_id = int(user_id_str)
-                    user_data = guild["users"][user_id_str]
-                    warnings = user_data.get("warnings", [])
-                    
-                    if not warnings:
-                        continue
-                    
-                    # Filter out expired warnings
-                    original_count = len(warnings)
-                    valid_warnings = []
-                    
-                    for warning in warnings:
-                        try:
-                            warning_time = datetime.fromisoformat(warning.get("timestamp", ""))
-                            if warning_time > expiry_threshold:
-                                valid_warnings.append(warning)
-                        except (ValueError, TypeError):
-                            # If timestamp is invalid, keep the warning for now
+                if not warnings:
+                    continue
+                
+                # Filter out expired warnings
+                original_count = len(warnings)
+                valid_warnings = []
+                
+                for warning in warnings:
+                    try:
+                        warning_time = datetime.fromisoformat(warning.get("timestamp", ""))
+                        if warning_time > expiry_threshold:
                             valid_warnings.append(warning)
+                    except (ValueError, TypeError):
+                        # If timestamp is invalid, keep the warning for now
+                        valid_warnings.append(warning)
+                
+                # Update warnings if any were removed
+                if len(valid_warnings) < original_count:
+                    expired_count = original_count - len(valid_warnings)
+                    total_expired += expired_count
                     
-                    # Update warnings if any were removed
-                    if len(valid_warnings) < original_count:
-                        expired_count = original_count - len(valid_warnings)
-                        total_expired += expired_count
-                        
-                        # Update the user's warnings in the database
-                        user_data["warnings"] = valid_warnings
-                        self.logger.info(f"Removed {expired_count} expired warnings from user {user_id} in guild {guild_id}")
+                    # Update the user's warnings in the database
+                    user_data["warnings"] = valid_warnings
+                    self.bot.db.save_user(guild_id, user_id, user_data)
+                    self.logger.info(f"Removed {expired_count} expired warnings from user {user_id} in guild {guild_id}")
+            guilds_checked = len(guilds)
             
             # Save the database after all changes
             self.bot.db._save_database()
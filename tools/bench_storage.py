@@ -0,0 +1,170 @@
+"""
+Benchmark of the database storage against TinyDB's default JSONStorage.
+
+Times loading a database file, writing it once, and the truncate and
+reinsert that Database._save_database does after every change, for the
+stock JSONStorage and for the streaming orjson storage behind the flushing
+cache used by utils/database.py, and compares the peak RSS while loading
+with the RSS the loaded database settles at. Runs on a copy of an existing database.json, or on a
+generated one.
+
+Usage:
+    python tools/bench_storage.py --file data/database.json
+    python tools/bench_storage.py --guilds 20 --users 5000
+"""
+import argparse
+import copy
+import os
+import shutil
+import sys
+import subprocess
+import tempfile
+import time
+
+from tinydb import TinyDB
+from tinydb.storages import JSONStorage
+
+# Allow running from the repository root without installing anything
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.storage import FastJSONStorage, FlushingCachingMiddleware, orjson
+
+
+# Write a database file shaped like the bot's (one document per guild)
+def generate_database(path: str, guilds: int, users: int):
+    user = {
+        "warnings": [], "tier": 1, "message_count": 120, "gold": 350,
+        "roulette_wins": 3, "roulette_losses": 4, "blackjack_wins": 2, "blackjack_losses": 5,
+        "slots_wins": 1, "slots_losses": 6, "last_daily_claim": "2025-01-01", "streak": 2,
+        "mimic_expiry": None, "barrel_expiry": None, "blackjack_session": None,
+    }
+    db = TinyDB(path, storage=FastJSONStorage)
+    for g in range(guilds):
+        db.insert({
+            "guild_id": str(100000000000000000 + g),
+            "data": {"colour_roles": {}, "stickies": {}, "users": {str(200000000000000000 + u): copy.deepcopy(user) for u in range(users)}},
+        })
+    db.close()
+
+
+# Best of `repeat` runs of fn, in milliseconds
+def best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+# Load the database in a fresh process, returns how much its peak and
+# steady state RSS grew over the RSS before loading, in MB
+MEMORY_PROBE = """
+import resource, sys
+sys.path.insert(0, sys.argv[1])
+from tools.bench_storage import open_default, open_fast
+from utils.runtime import current_rss_mb
+
+def peak_rss_mb():
+    # ru_maxrss carries over the parent's RSS through fork and exec, VmHWM doesn't
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 1024
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+open_db = open_fast if sys.argv[3] == "fast" else open_default
+before = current_rss_mb()
+db = open_db(sys.argv[2])
+# Keep the documents, as Database.data does
+documents = db.all()
+print(peak_rss_mb() - before, current_rss_mb() - before)
+"""
+
+
+def rss_growth_mb(path: str, kind: str):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", MEMORY_PROBE, root, path, kind],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), float(output[1])
+
+
+def open_default(path):
+    return TinyDB(path, storage=JSONStorage)
+
+
+def open_fast(path):
+    return TinyDB(path, storage=FlushingCachingMiddleware(FastJSONStorage))
+
+
+def load(open_db, path):
+    def run():
+        db = open_db(path)
+        db.all()
+        db.close()
+    return run
+
+
+# One Database._save_database, plus the flush the cached storage needs to reach disk
+def save_database(open_db, path):
+    db = open_db(path)
+    documents = [(doc["guild_id"], doc["data"]) for doc in db.all()]
+
+    def run():
+        db.truncate()
+        for guild_id, data in documents:
+            db.insert({"guild_id": guild_id, "data": data})
+        if hasattr(db.storage, "flush"):
+            db.storage.flush()
+    return run
+
+
+def write_once(storage_cls, path, data):
+    storage = storage_cls(path)
+    return lambda: storage.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark database storage load and save times.")
+    parser.add_argument("--file", help="Existing database.json to benchmark (a copy is used)")
+    parser.add_argument("--guilds", type=int, default=5, help="Guilds in a generated database")
+    parser.add_argument("--users", type=int, default=2000, help="Users per guild in a generated database")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement, the best is reported")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_storage_")
+    try:
+        path = os.path.join(workdir, "database.json")
+        if args.file:
+            shutil.copyfile(args.file, path)
+        else:
+            generate_database(path, args.guilds, args.users)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        data = FastJSONStorage(path).read()
+
+        print(f"Database: {size_mb:.2f} MB, codec: {'orjson' if orjson else 'json (orjson not installed)'}")
+        print(f"{'operation':<26}{'JSONStorage':>14}{'fast+cache':>14}{'speedup':>10}")
+        print("-" * 64)
+        rows = [
+            ("load", load(open_default, path), load(open_fast, path)),
+            ("write once", write_once(JSONStorage, path, data), write_once(FastJSONStorage, path, data)),
+            ("save_database + flush", save_database(open_default, path), save_database(open_fast, path)),
+        ]
+        for name, default, fast in rows:
+            default_ms = best_ms(default, args.repeat)
+            fast_ms = best_ms(fast, args.repeat)
+            print(f"{name:<26}{default_ms:>12.1f}ms{fast_ms:>12.1f}ms{default_ms / fast_ms:>9.1f}x")
+
+        # Peak RSS while loading against what the loaded database keeps using
+        default_peak, default_steady = rss_growth_mb(path, "default")
+        fast_peak, fast_steady = rss_growth_mb(path, "fast")
+        print(f"{'load peak RSS':<26}{default_peak:>12.1f}MB{fast_peak:>12.1f}MB")
+        print(f"{'loaded RSS':<26}{default_steady:>12.1f}MB{fast_steady:>12.1f}MB")
+        print("\nThe bot only flushes every DB_FLUSH_INTERVAL seconds, so most saves skip the flush entirely.")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
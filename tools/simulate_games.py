@@ -0,0 +1,233 @@
+"""
+Offline Monte Carlo simulator for The Cavern's casino games.
+
+Plays millions of vectorised rounds of roulette, slots and blackjack against
+the exact rules and payout tables used by the game cogs, and reports the
+expected value, variance and gold flow per game. Use it to tune the economy
+before changing a payout in the cogs.
+
+Usage:
+    python tools/simulate_games.py --rounds 5000000 --bet 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Allow running from the repository root without installing anything
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.outcomes import SLOT_SYMBOLS, SLOT_WEIGHTS, WHEEL
+
+# ~~~~~~~~~~ Game rules (mirrors the cogs and utils/outcomes.py) ~~~~~~~~~~
+# Roulette (cogs/Games/roulette.py): "00", "0" are green, even numbers red,
+# odd numbers black. A win pays the bet (15x on green), a loss takes the bet.
+ROULETTE_POCKETS = len(WHEEL)
+ROULETTE_GREEN = sum(1 for pocket in WHEEL if pocket.colour == "green")
+ROULETTE_RED = sum(1 for pocket in WHEEL if pocket.colour == "red")
+ROULETTE_BLACK = sum(1 for pocket in WHEEL if pocket.colour == "black")
+ROULETTE_PAYOUTS = {"red": 1, "black": 1, "green": 15}
+
+# Slots (cogs/Games/slots.py): three independent weighted reels.
+SLOT_SEVEN = SLOT_SYMBOLS.index("7️⃣")
+SLOT_MELON = SLOT_SYMBOLS.index("🍉")
+# Each result takes one branch of the if/elif chain in SlotsView.play, so
+# triple 7s pay the 49x mega jackpot only.
+SLOT_PAYOUTS = {"seven": 49, "melon": 9, "triple": 7, "pair": 2}
+
+# Blackjack (cogs/Games/blackjack.py): single 52 card deck, dealer draws to
+# 17 and stands on soft 17. The bet is held when the cards are dealt: wins
+# pay 1.5x, a bust or a losing stand loses the bet and a draw returns it.
+BLACKJACK_WIN_MULTIPLIER = 1.5
+BLACKJACK_DEALER_STANDS = 17
+CARD_VALUES = np.array([min(rank, 10) for rank in range(1, 14)] * 4, dtype=np.int8)
+# No round can use more than 18 cards (the smallest 18 cards already total
+# more than a bust player plus a standing dealer), so only the top of each
+# deck needs shuffling
+DEAL_DEPTH = 20
+
+
+# Report the statistics for an array of per-round net gold for the player
+def summarise(name: str, net: np.ndarray, bet: int) -> dict:
+    return {
+        "game": name,
+        "rounds": int(net.size),
+        "ev": float(net.mean()),
+        "edge": float(-net.mean() / bet),
+        "variance": float(net.var()),
+        "inflow": int(-net[net < 0].sum()),
+        "outflow": int(net[net > 0].sum()),
+    }
+
+
+# ~~~~~~~~~~ Roulette ~~~~~~~~~~
+def simulate_roulette(rng: np.random.Generator, rounds: int, bet: int, colour: str) -> np.ndarray:
+    # Pockets 0-1 are green, then red and black
+    pockets = rng.integers(0, ROULETTE_POCKETS, size=rounds, dtype=np.int8)
+    if colour == "green":
+        win = pockets < ROULETTE_GREEN
+    elif colour == "red":
+        win = (pockets >= ROULETTE_GREEN) & (pockets < ROULETTE_GREEN + ROULETTE_RED)
+    else:
+        win = pockets >= ROULETTE_GREEN + ROULETTE_RED
+    return np.where(win, bet * ROULETTE_PAYOUTS[colour], -bet).astype(np.int64)
+
+
+def roulette_ev(bet: int, colour: str) -> float:
+    pockets = {"red": ROULETTE_RED, "black": ROULETTE_BLACK, "green": ROULETTE_GREEN}[colour]
+    p_win = pockets / ROULETTE_POCKETS
+    return p_win * bet * ROULETTE_PAYOUTS[colour] - (1 - p_win) * bet
+
+
+# ~~~~~~~~~~ Slots ~~~~~~~~~~
+def simulate_slots(rng: np.random.Generator, rounds: int, bet: int) -> np.ndarray:
+    reels = rng.choice(len(SLOT_SYMBOLS), size=(rounds, 3), p=SLOT_WEIGHTS).astype(np.int8)
+    a, b, c = reels[:, 0], reels[:, 1], reels[:, 2]
+    triple = (a == b) & (b == c)
+    pair = ~triple & ((a == b) | (b == c) | (a == c))
+
+    net = np.full(rounds, -bet, dtype=np.int64)
+    net[pair] = bet * SLOT_PAYOUTS["pair"]
+    net[triple] = bet * SLOT_PAYOUTS["triple"]
+    net[triple & (a == SLOT_MELON)] = bet * SLOT_PAYOUTS["melon"]
+    net[triple & (a == SLOT_SEVEN)] = bet * SLOT_PAYOUTS["seven"]
+    return net
+
+
+def slots_ev(bet: int) -> float:
+    p = np.array(SLOT_WEIGHTS)
+    p_triples = p ** 3
+    p_triple = p_triples.sum()
+    p_pair = 3 * (p ** 2 * (1 - p)).sum()
+    ev = (
+        p_triples[SLOT_SEVEN] * SLOT_PAYOUTS["seven"]
+        + p_triples[SLOT_MELON] * SLOT_PAYOUTS["melon"]
+        + (p_triple - p_triples[SLOT_SEVEN] - p_triples[SLOT_MELON]) * SLOT_PAYOUTS["triple"]
+        + p_pair * SLOT_PAYOUTS["pair"]
+        - (1 - p_triple - p_pair)
+    )
+    return float(ev * bet)
+
+
+# ~~~~~~~~~~ Blackjack ~~~~~~~~~~
+# Best total of a hand given its hard total (aces as 1) and whether it holds an ace
+def best_total(hard: np.ndarray, has_ace: np.ndarray) -> np.ndarray:
+    return np.where(has_ace & (hard + 10 <= 21), hard + 10, hard)
+
+
+# Partially Fisher-Yates shuffle one deck per round, only the top cards are dealt
+def shuffle_decks(rng: np.random.Generator, rounds: int) -> np.ndarray:
+    decks = np.tile(CARD_VALUES, (rounds, 1))
+    rows = np.arange(rounds)
+    for i in range(DEAL_DEPTH):
+        j = rng.integers(i, CARD_VALUES.size, size=rounds)
+        top = decks[rows, i].copy()
+        decks[rows, i] = decks[rows, j]
+        decks[rows, j] = top
+    return decks[:, :DEAL_DEPTH]
+
+
+def simulate_blackjack(rng: np.random.Generator, rounds: int, bet: int, stand_on: int) -> np.ndarray:
+    # Cards are dealt in order from the top of each shuffled deck
+    decks = shuffle_decks(rng, rounds)
+    rows = np.arange(rounds)
+
+    # Player gets the first two cards, dealer the next two
+    player_hard = decks[:, 0].astype(np.int16) + decks[:, 1]
+    player_ace = (decks[:, 0] == 1) | (decks[:, 1] == 1)
+    dealer_hard = decks[:, 2].astype(np.int16) + decks[:, 3]
+    dealer_ace = (decks[:, 2] == 1) | (decks[:, 3] == 1)
+    next_card = np.full(rounds, 4, dtype=np.int16)
+
+    # Player hits until reaching the stand threshold or busting
+    while True:
+        hitting = best_total(player_hard, player_ace) < stand_on
+        if not hitting.any():
+            break
+        card = decks[rows, next_card]
+        player_hard = player_hard + np.where(hitting, card, 0)
+        player_ace |= hitting & (card == 1)
+        next_card += hitting
+
+    player_val = best_total(player_hard, player_ace)
+    bust = player_val > 21
+
+    # Dealer only plays out hands where the player stood
+    while True:
+        hitting = ~bust & (best_total(dealer_hard, dealer_ace) < BLACKJACK_DEALER_STANDS)
+        if not hitting.any():
+            break
+        card = decks[rows, next_card]
+        dealer_hard = dealer_hard + np.where(hitting, card, 0)
+        dealer_ace |= hitting & (card == 1)
+        next_card += hitting
+
+    dealer_val = best_total(dealer_hard, dealer_ace)
+    win = ~bust & ((dealer_val > 21) | (player_val > dealer_val))
+    lose = bust | (~win & (dealer_val > player_val))
+
+    net = np.zeros(rounds, dtype=np.int64)
+    net[win] = round(bet * BLACKJACK_WIN_MULTIPLIER)
+    net[lose] = -bet
+    return net
+
+
+# Run a simulation in fixed size chunks to keep memory flat
+def run_chunked(simulate, rounds: int, chunk: int) -> np.ndarray:
+    parts = []
+    remaining = rounds
+    while remaining > 0:
+        size = min(chunk, remaining)
+        parts.append(simulate(size))
+        remaining -= size
+    return np.concatenate(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the house edge of the casino games")
+    parser.add_argument("--rounds", type=int, default=1_000_000, help="Rounds to simulate per game")
+    parser.add_argument("--bet", type=int, default=10, help="Bet size in gold")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    parser.add_argument("--chunk", type=int, default=250_000, help="Rounds per vectorised batch")
+    parser.add_argument("--stand-on", type=int, default=17, help="Blackjack player stands at this total")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    bet = args.bet
+    results = []
+
+    for colour in ("red", "black", "green"):
+        start = time.perf_counter()
+        net = run_chunked(lambda n: simulate_roulette(rng, n, bet, colour), args.rounds, args.chunk)
+        stats = summarise(f"roulette ({colour})", net, bet)
+        stats.update(exact=roulette_ev(bet, colour), seconds=time.perf_counter() - start)
+        results.append(stats)
+
+    start = time.perf_counter()
+    net = run_chunked(lambda n: simulate_slots(rng, n, bet), args.rounds, args.chunk)
+    stats = summarise("slots", net, bet)
+    stats.update(exact=slots_ev(bet), seconds=time.perf_counter() - start)
+    results.append(stats)
+
+    start = time.perf_counter()
+    net = run_chunked(lambda n: simulate_blackjack(rng, n, bet, args.stand_on), args.rounds, args.chunk)
+    stats = summarise(f"blackjack (stand {args.stand_on})", net, bet)
+    stats.update(exact=None, seconds=time.perf_counter() - start)
+    results.append(stats)
+
+    print(f"{args.rounds:,} rounds per game at a bet of {bet} gold\n")
+    header = f"{'game':<22}{'EV/round':>10}{'exact':>10}{'edge':>9}{'variance':>12}{'gold in':>14}{'gold out':>14}{'rounds/s':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        exact = f"{r['exact']:.3f}" if r["exact"] is not None else "-"
+        print(
+            f"{r['game']:<22}{r['ev']:>10.3f}{exact:>10}{r['edge']:>9.2%}{r['variance']:>12.1f}"
+            f"{r['inflow']:>14,}{r['outflow']:>14,}{r['rounds'] / r['seconds']:>12,.0f}"
+        )
+    print("\nEdge is the house edge per gold wagered (negative means players profit).")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class GuildActors:
+    """
+    Serialises each guild's writes while guilds run in parallel.
+
+    `run(guild_id, func, ...)` queues a function (or coroutine function) on
+    the guild's actor and returns its result once it has run. Each guild has
+    its own queue worked through in order by its own task, so a check and the
+    write that depends on it can't interleave with another job in the same
+    guild, even across awaits, while other guilds carry on. An actor exits
+    after `idle_timeout` seconds with nothing queued. A job must not `run`
+    another job on its own guild, it would wait for itself.
+
+    The time each job spends queued is kept for the last `latency_window`
+    jobs, to show when a guild's writes start backing up.
+    """
+
+    def __init__(self, idle_timeout: float = 60.0, latency_window: int = 1000):
+        self.idle_timeout = idle_timeout
+        self.queues: Dict[int, asyncio.Queue] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+        self.waits = deque(maxlen=latency_window)
+        self.pending = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.jobs = 0
+        self.errors = 0
+        self.max_wait = 0.0
+
+    # Run func on the guild's actor, returns (or raises) what it does
+    async def run(self, guild_id: int, func: Callable[..., Any], *args, **kwargs) -> Any:
+        guild_id = int(guild_id)
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.get(guild_id)
+        if queue is None:
+            queue = self.queues[guild_id] = asyncio.Queue()
+        queue.put_nowait((func, args, kwargs, future, time.perf_counter()))
+        self.pending += 1
+        self._idle.clear()
+        if guild_id not in self.workers:
+            self.workers[guild_id] = asyncio.create_task(self._work(guild_id, queue), name=f"guild-actor-{guild_id}")
+        # A caller that gives up doesn't stop a write that has already started
+        return await asyncio.shield(future)
+
+    async def _work(self, guild_id: int, queue: asyncio.Queue):
+        try:
+            while True:
+                try:
+                    func, args, kwargs, future, queued = await asyncio.wait_for(queue.get(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    # Nothing can be queued between this check and leaving, there's no await
+                    if queue.empty():
+                        return
+                    continue
+
+                wait = time.perf_counter() - queued
+                self.waits.append(wait)
+                self.max_wait = max(self.max_wait, wait)
+                self.jobs += 1
+                try:
+                    result = func(*args, **kwargs)
+                    if inspect.isawaitable(result):
+                        result = await result
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    self.errors += 1
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+                finally:
+                    self._done()
+        finally:
+            self.workers.pop(guild_id, None)
+            if queue.empty():
+                self.queues.pop(guild_id, None)
+
+    def _done(self):
+        self.pending -= 1
+        if self.pending == 0:
+            self._idle.set()
+
+    # Wait up to timeout seconds for every queued job to run, returns how many are left
+    async def drain(self, timeout: float) -> int:
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%s guild actor jobs still queued after %ss", self.pending, timeout)
+        return self.pending
+
+    # Actor metrics, queue waits in milliseconds
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+        return {
+            "actors": len(self.workers),
+            "pending": self.pending,
+            "jobs": self.jobs,
+            "errors": self.errors,
+            "wait_p50_ms": round(waits[len(waits) // 2] * 1000, 2) if waits else 0,
+            "wait_p95_ms": round(waits[int(len(waits) * 0.95)] * 1000, 2) if waits else 0,
+            "wait_max_ms": round(self.max_wait * 1000, 2),
+        }
@@ -0,0 +1,100 @@
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.ledger import ledger_key
+
+logger = logging.getLogger(__name__)
+
+
+class UserArchive:
+    """
+    Compressed archive of pruned user records.
+
+    Each pruning run writes one gzipped NDJSON segment, a line per user with
+    the guild, user, reason and the record as it was. An index maps each
+    archived user to the segment holding their latest record, so a returning
+    member can be restored without scanning every segment.
+    """
+
+    def __init__(self, directory: str = "data/archive"):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        os.makedirs(directory, exist_ok=True)
+        self.index: Dict[str, str] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    # Write (guild_id, user_id, reason, record) rows to a new segment, returns its path.
+    # Safe to call from a worker thread, the index is only updated by commit
+    def write_segment(self, rows: List[Tuple[str, str, str, Dict[str, Any]]]) -> str:
+        name = f"segment-{time.strftime('%Y%m%d-%H%M%S')}-{len(rows)}.ndjson.gz"
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.tmp"
+        archived_at = int(time.time())
+        with gzip.open(tmp_path, "wb") as f:
+            for guild_id, user_id, reason, record in rows:
+                line = {"guild": guild_id, "user": user_id, "reason": reason, "archived_at": archived_at, "record": record}
+                f.write(json.dumps(line, separators=(",", ":")).encode() + b"\n")
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return path
+
+    # Point the index at a written segment for each of its users
+    def commit(self, path: str, rows: List[Tuple[str, str, str, Dict[str, Any]]]):
+        name = os.path.basename(path)
+        for guild_id, user_id, _, _ in rows:
+            self.index[ledger_key(guild_id, user_id)] = name
+        self._write_index()
+
+    def _write_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return ledger_key(*key) in self.index
+
+    # Take a user's archived record out of the archive, None if they aren't in it
+    def restore(self, guild_id, user_id) -> Optional[Dict[str, Any]]:
+        key = ledger_key(guild_id, user_id)
+        name = self.index.get(key)
+        if name is None:
+            return None
+        record = None
+        try:
+            with gzip.open(os.path.join(self.directory, name), "rb") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if ledger_key(entry["guild"], entry["user"]) == key:
+                        record = entry["record"]
+                        break
+        except (OSError, ValueError):
+            logger.exception("Could not read archive segment %s", name)
+            return None
+        del self.index[key]
+        self._write_index()
+        return record
+
+    # Drop index entries for users who were archived but not pruned after all
+    def discard(self, keys):
+        removed = [ledger_key(*key) for key in keys if ledger_key(*key) in self.index]
+        for key in removed:
+            del self.index[key]
+        if removed:
+            self._write_index()
+
+    # Archive metrics
+    def stats(self) -> Dict[str, int]:
+        segments = [name for name in os.listdir(self.directory) if name.endswith(".ndjson.gz")]
+        return {
+            "archived_users": len(self.index),
+            "segments": len(segments),
+            "bytes": sum(os.path.getsize(os.path.join(self.directory, name)) for name in segments),
+        }
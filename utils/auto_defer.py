@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import discord
+from discord import app_commands
+
+logger = logging.getLogger(__name__)
+
+# Discord drops an interaction that hasn't been responded to within this many seconds
+INTERACTION_DEADLINE = 3.0
+
+
+# AutoDeferrer swaps the response discord.py caches in Interaction._cs_response,
+# so a discord.py that caches it elsewhere fails at startup instead of never deferring
+def check_response_slot():
+    prop = discord.Interaction.__dict__.get("response")
+    if getattr(prop, "name", None) != "_cs_response" or "_cs_response" not in discord.Interaction.__slots__:
+        raise RuntimeError(
+            f"discord.py {discord.__version__} no longer caches Interaction.response in _cs_response, "
+            "AutoDeferrer needs updating (or set AUTO_DEFER_AFTER=0)"
+        )
+
+
+class AutoDeferResponse(discord.InteractionResponse):
+    """
+    Interaction response that can be deferred from outside the command.
+
+    Once auto deferred, `send_message` carries on as a followup, so commands
+    don't need to know it happened. The thinking message's visibility can't
+    be changed, so a reply with different visibility replaces it. The time
+    of the first response is kept for the deferral stats.
+    """
+
+    __slots__ = ("deferral", "deferred_ephemeral", "responded_at")
+
+    def __init__(self, parent: discord.Interaction):
+        super().__init__(parent)
+        # Resolves once the auto deferral reaches Discord, True if it worked
+        self.deferral: Optional[asyncio.Future] = None
+        self.deferred_ephemeral = False
+        self.responded_at: Optional[float] = None
+
+    # discord.py only marks a response done once its request returns, so
+    # responses are stamped before they're sent to keep two from racing
+    def _stamp(self):
+        if self.responded_at is None:
+            self.responded_at = time.perf_counter()
+
+    def is_done(self) -> bool:
+        return self.deferral is not None or super().is_done()
+
+    async def auto_defer(self, ephemeral: bool = False) -> bool:
+        if self.responded_at is not None:
+            return False
+        self._stamp()
+        self.deferral = asyncio.get_running_loop().create_future()
+        self.deferred_ephemeral = ephemeral
+        try:
+            await super().defer(ephemeral=ephemeral, thinking=True)
+        except discord.HTTPException:
+            self.deferral.set_result(False)
+            raise
+        self.deferral.set_result(True)
+        return True
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False):
+        if self.deferral is not None:
+            return None  # Already deferred for the command
+        self._stamp()
+        return await super().defer(ephemeral=ephemeral, thinking=thinking)
+
+    async def send_modal(self, modal: discord.ui.Modal, /):
+        self._stamp()
+        return await super().send_modal(modal)
+
+    async def send_message(self, content: Optional[Any] = None, *, ephemeral: bool = False, delete_after: Optional[float] = None, **kwargs):
+        if self.deferral is None:
+            self._stamp()
+            return await super().send_message(content, ephemeral=ephemeral, delete_after=delete_after, **kwargs)
+
+        # Deferred for the command, reply with a followup once the deferral has gone through
+        await asyncio.shield(self.deferral)
+        interaction = self._parent
+        if ephemeral != self.deferred_ephemeral:
+            await interaction.delete_original_response()
+        if content is not None:
+            kwargs["content"] = content
+        message = await interaction.followup.send(ephemeral=ephemeral, wait=True, **kwargs)
+        if delete_after is not None:
+            await message.delete(delay=delete_after)
+        return message
+
+
+class AutoDeferrer:
+    """
+    Defers application commands that haven't responded within `threshold` seconds.
+
+    Each command gets an AutoDeferResponse and a timer. If the command hasn't
+    responded when the timer fires, the interaction is deferred with a
+    thinking message and the command's reply becomes a followup, so slow
+    commands don't miss Discord's 3 second deadline. The timer can only fire
+    while the event loop is free, a command blocking the loop still responds
+    late, which shows up as `late` in the stats.
+
+    Commands opt out with `extras={"auto_defer": False}` (a command that may
+    open a modal must, a deferred interaction can't show one), and
+    `extras={"defer_ephemeral": True}` makes the thinking message ephemeral
+    for commands that mostly reply privately.
+    """
+
+    def __init__(self, threshold: float = 2.0):
+        if threshold:
+            check_response_slot()
+        self.threshold = threshold
+        self.commands: Dict[str, Dict[str, float]] = {}
+
+    async def run(self, interaction: discord.Interaction, call):
+        if not self.threshold or interaction.type is not discord.InteractionType.application_command:
+            return await call(interaction)
+
+        response = AutoDeferResponse(interaction)
+        interaction._cs_response = response
+        started = time.perf_counter()
+        timer = asyncio.create_task(self._defer_after(interaction, response))
+        try:
+            return await call(interaction)
+        finally:
+            timer.cancel()
+            self._record(interaction, response, started)
+
+    async def _defer_after(self, interaction: discord.Interaction, response: AutoDeferResponse):
+        await asyncio.sleep(self.threshold)
+        command = interaction.command
+        if command is None or not command.extras.get("auto_defer", True):
+            return
+        try:
+            if await response.auto_defer(ephemeral=command.extras.get("defer_ephemeral", False)):
+                logger.info("Deferred /%s after %ss without a response", command.qualified_name, self.threshold)
+        except discord.HTTPException:
+            logger.warning("Could not defer /%s, the interaction had already expired", command.qualified_name)
+
+    def _record(self, interaction: discord.Interaction, response: AutoDeferResponse, started: float):
+        command = interaction.command
+        if command is None:
+            return
+        stats = self.commands.setdefault(command.qualified_name, {
+            "invocations": 0, "deferred": 0, "defer_failed": 0, "late": 0, "response_ms_total": 0.0,
+        })
+        stats["invocations"] += 1
+        if response.deferral is not None:
+            stats["deferred"] += 1
+            if not (response.deferral.done() and response.deferral.result()):
+                stats["defer_failed"] += 1
+        if response.responded_at is not None:
+            elapsed = response.responded_at - started
+            stats["response_ms_total"] += elapsed * 1000
+            if elapsed > INTERACTION_DEADLINE:
+                stats["late"] += 1
+
+    # Per command deferral metrics, keyed "<command>_<stat>"
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"threshold_seconds": self.threshold}
+        for name, command in self.commands.items():
+            key = name.replace(" ", "_")
+            stats[f"{key}_invocations"] = command["invocations"]
+            stats[f"{key}_deferred"] = command["deferred"]
+            stats[f"{key}_defer_rate"] = round(command["deferred"] / command["invocations"], 3)
+            stats[f"{key}_defer_failed"] = command["defer_failed"]
+            stats[f"{key}_late"] = command["late"]
+            stats[f"{key}_avg_response_ms"] = round(command["response_ms_total"] / command["invocations"], 1)
+        return stats
+
+
+class AutoDeferCommandTree(app_commands.CommandTree):
+    """Command tree that runs each application command under the client's AutoDeferrer."""
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        deferrer: Optional[AutoDeferrer] = getattr(self.client, "auto_defer", None)
+        if deferrer is None:
+            return await super()._call(interaction)
+        return await deferrer.run(interaction, super()._call)
@@ -0,0 +1,121 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import discord
+from discord import app_commands
+
+# Discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+
+
+class AutocompleteIndex:
+    """
+    Prefix and substring index over a list of (name, value) choices.
+
+    Every suffix of every lowercased name is kept in one sorted list, so both
+    prefix and substring lookups are a binary search plus a walk over the
+    matches instead of a scan of every name.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        self.entries = sorted(entries, key=lambda entry: entry[0].lower())
+        self.suffixes = sorted(
+            (name.lower()[offset:], index, offset)
+            for index, (name, _) in enumerate(self.entries)
+            for offset in range(len(name))
+        )
+
+    # Find choices containing the query, names starting with it come first
+    def search(self, query: str, limit: int = MAX_CHOICES) -> List[Tuple[str, str]]:
+        query = query.lower().strip()
+        if not query:
+            return self.entries[:limit]
+
+        prefix, substring = set(), set()
+        i = bisect_left(self.suffixes, (query,))
+        while i < len(self.suffixes) and self.suffixes[i][0].startswith(query):
+            _, index, offset = self.suffixes[i]
+            (prefix if offset == 0 else substring).add(index)
+            i += 1
+
+        ranked = sorted(prefix) + sorted(substring - prefix)
+        return [self.entries[index] for index in ranked[:limit]]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class AutocompleteRegistry:
+    """
+    Shared, cached autocomplete for every slash command option in the bot.
+
+    Cogs register a loader per source that lists a guild's (name, value)
+    choices. The per-guild index is built on first use and kept until the cog
+    invalidates it, and recent results are kept in a small LRU per
+    (source, guild, user, query) because Discord asks again on every keystroke.
+    """
+
+    def __init__(self, cache_size: int = 512):
+        self.loaders: Dict[str, Callable[[discord.Guild], Iterable[Tuple[str, str]]]] = {}
+        self.indexes: Dict[Tuple[str, int], AutocompleteIndex] = {}
+        self.cache: "OrderedDict[tuple, List[app_commands.Choice]]" = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    # Register the function listing a guild's choices for a source
+    def register(self, source: str, loader: Callable[[discord.Guild], Iterable[Tuple[str, str]]]):
+        self.loaders[source] = loader
+        self.invalidate(source)
+
+    def unregister(self, source: str):
+        self.loaders.pop(source, None)
+        self.invalidate(source)
+
+    # Drop the index and cached results for a source, for one guild or all of them
+    def invalidate(self, source: str, guild_id: int = None):
+        for key in [k for k in self.indexes if k[0] == source and (guild_id is None or k[1] == guild_id)]:
+            del self.indexes[key]
+        for key in [k for k in self.cache if k[0] == source and (guild_id is None or k[1] == guild_id)]:
+            del self.cache[key]
+
+    # Get a guild's index for a source, building it if needed
+    def get_index(self, source: str, guild: discord.Guild) -> AutocompleteIndex:
+        key = (source, guild.id)
+        index = self.indexes.get(key)
+        if index is None:
+            index = AutocompleteIndex(self.loaders[source](guild))
+            self.indexes[key] = index
+            self.rebuilds += 1
+        return index
+
+    # Get the autocomplete choices for what a user has typed so far
+    def search(self, source: str, guild: discord.Guild, user_id: int, current: str) -> List[app_commands.Choice]:
+        key = (source, guild.id, user_id, current.lower())
+        choices = self.cache.get(key)
+        if choices is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return choices
+
+        self.misses += 1
+        choices = [
+            app_commands.Choice(name=name, value=value)
+            for name, value in self.get_index(source, guild).search(current)
+        ]
+        self.cache[key] = choices
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return choices
+
+    # Autocomplete metrics
+    def stats(self) -> Dict[str, int]:
+        return {
+            "indexes": len(self.indexes),
+            "cached_results": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rebuilds": self.rebuilds,
+        }
@@ -0,0 +1,92 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class ColdUserStore:
+    """
+    SQLite store for user records paged out of memory.
+
+    Records are kept as JSON keyed by (guild_id, user_id). A record stays in
+    the store after it is paged back in and is simply overwritten the next
+    time the user is paged out, so a crash between the two never loses the
+    only copy of a user. The in-memory copy always wins while it exists.
+    """
+
+    def __init__(self, path: str = "data/cold_users.sqlite"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self._owner = threading.get_ident()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "guild_id TEXT NOT NULL, user_id TEXT NOT NULL, record TEXT NOT NULL, "
+            "PRIMARY KEY (guild_id, user_id))"
+        )
+        self.conn.commit()
+
+    # Save a user's record, replacing any older copy
+    def put(self, guild_id: str, user_id: str, record: Dict[str, Any]):
+        self.put_many([(guild_id, user_id, record)])
+
+    # Save many records in one transaction
+    def put_many(self, rows):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO users (guild_id, user_id, record) VALUES (?, ?, ?)",
+                ((str(g), str(u), json.dumps(record, separators=(",", ":"))) for g, u, record in rows),
+            )
+
+    def get(self, guild_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT record FROM users WHERE guild_id = ? AND user_id = ?", (str(guild_id), str(user_id))
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, guild_id: str, user_id: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM users WHERE guild_id = ? AND user_id = ?", (str(guild_id), str(user_id)))
+
+    def delete_many(self, keys):
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM users WHERE guild_id = ? AND user_id = ?", ((str(g), str(u)) for g, u in keys)
+            )
+
+    # sqlite connections can't be shared between threads, so work run in a
+    # worker thread (scans, vacuum) goes through a connection of its own
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        if threading.get_ident() == self._owner:
+            yield self.conn
+            return
+        conn = sqlite3.connect(self.path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # Every stored (guild_id, user_id, record), for one guild or all of them
+    def iter_users(self, guild_id: Optional[str] = None) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        with self._connection() as conn:
+            if guild_id is None:
+                cursor = conn.execute("SELECT guild_id, user_id, record FROM users")
+            else:
+                cursor = conn.execute("SELECT guild_id, user_id, record FROM users WHERE guild_id = ?", (str(guild_id),))
+            for g, u, record in cursor:
+                yield g, u, json.loads(record)
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    # Rebuild the file without the space left by deleted records. Run from a
+    # worker thread, writes from the event loop wait on sqlite's lock meanwhile
+    def vacuum(self):
+        with self._connection() as conn:
+            conn.execute("VACUUM")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+# Stable hash of the commands the tree would sync for a scope
+def command_tree_hash(tree: discord.app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    payload = []
+    for command in tree.get_commands(guild=guild):
+        try:
+            payload.append(command.to_dict(tree))
+        except TypeError:
+            # discord.py < 2.4 takes no tree argument
+            payload.append(command.to_dict())
+    payload.sort(key=lambda c: (c.get("type", 1), c["name"]))
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CommandSyncer:
+    """
+    Syncs the application command tree only when it has changed.
+
+    The hash of the last synced tree is kept per application and scope in a
+    small state file, so reconnects and restarts with unchanged commands
+    skip Discord's slow, rate limited sync. In dev mode the global commands
+    are copied to the dev guild and synced there only, which applies
+    instantly.
+    """
+
+    def __init__(self, bot, state_file: str = "data/command_sync.json"):
+        self.bot = bot
+        self.state_file = state_file
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: dict):
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    # Sync the tree globally, or to the dev guild only, if it changed since the last sync
+    async def sync(self, dev_guild_id: Optional[int] = None, force: bool = False) -> bool:
+        tree = self.bot.tree
+        guild = None
+        scope = f"{self.bot.application_id}:global"
+        if dev_guild_id:
+            guild = discord.Object(id=dev_guild_id)
+            tree.copy_global_to(guild=guild)
+            scope = f"{self.bot.application_id}:guild:{dev_guild_id}"
+
+        digest = command_tree_hash(tree, guild)
+        state = self._load_state()
+        if not force and state.get(scope) == digest:
+            logger.info("Command tree unchanged for %s, skipping sync", scope)
+            return False
+
+        synced = await tree.sync(guild=guild)
+        state[scope] = digest
+        self._save_state(state)
+        logger.info("Synced %s commands for %s", len(synced), scope)
+        return True
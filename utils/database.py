@@ -1,8 +1,15 @@
+import asyncio
+import copy
 import json
 import os
+from collections import OrderedDict
 from datetime import datetime, date, timedelta
 from typing import Dict, Any, Optional
 from tinydb import TinyDB, Query
+from utils.ledger import GoldLedger, ledger_key
+from utils.storage import FastJSONStorage, FlushingCachingMiddleware
+from utils.cold_store import ColdUserStore
+from utils.archive import UserArchive
 
 class Database:
     """
@@ -12,11 +19,15 @@ class Database:
     economy data, gaming statistics, and moderation records using TinyDB.
     """
     
-    def __init__(self, db_file: str = "data/database.json"):
+    def __init__(self, db_file: str = "data/database.json", hot_user_budget: int = 10000):
         self.db_file = db_file
         os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
-        self.db = TinyDB(self.db_file)
+        # Reads and writes are served from memory, call flush to write them to disk
+        self.db = TinyDB(self.db_file, storage=FlushingCachingMiddleware(FastJSONStorage))
+        self.jobs = self.db.table("jobs")
         self.data = self._load_database()
+        # Per-guild sets of colour role ids, rebuilt when a guild's colour roles change
+        self._colour_role_ids = {}
         self.default_guild_schema = {
             "general_channel": None,
             "welcome_channel": None,
@@ -32,6 +43,7 @@ class Database:
             "bot_channel": None,
             "colour_channel": None,
             "colour_roles": {},
+            "stickies": {},
             "users": {}
         }
 
@@ -50,6 +62,9 @@ class Database:
             "streak": 0,
             "mimic_expiry": None,
             "barrel_expiry": None,
+            "blackjack_session": None,
+            "escrow": {},
+            "left_at": None,
         }
 
         self.user_data_type_map = {
@@ -67,7 +82,26 @@ class Database:
             "streak": int,
             "mimic_expiry": lambda v: None if str(v).lower() == "none" else str(v),
             "barrel_expiry": lambda v: None if str(v).lower() == "none" else str(v),
+            "blackjack_session": lambda v: None if str(v).lower() == "none" else json.loads(v) if isinstance(v, str) else v,
+            "escrow": lambda v: {} if str(v).lower() == "none" else json.loads(v) if isinstance(v, str) else v,
+            "left_at": lambda v: None if str(v).lower() == "none" else str(v),
         }
+
+        # Users in memory, least recently used first. Past the budget, users are
+        # paged out to the cold store and paged back in by get_user
+        self.hot_user_budget = hot_user_budget
+        self.cold = ColdUserStore(os.path.join(os.path.dirname(self.db_file), "cold_users.sqlite"))
+        self._hot_users = OrderedDict(
+            ((guild_id, user_id), None)
+            for guild_id, guild in self.data.items()
+            for user_id in guild.get("users", {})
+        )
+        self.user_stats = {"hot_hits": 0, "cold_hits": 0, "misses": 0, "evictions": 0}
+        # Append-only history of every gold movement
+        self.ledger = GoldLedger(os.path.join(os.path.dirname(self.db_file), "ledger"))
+        self.ledger.open(self.get_gold_balances)
+        # Compressed records of pruned users
+        self.archive = UserArchive(os.path.join(os.path.dirname(self.db_file), "archive"))
     
     # Load the database from the JSON file, create it if it doesnt exist
     def _load_database(self) -> Dict[str, Any]:
@@ -85,6 +119,18 @@ class Database:
         for guild_id, guild_data in self.data.items():
             self.db.insert({"guild_id": guild_id, "data": guild_data})
 
+    # Write any cached changes to disk
+    def flush(self):
+        self.db.storage.flush()
+
+    # Write any cached changes to disk without blocking the event loop
+    async def flush_async(self):
+        await self.db.storage.flush_async()
+
+    # Number of changes waiting to be written to disk
+    def pending_writes(self) -> int:
+        return self.db.storage.pending_writes
+
     # Migrate the database to the latest schema
     def migrate_database(self):
         # Migrate guilds
@@ -93,21 +139,30 @@ class Database:
             # Add any missing guild fields
             for key, value in self.default_guild_schema.items():
                 if key not in guild:
-                    guild[key] = value
+                    guild[key] = copy.deepcopy(value)
 
             # Migrate users within each guild
             for user_id in guild["users"]:
-                user = guild["users"][user_id]
-                # Add any missing user fields
-                for key, value in self.default_user_schema.items():
-                    if key not in user:
-                        user[key] = value
-                
-                # Migrate warnings from int to list if needed
-                if "warnings" in user and isinstance(user["warnings"], int):
-                    user["warnings"] = []
+                self._migrate_user(guild["users"][user_id])
 
+        # Page out users over the memory budget
+        self._evict_users()
         self._save_database()
+
+    # Add any missing fields to a user record
+    def _migrate_user(self, user: Dict[str, Any]):
+        for key, value in self.default_user_schema.items():
+            if key not in user:
+                user[key] = copy.deepcopy(value)
+
+        # Migrate warnings from int to list if needed
+        if "warnings" in user and isinstance(user["warnings"], int):
+            user["warnings"] = []
+
+        # Blackjack bets used to be held in the saved game, they're held in escrow now
+        session = user.get("blackjack_session")
+        if session and "blackjack" not in user["escrow"] and isinstance(session.get("bet"), int):
+            user["escrow"]["blackjack"] = session["bet"]
     
     # Get a guild's data from the database, create it if it doesn't exist
     def get_guild(self, guild_id: int) -> Dict[str, Any]:
@@ -115,21 +170,98 @@ class Database:
         Guild = Query()
         result = self.db.get(Guild.guild_id == guild_id)
         if not result:
-            self.data[guild_id] = self.default_guild_schema.copy()
+            self.data[guild_id] = copy.deepcopy(self.default_guild_schema)
             self._save_database()
             return self.data[guild_id]
         else:
             self.data[guild_id] = result["data"]
             return self.data[guild_id]
     
-    # Get a user in a guild's data from the database, create it if it doesn't exist
+    # Get a user in a guild's data from the database, paging them in from the
+    # cold store or creating them if needed
     def get_user(self, guild_id: int, user_id: int) -> Dict[str, Any]:
         guild = self.get_guild(guild_id)
-        user_id = str(user_id)
-        if user_id not in guild["users"]:
-            guild["users"][user_id] = self.default_user_schema.copy()
+        guild_id, user_id = str(guild_id), str(user_id)
+        if user_id in guild["users"]:
+            self.user_stats["hot_hits"] += 1
+            self._hot_users[(guild_id, user_id)] = None
+            self._hot_users.move_to_end((guild_id, user_id))
+            return guild["users"][user_id]
+
+        user = self.cold.get(guild_id, user_id)
+        if user is not None:
+            self.user_stats["cold_hits"] += 1
+            self._migrate_user(user)
+        else:
+            self.user_stats["misses"] += 1
+            user = copy.deepcopy(self.default_user_schema)
+        guild["users"][user_id] = user
+        self._hot_users[(guild_id, user_id)] = None
+        self._evict_users()
+        self._save_database()
+        return user
+
+    # Users with something pending (an expiry, a game in progress or gold in escrow) stay in memory
+    def _is_pinned(self, user: Dict[str, Any]) -> bool:
+        return bool(user.get("mimic_expiry") or user.get("barrel_expiry") or user.get("blackjack_session") or user.get("escrow"))
+
+    # Page the least recently used users out to the cold store until the budget is met
+    def _evict_users(self):
+        if not self.hot_user_budget or len(self._hot_users) <= self.hot_user_budget:
+            return
+        evicted = []
+        # Pinned users are skipped by moving them to the back, at most one pass
+        for _ in range(len(self._hot_users)):
+            if len(self._hot_users) <= self.hot_user_budget:
+                break
+            key, _ = self._hot_users.popitem(last=False)
+            guild_id, user_id = key
+            users = self.data.get(guild_id, {}).get("users", {})
+            user = users.get(user_id)
+            if user is None:
+                continue
+            if self._is_pinned(user):
+                self._hot_users[key] = None
+                continue
+            evicted.append((guild_id, user_id, user))
+        if not evicted:
+            return
+        # Write to the cold store before dropping them from memory
+        self.cold.put_many(evicted)
+        for guild_id, user_id, _ in evicted:
+            del self.data[guild_id]["users"][user_id]
+        self.user_stats["evictions"] += len(evicted)
+
+    # Every user as (guild_id, user_id, record), in memory first then the cold store.
+    # Cold records are copies, pass changed ones to save_user.
+    def iter_users(self, guild_id: Optional[int] = None):
+        guild_ids = [str(guild_id)] if guild_id is not None else list(self.data)
+        for g in guild_ids:
+            for user_id, user in list(self.data.get(g, {}).get("users", {}).items()):
+                yield g, user_id, user
+        for g, user_id, user in self.cold.iter_users(None if guild_id is None else str(guild_id)):
+            if g in self.data and user_id in self.data[g]["users"]:
+                continue  # Stale copy of a user that has been paged back in
+            self._migrate_user(user)
+            yield g, user_id, user
+
+    # Save a user record returned by iter_users, wherever the user lives
+    def save_user(self, guild_id, user_id, user: Dict[str, Any]):
+        guild_id, user_id = str(guild_id), str(user_id)
+        if user_id in self.data.get(guild_id, {}).get("users", {}):
+            self.data[guild_id]["users"][user_id] = user
             self._save_database()
-        return guild["users"][user_id]
+        else:
+            self.cold.put(guild_id, user_id, user)
+
+    # Hot/cold user metrics
+    def get_user_stats(self) -> Dict[str, int]:
+        return {
+            **self.user_stats,
+            "hot_users": len(self._hot_users),
+            "hot_user_budget": self.hot_user_budget,
+            "cold_rows": self.cold.count(),
+        }
 
     # Update a guild's data in the database 
     def update_guild_config(self, guild_id: int, **kwargs):
@@ -171,6 +303,35 @@ class Database:
         message_id = guild["last_intro_id"]
         return message_id
 
+    # ~~~~~~~~~~ Stickies ~~~~~~~~~~
+    # Set a sticky message for a channel of a guild
+    def set_sticky(self, guild_id: int, channel_id: int, content: str, message_id: Optional[int] = None):
+        guild = self.get_guild(guild_id)
+        guild["stickies"][str(channel_id)] = {
+            "content": content,
+            "message_id": str(message_id) if message_id else None
+        }
+        self._save_database()
+
+    # Set the id of a channel's current sticky message
+    def set_sticky_message(self, guild_id: int, channel_id: int, message_id: int):
+        guild = self.get_guild(guild_id)
+        if str(channel_id) in guild["stickies"]:
+            guild["stickies"][str(channel_id)]["message_id"] = str(message_id)
+            self._save_database()
+
+    # Remove a channel's sticky message
+    def remove_sticky(self, guild_id: int, channel_id: int):
+        guild = self.get_guild(guild_id)
+        if str(channel_id) in guild["stickies"]:
+            del guild["stickies"][str(channel_id)]
+            self._save_database()
+
+    # Get all sticky messages of a guild
+    def get_stickies(self, guild_id: int):
+        guild = self.get_guild(guild_id)
+        return guild.get("stickies", {})
+
     # ~~~~~~~~~~ Channels ~~~~~~~~~~
     # Set the general channel of a guild
     def set_general_channel(self, guild_id: int, channel_id: int):
@@ -287,17 +448,19 @@ class Database:
         self._save_database()
 
     # ~~~~~~~~~~ Gold ~~~~~~~~~~
-    # Add gold to a user in a guild in the database
-    def add_gold(self, guild_id: int, user_id: int, amount: int):
+    # Add gold to a user in a guild in the database, source and counterparty are recorded in the ledger
+    def add_gold(self, guild_id: int, user_id: int, amount: int, source: Optional[str] = None, counterparty=None):
         user = self.get_user(guild_id, user_id)
         user["gold"] += amount
         self._save_database()
+        self.ledger.append(guild_id, user_id, amount, user["gold"], source, counterparty)
     
     # Remove gold from a user in a guild in the database
-    def remove_gold(self, guild_id: int, user_id: int, amount: int):
+    def remove_gold(self, guild_id: int, user_id: int, amount: int, source: Optional[str] = None, counterparty=None):
         user = self.get_user(guild_id, user_id)
         user["gold"] -= amount
         self._save_database()
+        self.ledger.append(guild_id, user_id, -amount, user["gold"], source, counterparty)
 
     # Get a user's gold from the database
     def get_user_gold(self, guild_id: int, user_id: int):
@@ -306,10 +469,68 @@ class Database:
         return gold
     
     # Set a user in a guild's gold in the database
-    def set_gold(self, guild_id: int, user_id: int, amount: int):
+    def set_gold(self, guild_id: int, user_id: int, amount: int, source: Optional[str] = None, counterparty=None):
         user = self.get_user(guild_id, user_id)
+        change = amount - user["gold"]
         user["gold"] = amount
         self._save_database()
+        self.ledger.append(guild_id, user_id, change, amount, source, counterparty)
+
+    # Get every user's gold keyed like the ledger
+    def get_gold_balances(self) -> Dict[str, int]:
+        return {
+            ledger_key(guild_id, user_id): user.get("gold", 0)
+            for guild_id, user_id, user in self.iter_users()
+        }
+
+    # Get a user's gold movements from the ledger, newest first
+    def get_gold_history(self, guild_id: int, user_id: int, limit: int = 25):
+        return self.ledger.history(guild_id, user_id, limit)
+
+    # ~~~~~~~~~~ Escrow ~~~~~~~~~~
+    # Move a wager from a user's gold into a named hold, returns False if they can't cover it
+    def hold_gold(self, guild_id: int, user_id: int, amount: int, hold: str, source: Optional[str] = None) -> bool:
+        user = self.get_user(guild_id, user_id)
+        if amount <= 0 or user["gold"] < amount or hold in user["escrow"]:
+            return False
+        user["gold"] -= amount
+        user["escrow"][hold] = amount
+        self._save_database()
+        self.ledger.append(guild_id, user_id, -amount, user["gold"], source, "escrow")
+        return True
+
+    # Close a hold and pay the user payout (0 if the wager was lost), returns the amount that was
+    # held. Nothing is paid for a hold that isn't open, so a wager can only be settled once
+    def settle_hold(self, guild_id: int, user_id: int, hold: str, payout: int, source: Optional[str] = None, counterparty="house") -> int:
+        user = self.get_user(guild_id, user_id)
+        if hold not in user["escrow"]:
+            return 0
+        held = user["escrow"].pop(hold)
+        user["gold"] += payout
+        self._save_database()
+        if payout:
+            self.ledger.append(guild_id, user_id, payout, user["gold"], source, counterparty)
+        return held
+
+    # Close a hold and give the wager back, returns the amount that was held
+    def release_hold(self, guild_id: int, user_id: int, hold: str, source: Optional[str] = None) -> int:
+        held = self.get_user(guild_id, user_id)["escrow"].get(hold, 0)
+        return self.settle_hold(guild_id, user_id, hold, held, source, "escrow")
+
+    # Get the total a user has in escrow
+    def get_escrow(self, guild_id: int, user_id: int) -> int:
+        return sum(self.get_user(guild_id, user_id)["escrow"].values())
+
+    # Give back every hold named prefix..., for wagers on games that don't survive a restart.
+    # Users with gold in escrow are pinned in memory, so only hot users are checked
+    def release_holds(self, prefix: str, source: Optional[str] = None) -> int:
+        released = 0
+        for guild_id, guild in self.data.items():
+            for user_id, user in list(guild.get("users", {}).items()):
+                for hold in [hold for hold in user.get("escrow", {}) if hold.startswith(prefix)]:
+                    self.release_hold(guild_id, user_id, hold, source)
+                    released += 1
+        return released
     
     # ~~~~~~~~~~ Daily ~~~~~~~~~~
     # Check if a user in a guild can claim a daily reward
@@ -412,6 +633,22 @@ class Database:
         user["last_blackjack"] = datetime.now().isoformat()
         self._save_database()
 
+    # Save a user's blackjack game in progress, or clear it with None
+    def set_blackjack_session(self, guild_id: int, user_id: int, state: Optional[Dict[str, Any]]):
+        user = self.get_user(guild_id, user_id)
+        user["blackjack_session"] = state
+        self._save_database()
+
+    # Get every saved blackjack game in progress as (guild_id, user_id, state).
+    # Players with a game in progress are pinned in memory, so only hot users are checked
+    def get_blackjack_sessions(self):
+        sessions = []
+        for guild_id, guild in self.data.items():
+            for user_id, user in guild.get("users", {}).items():
+                if user.get("blackjack_session"):
+                    sessions.append((int(guild_id), int(user_id), user["blackjack_session"]))
+        return sessions
+
     # ~~~~~~~~~~ Slots ~~~~~~~~~~
     # Add a slots win to a user in a guild in the database
     def add_slots_wins(self, guild_id: int, user_id: int):
@@ -441,6 +678,7 @@ class Database:
     def add_colour_role(self, guild_id: int, role_id: int, role_name: str):
         guild = self.get_guild(guild_id)
         guild["colour_roles"][str(role_id)] = role_name
+        self._colour_role_ids.pop(str(guild_id), None)
         self._save_database()
     
     # Remove a colour role from a guild
@@ -448,6 +686,7 @@ class Database:
         guild = self.get_guild(guild_id)
         if str(role_id) in guild["colour_roles"]:
             del guild["colour_roles"][str(role_id)]
+            self._colour_role_ids.pop(str(guild_id), None)
             self._save_database()
     
     # Get all colour roles for a guild
@@ -457,8 +696,15 @@ class Database:
     
     # Check if a role is a colour role
     def is_colour_role(self, guild_id: int, role_id: int):
-        guild = self.get_guild(guild_id)
-        return str(role_id) in guild["colour_roles"]
+        return int(role_id) in self.get_colour_role_ids(guild_id)
+
+    # Get the ids of a guild's colour roles as a set of ints
+    def get_colour_role_ids(self, guild_id: int) -> frozenset:
+        ids = self._colour_role_ids.get(str(guild_id))
+        if ids is None:
+            ids = frozenset(int(role_id) for role_id in self.get_colour_roles(guild_id))
+            self._colour_role_ids[str(guild_id)] = ids
+        return ids
 
     # ~~~~~~~~~~ Bump Role ~~~~~~~~~~
     # Set the bump role of a guild
@@ -509,6 +755,10 @@ class Database:
     def set_user_data(self, guild_id: int, user_id: int, data_type: str, data_value: str):
         user = self.get_user(guild_id, user_id)
         converted_value = self.convert_user_data_type(data_type, data_value)
+        # Gold changes go through the ledger
+        if data_type == "gold":
+            self.set_gold(guild_id, user_id, converted_value, source="moderation")
+            return
         user[f"{data_type}"] = converted_value
         self._save_database()
 
@@ -532,4 +782,112 @@ class Database:
     
     def get_warning_count(self, guild_id: int, user_id: int):
         user = self.get_user(guild_id, user_id)
-        return len(user.get("warnings", []))
\ No newline at end of file
+        return len(user.get("warnings", []))
+
+    # ~~~~~~~~~~ Pruning ~~~~~~~~~~
+    # Record when a member left, without creating a record for them
+    def mark_departed(self, guild_id: int, user_id: int) -> bool:
+        guild_id, user_id = str(guild_id), str(user_id)
+        users = self.data.get(guild_id, {}).get("users", {})
+        user = users.get(user_id) or self.cold.get(guild_id, user_id)
+        if user is None:
+            return False
+        user["left_at"] = datetime.now().isoformat()
+        self.save_user(guild_id, user_id, user)
+        return True
+
+    # Get a returning member's record, restoring it from the archive if they were pruned
+    def mark_returned(self, guild_id: int, user_id: int) -> Dict[str, Any]:
+        guild_id, user_id = str(guild_id), str(user_id)
+        in_memory = user_id in self.data.get(guild_id, {}).get("users", {})
+        if not in_memory and (guild_id, user_id) in self.archive and self.cold.get(guild_id, user_id) is None:
+            record = self.archive.restore(guild_id, user_id)
+            if record is not None:
+                self._migrate_user(record)
+                self.get_guild(guild_id)["users"][user_id] = record
+                self._hot_users[(guild_id, user_id)] = None
+                # Their gold left the ledger when they were archived
+                if record["gold"]:
+                    self.ledger.append(guild_id, user_id, record["gold"], record["gold"], "prune", "archive")
+        user = self.get_user(guild_id, user_id)
+        user["left_at"] = None
+        self._save_database()
+        return user
+
+    # A record holding nothing a new one wouldn't, apart from when the member left
+    def _is_dormant(self, user: Dict[str, Any]) -> bool:
+        return all(user.get(key) == value for key, value in self.default_user_schema.items() if key != "left_at")
+
+    # Why a user can be pruned, "dormant" for a record with no activity, "departed"
+    # for a member who left before cutoff (None skips departed members), else None
+    def _prune_reason(self, user: Dict[str, Any], cutoff: Optional[datetime], prune_dormant: bool) -> Optional[str]:
+        if self._is_pinned(user):
+            return None
+        if prune_dormant and self._is_dormant(user):
+            return "dormant"
+        if cutoff and user.get("left_at"):
+            try:
+                left_at = datetime.fromisoformat(user["left_at"])
+            except (ValueError, TypeError):
+                return None
+            if left_at <= cutoff:
+                return "departed"
+        return None
+
+    # Find users to prune as (guild_id, user_id, reason, record). Members who left
+    # over departed_days ago are "departed", records with no activity are "dormant".
+    # Reads the cold store through its own connection, so it can run in a worker thread
+    def get_prunable_users(self, departed_days: int = 30, prune_dormant: bool = True):
+        cutoff = datetime.now() - timedelta(days=departed_days) if departed_days else None
+        prunable = []
+        for guild_id, user_id, user in self.iter_users():
+            reason = self._prune_reason(user, cutoff, prune_dormant)
+            if reason:
+                prunable.append((guild_id, user_id, reason, user))
+        return prunable
+
+    # Drop rows for users paged back in since get_prunable_users found them and no longer prunable
+    def recheck_prunable(self, rows, departed_days: int = 30, prune_dormant: bool = True):
+        cutoff = datetime.now() - timedelta(days=departed_days) if departed_days else None
+        kept = []
+        for guild_id, user_id, reason, user in rows:
+            hot = self.data.get(guild_id, {}).get("users", {}).get(user_id)
+            if hot is not None and self._prune_reason(hot, cutoff, prune_dormant) != reason:
+                continue
+            kept.append((guild_id, user_id, reason, user if hot is None else hot))
+        return kept
+
+    # Delete users from memory and the cold store, moving any gold they held out of the ledger
+    def delete_users(self, rows):
+        for guild_id, user_id, _, user in rows:
+            self.data.get(guild_id, {}).get("users", {}).pop(user_id, None)
+            self._hot_users.pop((guild_id, user_id), None)
+            if user.get("gold"):
+                self.ledger.append(guild_id, user_id, -user["gold"], 0, "prune", "archive")
+        self.cold.delete_many((guild_id, user_id) for guild_id, user_id, _, _ in rows)
+        self._save_database()
+
+    # Rewrite the database file and the cold store without the space left by deleted users
+    async def compact(self):
+        await self.flush_async()
+        await asyncio.to_thread(self.cold.vacuum)
+
+    # Size of the database file and the cold store on disk, in bytes
+    def get_storage_size(self) -> int:
+        paths = [self.db_file, self.cold.path]
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    # ~~~~~~~~~~ Scheduled Jobs ~~~~~~~~~~
+    # Save a scheduled job, replacing any job with the same id
+    def save_job(self, job_id: str, job_type: str, run_at: str, payload: Dict[str, Any]):
+        Job = Query()
+        self.jobs.upsert({"job_id": job_id, "type": job_type, "run_at": run_at, "payload": payload}, Job.job_id == job_id)
+
+    # Remove a scheduled job
+    def delete_job(self, job_id: str):
+        Job = Query()
+        self.jobs.remove(Job.job_id == job_id)
+
+    # Get every scheduled job
+    def get_jobs(self):
+        return self.jobs.all()
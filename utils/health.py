@@ -0,0 +1,116 @@
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Tuple
+
+from discord.ext import tasks
+
+from utils.metrics import json_body
+
+# Seconds a background loop may run past its next iteration before it counts as stuck
+LOOP_GRACE = 60
+
+
+# A background loop's state, with its last run worked out from the next one
+def loop_status(loop: tasks.Loop) -> Dict[str, Any]:
+    next_iteration = loop.next_iteration
+    interval = timedelta(hours=loop.hours or 0, minutes=loop.minutes or 0, seconds=loop.seconds or 0)
+    last_run = next_iteration - interval if next_iteration and loop.current_loop else None
+    now = datetime.now(timezone.utc)
+    return {
+        "running": loop.is_running(),
+        "failed": loop.failed(),
+        "iterations": loop.current_loop,
+        "last_run": last_run.isoformat() if last_run else None,
+        "next_run": next_iteration.isoformat() if next_iteration else None,
+        "overdue": bool(loop.is_running() and next_iteration and (now - next_iteration).total_seconds() > LOOP_GRACE),
+    }
+
+
+class HealthCheck:
+    """
+    Liveness and readiness of the bot, for an orchestrator to probe.
+
+    Ready means the gateway is connected with a known latency, the
+    database is loaded and migrated and the bot isn't shutting down, so it
+    can serve interactions.
+    Healthy means nothing needs a restart: no background loop (the bot's
+    own or any cog's) has failed or stopped running on time, and database
+    flushes are still succeeding. Both reports carry the backlog figures
+    that explain them.
+    """
+
+    def __init__(self, bot, flush_stale_after: float = 60.0):
+        self.bot = bot
+        self.flush_stale_after = flush_stale_after
+        self.started = time.time()
+
+    # Every background loop, the bot's and those of the loaded cogs
+    def loops(self) -> Dict[str, tasks.Loop]:
+        found = {"bot.flush_database": self.bot.flush_database}
+        for cog_name, cog in self.bot.cogs.items():
+            for name in dir(type(cog)):
+                if isinstance(getattr(type(cog), name, None), tasks.Loop):
+                    found[f"{cog_name}.{name}"] = getattr(cog, name)
+        return found
+
+    def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        latency = self.bot.latency
+        checks = {
+            "gateway_connected": self.bot.is_ready() and not self.bot.is_closed(),
+            "database_loaded": getattr(self.bot, "db", None) is not None,
+            "migrations_done": getattr(self.bot, "db_migrated", False),
+            "accepting_interactions": not self.bot.shutdown.stopping,
+        }
+        ready = all(checks.values())
+        return ready, {
+            "ready": ready,
+            "checks": checks,
+            "gateway_latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None,
+        }
+
+    def liveness(self) -> Tuple[bool, Dict[str, Any]]:
+        loops = {name: loop_status(loop) for name, loop in self.loops().items()}
+        stuck = sorted(name for name, status in loops.items() if status["failed"] or status["overdue"])
+
+        last_flush = getattr(self.bot, "last_flush", None)
+        since_flush = time.time() - (last_flush or self.started)
+        pending = self.bot.db.pending_writes()
+        flush_stale = pending > 0 and since_flush > self.flush_stale_after
+
+        healthy = not stuck and not flush_stale
+        return healthy, {
+            "healthy": healthy,
+            "uptime_seconds": round(time.time() - self.started),
+            "stuck_loops": stuck,
+            "database": {
+                "pending_writes": pending,
+                "seconds_since_flush": round(since_flush, 1),
+                "flush_stale": flush_stale,
+            },
+            "outbound_depth": self.bot.outbound.depth(),
+            "log_digest_buffered": sum(len(buffer) for buffer in self.bot.log_digest.buffers.values()),
+            "event_loop": self.bot.loop_monitor.stats(),
+            "load_shedding": self.bot.pressure.stats(),
+            "loops": loops,
+        }
+
+    async def healthz(self):
+        healthy, report = self.liveness()
+        return (200 if healthy else 503), "application/json", json_body(report)
+
+    async def readyz(self):
+        ready, report = self.readiness()
+        return (200 if ready else 503), "application/json", json_body(report)
+
+    # Health metrics
+    def stats(self) -> Dict[str, Any]:
+        ready, readiness = self.readiness()
+        healthy, liveness = self.liveness()
+        return {
+            "ready": ready,
+            "healthy": healthy,
+            "gateway_latency_ms": readiness["gateway_latency_ms"] or 0,
+            "seconds_since_flush": liveness["database"]["seconds_since_flush"],
+            "stuck_loops": len(liveness["stuck_loops"]),
+        }
@@ -0,0 +1,288 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = re.compile(r"segment-(\d+)\.ndjson$")
+SNAPSHOT_PATTERN = re.compile(r"snapshot-(\d+)\.json$")
+
+
+# Ledger key for a user in a guild
+def ledger_key(guild_id: int, user_id: int) -> str:
+    return f"{guild_id}:{user_id}"
+
+
+class GoldLedger:
+    """
+    Append-only ledger of every gold movement.
+
+    Each movement is one NDJSON line (sequence number, time, guild, user,
+    signed amount, balance after, source and counterparty) appended to the
+    current segment file, which is closed every `segment_size` entries.
+    Balances are kept in memory and written to a snapshot every
+    `snapshot_every` entries, so rebuilding them on startup reads the latest
+    snapshot plus the entries after it instead of the whole history. Snapshots
+    taken from the event loop are written in a worker thread from a copy of
+    the balances, so a payout never waits on one. A closed
+    segment gets an index of the byte offsets of each user's entries, so a
+    user's history only reads their own lines.
+    """
+
+    def __init__(self, directory: str = "data/ledger", segment_size: int = 10000, snapshot_every: int = 1000):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.snapshot_seq = 0
+        self.balances: Dict[str, int] = {}
+        # Closed segments each user has entries in
+        self.segments_by_user: Dict[str, List[int]] = {}
+        # The segment being appended to and the offsets of each user's entries in it
+        self.segment = 0
+        self.segment_entries = 0
+        self.segment_offsets: Dict[str, List[int]] = {}
+        self.file = None
+        self.appends = 0
+        # Background snapshot write, and a lock so two snapshot writes never overlap
+        self._snapshot_task: Optional[asyncio.Future] = None
+        self._snapshot_lock = threading.Lock()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment:06d}.ndjson")
+
+    def _index_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment:06d}.idx.json")
+
+    def _list(self, pattern: re.Pattern) -> List[int]:
+        numbers = []
+        for path in glob.glob(os.path.join(self.directory, "*")):
+            match = pattern.search(os.path.basename(path))
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    # Load the ledger, opening_balances gives the balances to start from if it's new
+    def open(self, opening_balances: Callable[[], Dict[str, int]]):
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self._list(SEGMENT_PATTERN)
+
+        # Closed segments only need their index
+        for segment in segments:
+            if not os.path.exists(self._index_path(segment)):
+                continue
+            with open(self._index_path(segment), encoding="utf-8") as f:
+                index = json.load(f)
+            for key in index["offsets"]:
+                self.segments_by_user.setdefault(key, []).append(segment)
+            self.segment = segment
+            self.seq = index["last_seq"]
+
+        # A segment without an index is still open, scan it to rebuild its offsets
+        if segments and not os.path.exists(self._index_path(segments[-1])):
+            self.segment = segments[-1]
+            self._truncate_partial_line(self.segment)
+            for offset, entry in self._scan(self.segment):
+                self.segment_offsets.setdefault(entry["key"], []).append(offset)
+                self.segment_entries += 1
+                self.seq = entry["seq"]
+            self.file = open(self._segment_path(self.segment), "ab")
+
+        # Balances are the latest snapshot plus every entry after it
+        snapshots = self._list(SNAPSHOT_PATTERN)
+        if snapshots:
+            with open(os.path.join(self.directory, f"snapshot-{snapshots[-1]:010d}.json"), encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.balances = snapshot["balances"]
+            self.snapshot_seq = snapshot["seq"]
+            replay_from = snapshot["segment"]
+        elif self.seq == 0:
+            # New ledger, start from the balances already in the database
+            self.balances = dict(opening_balances())
+            self.snapshot()
+            replay_from = None
+        else:
+            logger.warning("Gold ledger has entries but no snapshot, replaying every segment")
+            replay_from = segments[0]
+
+        replayed = 0
+        if replay_from is not None:
+            for segment in (s for s in segments if s >= replay_from):
+                for _, entry in self._scan(segment):
+                    if entry["seq"] > self.snapshot_seq:
+                        self.balances[entry["key"]] = entry["balance"]
+                        replayed += 1
+
+        logger.info(
+            "Gold ledger loaded at seq %s, %s balances from snapshot %s plus %s replayed entries",
+            self.seq, len(self.balances), self.snapshot_seq, replayed
+        )
+
+    # Cut off a line left half written by a crash, so appends start on a new line
+    def _truncate_partial_line(self, segment: int):
+        with open(self._segment_path(segment), "r+b") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                logger.warning("Truncating %s bytes of a partial ledger line in segment %s", len(data) - end, segment)
+                f.truncate(end)
+
+    # Yield the (offset, entry) of every complete line in a segment
+    def _scan(self, segment: int):
+        with open(self._segment_path(segment), "rb") as f:
+            offset = 0
+            for line in f:
+                if line.endswith(b"\n"):
+                    try:
+                        entry = json.loads(line)
+                        entry["key"] = ledger_key(entry["guild"], entry["user"])
+                        yield offset, entry
+                    except ValueError:
+                        logger.warning("Skipping unreadable ledger line at %s:%s", segment, offset)
+                offset += len(line)
+
+    # Record a gold movement, balance is the user's gold after it
+    def append(self, guild_id: int, user_id: int, amount: int, balance: int, source: Optional[str] = None, counterparty: Optional[Union[int, str]] = None) -> dict:
+        if self.file is None:
+            self.segment += 1
+            self.segment_entries = 0
+            self.segment_offsets = {}
+            self.file = open(self._segment_path(self.segment), "ab")
+
+        self.seq += 1
+        entry = {
+            "seq": self.seq,
+            "ts": int(time.time()),
+            "guild": int(guild_id),
+            "user": int(user_id),
+            "amount": amount,
+            "balance": balance,
+            "source": source or "unknown",
+            "counterparty": counterparty,
+        }
+        key = ledger_key(guild_id, user_id)
+        offset = self.file.tell()
+        self.file.write(json.dumps(entry, separators=(",", ":")).encode() + b"\n")
+        self.file.flush()
+
+        self.segment_offsets.setdefault(key, []).append(offset)
+        self.segment_entries += 1
+        self.balances[key] = balance
+        self.appends += 1
+
+        if self.segment_entries >= self.segment_size:
+            self._close_segment()
+        if self.seq - self.snapshot_seq >= self.snapshot_every:
+            self._snapshot_soon()
+        return entry
+
+    # Close the current segment and write its index
+    def _close_segment(self):
+        self.file.close()
+        self.file = None
+        self._write_json(self._index_path(self.segment), {"last_seq": self.seq, "offsets": self.segment_offsets})
+        for key in self.segment_offsets:
+            self.segments_by_user.setdefault(key, []).append(self.segment)
+        self.segment_offsets = {}
+
+    # Start a snapshot in a worker thread, unless one is already being written
+    def _snapshot_soon(self):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.snapshot()  # Not on the event loop, nothing to hold up
+            return
+        if self._snapshot_task is not None and not self._snapshot_task.done():
+            return
+        self._snapshot_task = asyncio.ensure_future(asyncio.to_thread(self._write_snapshot, *self._snapshot_state()))
+        self._snapshot_task.add_done_callback(self._snapshot_written)
+
+    def _snapshot_written(self, task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to write a gold ledger snapshot", exc_info=task.exception())
+
+    # Write the current balances to a snapshot, keeping the previous one as a fallback
+    def snapshot(self):
+        self._write_snapshot(*self._snapshot_state())
+
+    # The snapshot to write as (seq, data), with a copy of the balances
+    def _snapshot_state(self) -> tuple:
+        # Entries after this snapshot are in the open segment, or the next one if none is open
+        segment = self.segment if self.file is not None else self.segment + 1
+        return self.seq, {"seq": self.seq, "segment": segment, "balances": dict(self.balances)}
+
+    def _write_snapshot(self, seq: int, data: dict):
+        with self._snapshot_lock:
+            self._write_json(os.path.join(self.directory, f"snapshot-{seq:010d}.json"), data)
+            # Snapshots are named by seq, so one finishing late never replaces a newer one
+            self.snapshot_seq = max(self.snapshot_seq, seq)
+            for old in self._list(SNAPSHOT_PATTERN)[:-2]:
+                os.remove(os.path.join(self.directory, f"snapshot-{old:010d}.json"))
+
+    def _write_json(self, path: str, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    # A user's balance according to the ledger
+    def balance(self, guild_id: int, user_id: int) -> Optional[int]:
+        return self.balances.get(ledger_key(guild_id, user_id))
+
+    # A user's gold movements, newest first
+    def history(self, guild_id: int, user_id: int, limit: int = 25) -> List[dict]:
+        key = ledger_key(guild_id, user_id)
+        entries = []
+
+        # The open segment first, then the closed segments the user appears in
+        sources = []
+        if self.file is not None and key in self.segment_offsets:
+            sources.append((self.segment, self.segment_offsets[key]))
+        for segment in reversed(self.segments_by_user.get(key, [])):
+            sources.append((segment, None))
+
+        for segment, offsets in sources:
+            if offsets is None:
+                with open(self._index_path(segment), encoding="utf-8") as f:
+                    offsets = json.load(f)["offsets"].get(key, [])
+            with open(self._segment_path(segment), "rb") as f:
+                for offset in reversed(offsets):
+                    f.seek(offset)
+                    entries.append(json.loads(f.readline()))
+                    if len(entries) >= limit:
+                        return entries
+        return entries
+
+    # Compare the ledger's balances with the database's, returns (key, ledger, database) for each mismatch
+    def audit(self, balances: Dict[str, int]) -> List[tuple]:
+        mismatches = []
+        for key in set(balances) | set(self.balances):
+            ledger_balance = self.balances.get(key, 0)
+            actual = balances.get(key, 0)
+            if ledger_balance != actual:
+                mismatches.append((key, ledger_balance, actual))
+        return mismatches
+
+    # Flush the open segment and snapshot the balances
+    def close(self):
+        if self.file is not None:
+            self.file.flush()
+        if self.seq != self.snapshot_seq:
+            self.snapshot()
+
+    # Ledger metrics
+    def stats(self) -> Dict[str, int]:
+        return {
+            "seq": self.seq,
+            "snapshot_seq": self.snapshot_seq,
+            "segment": self.segment,
+            "segment_entries": self.segment_entries,
+            "balances": len(self.balances),
+            "appends": self.appends,
+        }
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+import discord
+
+from utils.outbound import PRIORITY_HIGH, PRIORITY_LOW
+
+logger = logging.getLogger(__name__)
+
+# Log entry severities, high severity entries flush the guild's buffer at once
+SEVERITY_NORMAL = 0
+SEVERITY_HIGH = 1
+
+# Discord's per embed limits
+MAX_FIELDS = 25
+MAX_EMBED_CHARS = 6000
+MAX_FIELD_VALUE = 1024
+
+
+class LogEntry:
+    """A single buffered log channel event."""
+
+    __slots__ = ("title", "details", "color", "severity", "timestamp")
+
+    def __init__(self, title: str, details: str, color: discord.Color, severity: int):
+        self.title = title
+        self.details = details
+        self.color = color
+        self.severity = severity
+        self.timestamp = datetime.utcnow()
+
+
+class LogAggregator:
+    """
+    Batches log channel events per guild into digest embeds.
+
+    Events are buffered for `window` seconds and then posted as one embed with
+    a field per event (several embeds if Discord's field or size limits are
+    reached). High severity events flush the buffer straight away.
+    """
+
+    def __init__(self, bot, window: float = 10.0):
+        self.bot = bot
+        self.window = window
+        self.buffers: Dict[int, List[LogEntry]] = {}
+        self.timers: Dict[int, asyncio.Task] = {}
+        self.flushed_entries = 0
+        self.flushed_embeds = 0
+
+    # Add an event to a guild's log digest
+    def log(self, guild: discord.Guild, title: str, details: str, color: discord.Color = discord.Color.orange(), severity: int = SEVERITY_NORMAL):
+        buffer = self.buffers.setdefault(guild.id, [])
+        buffer.append(LogEntry(title, details, color, severity))
+
+        if severity >= SEVERITY_HIGH or len(buffer) >= MAX_FIELDS or self.window <= 0:
+            self.flush(guild)
+        elif guild.id not in self.timers:
+            self.timers[guild.id] = asyncio.create_task(self._flush_later(guild))
+
+    async def _flush_later(self, guild: discord.Guild):
+        await asyncio.sleep(self.window)
+        self.timers.pop(guild.id, None)
+        self.flush(guild)
+
+    # Post a guild's buffered events to its log channel
+    def flush(self, guild: discord.Guild):
+        timer = self.timers.pop(guild.id, None)
+        if timer:
+            timer.cancel()
+
+        entries = self.buffers.pop(guild.id, [])
+        if not entries:
+            return
+
+        log_channel_id = self.bot.db.get_log_channel(guild.id)
+        if not log_channel_id:
+            return
+        channel = guild.get_channel(int(log_channel_id))
+        if not channel:
+            logger.warning("Log channel not found (ID: %s) in %s, dropped %s entries", log_channel_id, guild.name, len(entries))
+            return
+
+        embeds = self.build_embeds(entries)
+        priority = PRIORITY_HIGH if any(e.severity >= SEVERITY_HIGH for e in entries) else PRIORITY_LOW
+        # Discord's 6000 character limit covers every embed in a message, so each embed is
+        # queued on its own and the outbound coalescer packs them within the limits
+        for embed in embeds:
+            self.bot.outbound.send(channel, embed=embed, priority=priority)
+        self.flushed_entries += len(entries)
+        self.flushed_embeds += len(embeds)
+
+    # Flush every guild, used before shutting down
+    def flush_all(self):
+        for guild_id in list(self.buffers):
+            guild = self.bot.get_guild(guild_id)
+            if guild:
+                self.flush(guild)
+            else:
+                self.buffers.pop(guild_id, None)
+
+    # Turn buffered entries into as few embeds as Discord's limits allow
+    @staticmethod
+    def build_embeds(entries: List[LogEntry]) -> List[discord.Embed]:
+        # A lone event keeps the single event layout
+        if len(entries) == 1:
+            entry = entries[0]
+            embed = discord.Embed(title=entry.title, color=entry.color)
+            embed.add_field(name="Details", value=entry.details[:MAX_FIELD_VALUE], inline=False)
+            embed.timestamp = entry.timestamp
+            return [embed]
+
+        colors = {entry.color.value for entry in entries}
+        color = entries[0].color if len(colors) == 1 else discord.Color.orange()
+
+        embeds = []
+        embed = None
+        for entry in entries:
+            name = f"{entry.title} • {entry.timestamp.strftime('%H:%M:%S')} UTC"
+            value = entry.details[:MAX_FIELD_VALUE]
+            if embed is None or len(embed.fields) >= MAX_FIELDS or len(embed) + len(name) + len(value) > MAX_EMBED_CHARS:
+                embed = discord.Embed(title=f"Log digest ({len(entries)} events)", color=color)
+                embed.timestamp = entries[-1].timestamp
+                embeds.append(embed)
+            embed.add_field(name=name, value=value, inline=False)
+        return embeds
+
+    # Digest metrics
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered": sum(len(b) for b in self.buffers.values()),
+            "flushed_entries": self.flushed_entries,
+            "flushed_embeds": self.flushed_embeds,
+        }
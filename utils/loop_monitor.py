@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Frames from these directories name the cog or module that blocked
+SOURCE_DIRS = (f"{os.sep}cogs{os.sep}", f"{os.sep}utils{os.sep}")
+
+
+class LoopMonitor:
+    """
+    Event loop lag sampler and slow callback detector.
+
+    A sampler task sleeps `interval` seconds at a time and records how late it
+    wakes up, which is how long the loop was too busy to run it. A watchdog
+    thread pings the loop every `poll` seconds with call_soon_threadsafe; when
+    a ping has waited longer than `threshold` the loop is stuck in a callback,
+    so the watchdog snapshots the loop thread's stack and the task it is
+    running. Once the loop answers, the block is logged with how long it
+    lasted, the cog it was in and the stack, and kept in a short history.
+    """
+
+    def __init__(self, interval: float = 0.5, threshold: float = 0.25, history: int = 50, samples: int = 120):
+        self.interval = interval
+        self.threshold = threshold
+        self.poll = max(threshold / 2, 0.01)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+        # Lag samples in seconds, the most recent last
+        self.lags = deque(maxlen=samples)
+        self.max_lag = 0.0
+        self.slow_callbacks = deque(maxlen=history)
+        self.slow_count = 0
+        self.blocked_seconds = 0.0
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.stopped.clear()
+        self.task = asyncio.create_task(self._sample())
+        self.thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.task:
+            self.task.cancel()
+
+    async def _sample(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - start - self.interval, 0.0)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self):
+        while not self.stopped.wait(self.poll):
+            sent = time.perf_counter()
+            answered = threading.Event()
+            try:
+                self.loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                return  # The loop is closed
+            if answered.wait(self.threshold):
+                continue
+
+            # The loop is stuck, see what it is running
+            snapshot = self._snapshot()
+            while not answered.wait(self.poll):
+                if self.stopped.is_set():
+                    return
+            self._record(time.perf_counter() - sent, snapshot)
+
+    # The loop thread's stack and current task, taken from the watchdog thread
+    def _snapshot(self) -> Dict[str, Any]:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        task = asyncio.current_task(self.loop)
+        coro = task.get_coro() if task is not None else None
+
+        # The innermost frame in our own code names what blocked
+        source = None
+        for line in reversed(stack):
+            if any(directory in line for directory in SOURCE_DIRS):
+                source = line.strip().splitlines()[0]
+                break
+        return {
+            "task": task.get_name() if task is not None else None,
+            "coroutine": getattr(coro, "__qualname__", None),
+            "source": source,
+            "stack": stack,
+        }
+
+    def _record(self, duration: float, snapshot: Dict[str, Any]):
+        event = {"at": time.time(), "duration": round(duration, 3), **snapshot}
+        self.slow_callbacks.append(event)
+        self.slow_count += 1
+        self.blocked_seconds += duration
+        logger.warning(
+            "Event loop blocked for %.3fs in %s (task %s)\n%s",
+            duration, event["coroutine"] or "a callback", event["task"], "".join(event["stack"][-8:])
+        )
+
+    # Most recent slow callbacks, newest first, without their full stacks unless asked
+    def recent(self, limit: int = 10, stacks: bool = False) -> List[Dict[str, Any]]:
+        events = list(self.slow_callbacks)[-limit:][::-1]
+        if stacks:
+            return events
+        return [{key: value for key, value in event.items() if key != "stack"} for event in events]
+
+    # Loop metrics
+    def stats(self) -> Dict[str, float]:
+        lags = sorted(self.lags)
+        return {
+            "lag_last_ms": round(self.lags[-1] * 1000, 2) if self.lags else 0.0,
+            "lag_p50_ms": round(lags[len(lags) // 2] * 1000, 2) if lags else 0.0,
+            "lag_p99_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000, 2) if lags else 0.0,
+            "lag_max_ms": round(self.max_lag * 1000, 2),
+            "slow_callbacks": self.slow_count,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every exported metric name
+PREFIX = "dweller"
+
+# A route returns (status, content type, body)
+Route = Callable[[], Awaitable[Tuple[int, str, bytes]]]
+
+
+class MetricsRegistry:
+    """
+    Named collectors of the bot's service metrics.
+
+    Each collector is a callable returning a flat dict, usually a service's
+    `stats` method. Numeric values are exported as gauges named
+    `dweller_<collector>_<key>`; anything else only shows up in the JSON view.
+    """
+
+    def __init__(self):
+        self.collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, collector: Callable[[], Dict[str, Any]]):
+        self.collectors[name] = collector
+
+    def unregister(self, name: str):
+        self.collectors.pop(name, None)
+
+    # Every collector's current values, a failing collector reports its error instead
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        collected = {}
+        for name, collector in list(self.collectors.items()):
+            try:
+                collected[name] = collector()
+            except Exception as e:
+                logger.exception("Metrics collector %s failed", name)
+                collected[name] = {"error": str(e)}
+        return collected
+
+    # The Prometheus text format
+    def render(self) -> str:
+        lines = []
+        for name, values in self.collect().items():
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if isinstance(value, (int, float)):
+                    lines.append(f"{PREFIX}_{name}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Minimal HTTP server for the metrics endpoint.
+
+    Serves GET requests for registered paths and closes each connection after
+    one response. `/metrics` (Prometheus text) and `/metrics.json` are always
+    there, other routes are added with `route`.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.routes: Dict[str, Route] = {
+            "/metrics": self._metrics,
+            "/metrics.json": self._metrics_json,
+        }
+
+    def route(self, path: str, handler: Route):
+        self.routes[path] = handler
+
+    async def start(self):
+        try:
+            self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as e:
+            logger.error("Could not start the metrics server on %s:%s: %s", self.host, self.port, e)
+            return
+        logger.info("Metrics server listening on http://%s:%s/metrics", self.host, self.port)
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _metrics(self):
+        return 200, "text/plain; version=0.0.4", self.registry.render().encode()
+
+    async def _metrics_json(self):
+        return 200, "application/json", json_body(self.registry.collect())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Skip the headers, requests have no body
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode("latin-1").split()
+            method, path = (parts[0], parts[1].split("?")[0]) if len(parts) >= 2 else ("", "")
+
+            handler = self.routes.get(path)
+            if method != "GET":
+                status, content_type, body = 405, "text/plain", b"Method not allowed\n"
+            elif handler is None:
+                status, content_type, body = 404, "text/plain", b"Not found\n"
+            else:
+                status, content_type, body = await handler()
+
+            reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}.get(status, "")
+            writer.write(
+                f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception:
+            logger.exception("Error serving a metrics request")
+        finally:
+            writer.close()
+
+
+# JSON response body, values that aren't JSON (timestamps, ids) are written as strings
+def json_body(data: Any) -> bytes:
+    return json.dumps(data, default=str).encode()
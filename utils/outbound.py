@@ -0,0 +1,197 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Dict, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Message priorities, lower numbers are sent first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Discord's per message limits
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+MAX_CONTENT_CHARS = 2000
+
+
+class TokenBucket:
+    """Token bucket allowing `capacity` sends per `per` seconds."""
+
+    def __init__(self, capacity: int, per: float):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self.tokens = float(capacity)
+        self.updated = None
+
+    # Wait until a token is available and take it
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self.updated is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class OutboundMessage:
+    """A message waiting in a channel's outbound queue."""
+
+    __slots__ = ("content", "embeds", "priority", "coalesce", "future")
+
+    def __init__(self, content, embeds, priority, coalesce, future):
+        self.content = content
+        self.embeds = embeds
+        self.priority = priority
+        self.coalesce = coalesce
+        self.future = future
+
+
+class OutboundScheduler:
+    """
+    Rate limit aware outbound message queue for The Cavern bot.
+
+    Every bot-initiated channel message goes through here instead of calling
+    channel.send directly. Each channel gets a priority queue drained by its own
+    worker, paced by a per channel token bucket (Discord's message route
+    allows about 5 messages per 5 seconds) and a global bucket. Embeds waiting
+    for the same channel are merged into one message where Discord's limits
+    allow, so bursts cost fewer REST calls.
+    """
+
+    def __init__(self, channel_capacity: int = 5, channel_per: float = 5.0, global_capacity: int = 45, global_per: float = 1.0, high_watermark: int = 100):
+        self.channel_capacity = channel_capacity
+        self.channel_per = channel_per
+        self.global_bucket = TokenBucket(global_capacity, global_per)
+        self.high_watermark = high_watermark
+        self.queues: Dict[int, List] = {}
+        self.buckets: Dict[int, TokenBucket] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+        self._counter = itertools.count()
+        self.enqueued = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    # Queue a message for a channel, returns a future resolving to the sent message (or None on failure)
+    def send(self, channel, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None, embeds: Optional[List[discord.Embed]] = None, priority: int = PRIORITY_NORMAL, coalesce: bool = True) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        embeds = list(embeds or []) + ([embed] if embed else [])
+        # Discord rejects the whole message, so callers have to split before queueing
+        if len(embeds) > MAX_EMBEDS or sum(len(e) for e in embeds) > MAX_EMBED_CHARS:
+            logger.warning("Queued message for channel %s is over Discord's embed limits and will fail", channel.id)
+        message = OutboundMessage(content, embeds, priority, coalesce, future)
+
+        queue = self.queues.setdefault(channel.id, [])
+        heapq.heappush(queue, (priority, next(self._counter), message))
+        self.enqueued += 1
+
+        if len(queue) == self.high_watermark:
+            logger.warning("Outbound queue for channel %s reached %s pending messages", channel.id, len(queue))
+
+        if channel.id not in self.workers:
+            self.workers[channel.id] = asyncio.create_task(self._worker(channel))
+        return future
+
+    # Pop the next message plus any queued messages that can share its send
+    def _take_batch(self, queue: List) -> List[OutboundMessage]:
+        batch = [heapq.heappop(queue)[2]]
+        first = batch[0]
+        if not first.coalesce:
+            return batch
+
+        embeds = len(first.embeds)
+        embed_chars = sum(len(e) for e in first.embeds)
+        content_chars = len(first.content or "")
+        while queue:
+            candidate = queue[0][2]
+            if not candidate.coalesce:
+                break
+            extra_chars = len(candidate.content) + 1 if candidate.content else 0
+            candidate_chars = sum(len(e) for e in candidate.embeds)
+            if (embeds + len(candidate.embeds) > MAX_EMBEDS
+                    or embed_chars + candidate_chars > MAX_EMBED_CHARS
+                    or content_chars + extra_chars > MAX_CONTENT_CHARS):
+                break
+            heapq.heappop(queue)
+            batch.append(candidate)
+            embeds += len(candidate.embeds)
+            embed_chars += candidate_chars
+            content_chars += extra_chars
+        return batch
+
+    async def _worker(self, channel):
+        bucket = self.buckets.setdefault(channel.id, TokenBucket(self.channel_capacity, self.channel_per))
+        queue = self.queues[channel.id]
+        try:
+            while queue:
+                # Wait for capacity before batching so a burst can pile up and coalesce
+                await bucket.acquire()
+                await self.global_bucket.acquire()
+                batch = self._take_batch(queue)
+
+                contents = [m.content for m in batch if m.content]
+                embeds = [e for m in batch for e in m.embeds]
+                try:
+                    sent = await channel.send(content=" ".join(contents) or None, embeds=embeds)
+                    self.sent += 1
+                    self.coalesced += len(batch) - 1
+                except discord.Forbidden:
+                    sent = None
+                    self.failed += len(batch)
+                    logger.warning("Missing permissions to send in #%s (%s)", getattr(channel, "name", "?"), channel.id)
+                except Exception as e:
+                    sent = None
+                    self.failed += len(batch)
+                    logger.error("Failed to send %s queued message(s) to channel %s: %s", len(batch), channel.id, e)
+
+                for message in batch:
+                    if not message.future.done():
+                        message.future.set_result(sent)
+        finally:
+            del self.workers[channel.id]
+            if not queue:
+                del self.queues[channel.id]
+
+    # Wait for every queue to empty, returns the number of messages still waiting
+    async def drain(self, timeout: float) -> int:
+        if self.workers:
+            await asyncio.wait(set(self.workers.values()), timeout=timeout)
+        return self.depth()
+
+    # Drop every waiting message and stop the workers, returns how many were dropped
+    def discard(self) -> int:
+        dropped = self.depth()
+        for worker in self.workers.values():
+            worker.cancel()
+        for queue in self.queues.values():
+            for _, _, message in queue:
+                if not message.future.done():
+                    message.future.set_result(None)
+            queue.clear()
+        self.failed += dropped
+        return dropped
+
+    # Number of messages waiting across all channels
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    # Queue metrics
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self.depth(),
+            "max_channel_depth": max((len(q) for q in self.queues.values()), default=0),
+            "active_channels": len(self.workers),
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+        }
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PressurePolicy:
+    """
+    Decides when the bot sheds load, for cogs to check with `shedding`.
+
+    Every `interval` seconds the recent event loop lag (the mean of the loop
+    monitor's last `window` samples) and the outbound queue depth are
+    compared with the thresholds. Shedding starts as soon as either crosses
+    its enter threshold, and stops only once both are back under their lower
+    exit thresholds and shedding has lasted at least `min_seconds`, so the
+    bot doesn't flap in and out of it. While shedding, INFO logs are dropped
+    (logging.disable, so they aren't even formatted) and cogs skip or batch
+    cosmetic work: slots skips its reel animation, tier promotions are
+    announced together and the leaderboard is deferred before it's rendered.
+    """
+
+    def __init__(self, bot, lag_enter: float = 0.5, lag_exit: float = 0.1, outbound_enter: int = 200, outbound_exit: int = 50,
+                 min_seconds: float = 30.0, interval: float = 1.0, window: int = 4):
+        self.bot = bot
+        self.lag_enter = lag_enter
+        self.lag_exit = lag_exit
+        self.outbound_enter = outbound_enter
+        self.outbound_exit = outbound_exit
+        self.min_seconds = min_seconds
+        self.interval = interval
+        self.window = window
+        self.task: Optional[asyncio.Task] = None
+        self.shedding = False
+        self.since: Optional[float] = None
+        self.reasons: List[str] = []
+        self.episodes = 0
+        self.shed_seconds = 0.0
+
+    def start(self):
+        self.task = asyncio.create_task(self._watch())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+        if self.shedding:
+            self._leave()
+
+    # Recent loop lag in seconds
+    def lag(self) -> float:
+        lags = list(self.bot.loop_monitor.lags)[-self.window:]
+        return sum(lags) / len(lags) if lags else 0.0
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.update()
+            except Exception:
+                logger.exception("Failed to update the load shedding policy")
+
+    def update(self):
+        lag = self.lag()
+        depth = self.bot.outbound.depth()
+        if not self.shedding:
+            reasons = []
+            if lag >= self.lag_enter:
+                reasons.append(f"loop lag {lag * 1000:.0f}ms")
+            if depth >= self.outbound_enter:
+                reasons.append(f"outbound depth {depth}")
+            if reasons:
+                self._enter(reasons)
+        elif lag <= self.lag_exit and depth <= self.outbound_exit and time.monotonic() - self.since >= self.min_seconds:
+            self._leave()
+
+    def _enter(self, reasons: List[str]):
+        self.shedding = True
+        self.since = time.monotonic()
+        self.reasons = reasons
+        self.episodes += 1
+        logger.warning("Shedding load (%s): skipping animations, batching announcements and dropping INFO logs", ", ".join(reasons))
+        logging.disable(logging.INFO)
+
+    def _leave(self):
+        duration = time.monotonic() - self.since
+        self.shed_seconds += duration
+        self.shedding = False
+        self.since = None
+        self.reasons = []
+        logging.disable(logging.NOTSET)
+        logger.warning("Pressure cleared after %.0fs, back to full behaviour", duration)
+
+    # Load shedding metrics
+    def stats(self) -> Dict[str, Any]:
+        current = time.monotonic() - self.since if self.shedding else 0.0
+        return {
+            "shedding": self.shedding,
+            "reasons": self.reasons,
+            "episodes": self.episodes,
+            "shed_seconds": round(self.shed_seconds + current, 1),
+            "lag_ms": round(self.lag() * 1000, 2),
+            "outbound_depth": self.bot.outbound.depth(),
+        }
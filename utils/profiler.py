@@ -0,0 +1,142 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# Frames kept per tracemalloc allocation, enough to find the cog behind a library call
+TRACEMALLOC_FRAMES = 25
+
+
+# Group a source file by the cog or package it belongs to
+def code_owner(filename: str) -> str:
+    parts = filename.replace("\\", "/").split("/")
+    for root in ("cogs", "utils", "tools"):
+        if root in parts:
+            return "/".join(parts[parts.index(root):]).removesuffix(".py").replace("/", ".")
+    if "site-packages" in parts:
+        return parts[parts.index("site-packages") + 1].removesuffix(".py")
+    return "stdlib" if "lib" in parts else os.path.basename(filename)
+
+
+class SamplingProfiler:
+    """
+    Time-boxed sampling profiler for the running bot.
+
+    A thread samples the stack of every other thread every `interval`
+    seconds (sys._current_frames), counting the function on top of each
+    stack (self time) and every function on it (total time). tracemalloc
+    runs for the same window, and the allocations made during it are
+    reported by source line and by the cog that made them. Sampling only
+    reads frames, but tracemalloc slows down allocation heavy code while it
+    runs, which is why profiles are time-boxed.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self.thread_counts: Counter = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self.stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.thread_counts[names.get(thread_id, str(thread_id))] += 1
+                seen = set()
+                top = True
+                while frame is not None:
+                    code = frame.f_code
+                    key = (code.co_filename, code.co_firstlineno, code.co_name)
+                    if top:
+                        self.self_counts[key] += 1
+                        top = False
+                    if key not in seen:
+                        self.total_counts[key] += 1
+                        seen.add(key)
+                    frame = frame.f_back
+            self.samples += 1
+
+    # Profile for `seconds`, returns the report text
+    async def run(self, seconds: float) -> str:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        before = tracemalloc.take_snapshot()
+        thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+        started = time.perf_counter()
+        thread.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.stopped.set()
+            thread.join()
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+        elapsed = time.perf_counter() - started
+        # Comparing snapshots can take a while, keep it off the event loop
+        return await asyncio.to_thread(self.report, elapsed, before, after)
+
+    def report(self, elapsed: float, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int = 25) -> str:
+        lines = [
+            f"Profile taken {datetime.now().isoformat(timespec='seconds')}",
+            f"{elapsed:.1f}s, {self.samples} samples every {self.interval * 1000:.0f}ms",
+            "",
+            "Samples by thread:",
+        ]
+        lines += [f"  {count:>8}  {name}" for name, count in self.thread_counts.most_common()]
+
+        lines += ["", f"Top {limit} functions by self time:", self._function_header()]
+        lines += self._function_lines(self.self_counts, limit)
+        lines += ["", f"Top {limit} functions by total time:", self._function_header()]
+        lines += self._function_lines(self.total_counts, limit)
+
+        # Allocations made while profiling, still alive at the end
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        before, after = before.filter_traces(filters), after.filter_traces(filters)
+        by_line = after.compare_to(before, "lineno")
+        lines += ["", f"Top {limit} allocation sites:", f"  {'size':>10}  {'count':>8}  site"]
+        for stat in by_line[:limit]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size_diff / 1024:>8.1f}KB  {stat.count_diff:>+8}  {frame.filename}:{frame.lineno}")
+
+        lines += ["", "Allocations by cog (innermost frame in bot code):", f"  {'size':>10}  {'count':>8}  owner"]
+        for owner, size, count in self._allocations_by_owner(after.compare_to(before, "traceback"))[:limit]:
+            lines.append(f"  {size / 1024:>8.1f}KB  {count:>+8}  {owner}")
+        return "\n".join(lines) + "\n"
+
+    def _function_header(self) -> str:
+        return f"  {'samples':>8}  {'share':>6}  function"
+
+    def _function_lines(self, counts: Counter, limit: int) -> List[str]:
+        lines = []
+        for (filename, lineno, name), count in counts.most_common(limit):
+            share = count / self.samples * 100 if self.samples else 0
+            lines.append(f"  {count:>8}  {share:>5.1f}%  {name} ({code_owner(filename)}, {filename}:{lineno})")
+        return lines
+
+    # Attribute each allocation to the innermost frame of the bot's own code, or the library that made it
+    def _allocations_by_owner(self, stats) -> List[Tuple[str, int, int]]:
+        sizes: Counter = Counter()
+        counts: Counter = Counter()
+        for stat in stats:
+            owner: Optional[str] = None
+            for frame in reversed(stat.traceback):
+                name = code_owner(frame.filename)
+                if name.startswith(("cogs.", "utils.")):
+                    owner = name
+                    break
+            owner = owner or code_owner(stat.traceback[-1].filename)
+            sizes[owner] += stat.size_diff
+            counts[owner] += stat.count_diff
+        return sorted(((owner, sizes[owner], counts[owner]) for owner in sizes), key=lambda row: row[1], reverse=True)
@@ -0,0 +1,42 @@
+from typing import Iterable, Optional
+
+import discord
+
+
+# Apply role changes to a member in a single member edit.
+#
+# The member's final role list is computed in memory from its cached roles,
+# so swapping a colour role or adding a role alongside a voice mute costs one
+# REST call instead of one per role. Extra keyword arguments (mute, nick, ...)
+# are sent in the same edit. Returns whether an edit was made.
+async def edit_roles(
+    member: discord.Member,
+    add: Iterable[discord.Role] = (),
+    remove: Iterable[discord.Role] = (),
+    remove_ids: Optional[Iterable[int]] = None,
+    reason: Optional[str] = None,
+    **edit_kwargs,
+) -> bool:
+    current = [role for role in member.roles if not role.is_default()]
+    drop = set(remove_ids or ()) | {role.id for role in remove}
+
+    final = [role for role in current if role.id not in drop]
+    final_ids = {role.id for role in final}
+    for role in add:
+        if role.id not in final_ids:
+            final.append(role)
+            final_ids.add(role.id)
+
+    if final_ids != {role.id for role in current}:
+        edit_kwargs["roles"] = final
+    if not edit_kwargs:
+        return False
+
+    await member.edit(reason=reason, **edit_kwargs)
+    return True
+
+
+# Voice state edits (mute, deafen) fail for members that aren't in a voice channel
+def voice_kwargs(member: discord.Member, **kwargs) -> dict:
+    voice = getattr(member, "voice", None)
+    return kwargs if voice and voice.channel else {}
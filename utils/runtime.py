@@ -0,0 +1,119 @@
+import logging
+import os
+import resource
+import time
+from typing import Dict, Iterable, Optional, Set
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Time the process started, for startup reporting
+PROCESS_START = time.perf_counter()
+
+# Gateway intents every profile needs (guild, channel and role events)
+BASE_INTENTS = {"guilds"}
+
+# Gateway intents needed by each extension on top of the base intents
+EXTENSION_INTENTS: Dict[str, Set[str]] = {
+    # Revert task looks up members and their voice state to unmute
+    "cogs.Economy.shop": {"members", "voice_states"},
+    # Deletes messages from members in the barrel
+    "cogs.Games.barreltime": {"guild_messages"},
+    # Member join and leave events
+    "cogs.Core.greet": {"members"},
+    # Watches the sticky channels
+    "cogs.Core.introsticky": {"guild_messages"},
+    # Counts messages for tiers
+    "cogs.Core.tiers": {"guild_messages"},
+    # Reads Disboard's bump confirmation embeds
+    "cogs.Core.bump": {"guild_messages", "message_content"},
+}
+
+
+class GatewayProfile:
+    """
+    Gateway and cache settings for the bot.
+
+    The "full" profile is everything Discord offers (every intent, presences,
+    a full member cache chunked at startup and a 1000 message cache). The
+    "lean" profile enables only the intents the loaded extensions declare in
+    EXTENSION_INTENTS, keeps presences off, caches only members seen joining
+    or in voice, chunks guilds lazily and keeps no message cache, since no cog
+    reads cached messages.
+    """
+
+    def __init__(self, name: str, intents: discord.Intents, member_cache_flags: discord.MemberCacheFlags, max_messages: Optional[int], chunk_guilds_at_startup: bool):
+        self.name = name
+        self.intents = intents
+        self.member_cache_flags = member_cache_flags
+        self.max_messages = max_messages
+        self.chunk_guilds_at_startup = chunk_guilds_at_startup
+
+    @classmethod
+    def full(cls) -> "GatewayProfile":
+        intents = discord.Intents.all()
+        return cls("full", intents, discord.MemberCacheFlags.from_intents(intents), 1000, True)
+
+    @classmethod
+    def lean(cls, extensions: Iterable[str]) -> "GatewayProfile":
+        intents = discord.Intents.none()
+        for name in required_intents(extensions):
+            setattr(intents, name, True)
+        flags = discord.MemberCacheFlags.from_intents(intents)
+        return cls("lean", intents, flags, None, False)
+
+    # Build the profile named by GATEWAY_PROFILE ("lean" by default)
+    @classmethod
+    def from_env(cls, extensions: Iterable[str]) -> "GatewayProfile":
+        name = os.getenv("GATEWAY_PROFILE", "lean").lower()
+        if name == "full":
+            return cls.full()
+        if name != "lean":
+            logger.warning("Unknown GATEWAY_PROFILE %r, using lean", name)
+        return cls.lean(extensions)
+
+    # Keyword arguments for commands.Bot
+    def client_kwargs(self) -> Dict:
+        return {
+            "intents": self.intents,
+            "member_cache_flags": self.member_cache_flags,
+            "max_messages": self.max_messages,
+            "chunk_guilds_at_startup": self.chunk_guilds_at_startup,
+        }
+
+    def describe(self) -> str:
+        enabled = sorted(name for name, value in self.intents if value)
+        return f"{self.name} profile, intents: {', '.join(enabled)}, max_messages: {self.max_messages}, chunk at startup: {self.chunk_guilds_at_startup}"
+
+
+# Union of the intents a list of extensions need
+def required_intents(extensions: Iterable[str]) -> Set[str]:
+    names = set(BASE_INTENTS)
+    for extension in extensions:
+        names |= EXTENSION_INTENTS.get(extension, set())
+    return names
+
+
+# Current resident memory of the process in MB
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Not Linux, fall back to the peak (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if peak < 1 << 32 else peak / (1024 * 1024)
+
+
+# Log how long startup took and what the caches are holding
+def report_startup(bot: discord.Client, profile: GatewayProfile):
+    elapsed = time.perf_counter() - PROCESS_START
+    total_members = sum(guild.member_count or 0 for guild in bot.guilds)
+    cached_members = sum(len(guild.members) for guild in bot.guilds)
+    logger.info(
+        "Ready in %.2fs with the %s gateway profile, RSS %.1f MB, caching %s of %s members (%s not cached), presences %s",
+        elapsed, profile.name, current_rss_mb(), cached_members, total_members,
+        total_members - cached_members, "on" if profile.intents.presences else "off"
+    )
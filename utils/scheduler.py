@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A persisted job due to run at a given UTC time."""
+
+    __slots__ = ("job_id", "job_type", "run_at", "payload")
+
+    def __init__(self, job_id: str, job_type: str, run_at: datetime, payload: Dict[str, Any]):
+        self.job_id = job_id
+        self.job_type = job_type
+        self.run_at = run_at
+        self.payload = payload
+
+
+class Scheduler:
+    """
+    Durable scheduler for The Cavern bot's timed jobs.
+
+    Jobs are persisted to the database's jobs table and driven by a single
+    timer loop, so reminders survive restarts and a thousand guilds cost one
+    task instead of a thousand sleeping ones. Cogs register a handler per job
+    type, then schedule jobs by (type, key); scheduling the same key again
+    replaces the pending job.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.handlers: Dict[str, Callable[..., Awaitable[None]]] = {}
+        self.jobs: Dict[str, Job] = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Jobs whose handler is running
+        self.running: Set[asyncio.Task] = set()
+        self.last_run: Optional[datetime] = None
+        self.executed = 0
+        self.failed = 0
+
+    # Register the coroutine that runs jobs of a type, called with the job's payload as keyword arguments
+    def register(self, job_type: str, handler: Callable[..., Awaitable[None]]):
+        self.handlers[job_type] = handler
+
+    def unregister(self, job_type: str):
+        self.handlers.pop(job_type, None)
+
+    # Schedule (or reschedule) a job, run_at is a naive UTC datetime
+    def schedule(self, job_type: str, key, run_at: datetime, payload: Optional[Dict[str, Any]] = None) -> str:
+        job_id = f"{job_type}:{key}"
+        job = Job(job_id, job_type, run_at, payload or {})
+        self.jobs[job_id] = job
+        self.bot.db.save_job(job_id, job_type, run_at.isoformat(), job.payload)
+        self._push(job)
+        return job_id
+
+    # Cancel a pending job, returns whether one was pending
+    def cancel(self, job_type: str, key) -> bool:
+        job_id = f"{job_type}:{key}"
+        if self.jobs.pop(job_id, None) is None:
+            return False
+        self.bot.db.delete_job(job_id)
+        return True
+
+    # Get a pending job by type and key
+    def get(self, job_type: str, key) -> Optional[Job]:
+        return self.jobs.get(f"{job_type}:{key}")
+
+    def _push(self, job: Job):
+        heapq.heappush(self._heap, (job.run_at, next(self._counter), job))
+        self._wakeup.set()
+
+    # Load persisted jobs and start the timer loop
+    def start(self):
+        for record in self.bot.db.get_jobs():
+            try:
+                run_at = datetime.fromisoformat(record["run_at"])
+            except (KeyError, TypeError, ValueError):
+                logger.warning("Dropping malformed scheduled job %s", record.get("job_id"))
+                self.bot.db.delete_job(record.get("job_id"))
+                continue
+            job = Job(record["job_id"], record["type"], run_at, record.get("payload") or {})
+            self.jobs[job.job_id] = job
+            self._push(job)
+        logger.info("Scheduler started with %s pending jobs", len(self.jobs))
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    # Stop dispatching jobs and wait for running ones, returns how many were still running
+    # (they stay in the database, so they run again after a restart)
+    async def drain(self, timeout: float) -> int:
+        self.stop()
+        if self.running:
+            await asyncio.wait(set(self.running), timeout=timeout)
+        return len(self.running)
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            self.last_run = datetime.utcnow()
+
+            # Run everything that is due, skipping stale heap entries for replaced or cancelled jobs
+            now = datetime.utcnow()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, job = heapq.heappop(self._heap)
+                if self.jobs.get(job.job_id) is job:
+                    self._dispatch(job)
+
+            # Sleep until the next job is due or a new job is scheduled
+            timeout = (self._heap[0][0] - now).total_seconds() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self, job: Job):
+        handler = self.handlers.get(job.job_type)
+        if handler is None:
+            # Left in the database so it runs once the owning cog is loaded again
+            logger.warning("No handler registered for job %s, it will be retried on restart", job.job_id)
+            del self.jobs[job.job_id]
+            return
+        task = asyncio.create_task(self._execute(job, handler))
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
+
+    async def _execute(self, job: Job, handler: Callable[..., Awaitable[None]]):
+        try:
+            await handler(**job.payload)
+            self.executed += 1
+        except Exception:
+            self.failed += 1
+            logger.exception("Scheduled job %s failed", job.job_id)
+        finally:
+            # Only forget the job if it wasn't rescheduled while running
+            if self.jobs.get(job.job_id) is job:
+                del self.jobs[job.job_id]
+                self.bot.db.delete_job(job.job_id)
+
+    # Scheduler metrics
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self.jobs),
+            "executed": self.executed,
+            "failed": self.failed,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+        }
@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+
+class SessionManager:
+    """
+    Bounded store of interactive game sessions.
+
+    Sessions are keyed by (guild_id, user_id) and kept in least recently used
+    order, so finding a player's game is a dict lookup. Adding a session past
+    `capacity` evicts the least recently used one, and `expire` evicts every
+    session idle for longer than `timeout` seconds. Evicted sessions are
+    handed back to the caller, since only the game knows how to settle an
+    abandoned session. Sessions must have a `last_active` wall clock
+    timestamp, so idle time carries over a restart.
+    """
+
+    def __init__(self, capacity: int = 500, timeout: float = 180.0):
+        self.capacity = capacity
+        self.timeout = timeout
+        self.sessions: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.peak = 0
+        self.started = 0
+        self.finished = 0
+        self.evicted_lru = 0
+        self.evicted_timeout = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self.sessions
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def get(self, key):
+        return self.sessions.get(key)
+
+    # Add a session, returns the sessions evicted to stay under capacity
+    def add(self, key, session) -> List:
+        self.sessions[key] = session
+        self.sessions.move_to_end(key)
+        self.started += 1
+
+        evicted = []
+        while len(self.sessions) > self.capacity:
+            _, oldest = self.sessions.popitem(last=False)
+            evicted.append(oldest)
+            self.evicted_lru += 1
+        self.peak = max(self.peak, len(self.sessions))
+        return evicted
+
+    # Mark a session as just used
+    def touch(self, key):
+        session = self.sessions.get(key)
+        if session is not None:
+            session.last_active = time.time()
+            self.sessions.move_to_end(key)
+
+    # Remove a finished session
+    def remove(self, key):
+        session = self.sessions.pop(key, None)
+        if session is not None:
+            self.finished += 1
+        return session
+
+    # Remove and return every session idle for longer than the timeout
+    def expire(self, now: Optional[float] = None) -> List:
+        cutoff = (now or time.time()) - self.timeout
+        expired = []
+        # Least recently used first, so stop at the first session still active
+        for key, session in list(self.sessions.items()):
+            if session.last_active > cutoff:
+                break
+            del self.sessions[key]
+            expired.append(session)
+        self.evicted_timeout += len(expired)
+        return expired
+
+    # Replace every session (in least recently used order) and the counters,
+    # to carry them over a reload of the owning cog
+    def restore(self, sessions: List[tuple], stats: Dict[str, int]):
+        self.sessions = OrderedDict(sessions)
+        for counter in ("peak", "started", "finished", "evicted_lru", "evicted_timeout"):
+            setattr(self, counter, stats.get(counter, 0))
+
+    # Session metrics
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": len(self.sessions),
+            "capacity": self.capacity,
+            "peak": self.peak,
+            "started": self.started,
+            "finished": self.finished,
+            "evicted_lru": self.evicted_lru,
+            "evicted_timeout": self.evicted_timeout,
+        }
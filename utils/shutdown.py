@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import signal
+import time
+from typing import Any, Dict
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+class GracefulShutdown:
+    """
+    Drains the bot before it disconnects.
+
+    Once started, new interactions are refused (the command tree and
+    persistent buttons check `stopping`), then, within `deadline` seconds
+    overall: interactions already running and the writes they queued on the
+    guild actors are waited for, the log digest is flushed into the outbound
+    queue, the scheduler's running jobs and the outbound queues are drained,
+    and every cog with a `prepare_shutdown` method saves what it needs to
+    resume. Whatever is left when the deadline
+    passes is dropped and reported.
+    """
+
+    def __init__(self, bot, deadline: float = 15.0):
+        self.bot = bot
+        self.deadline = deadline
+        self.stopping = False
+        self.finished = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.report: Dict[str, Any] = {}
+
+    # Close the bot on SIGTERM and SIGINT instead of dying mid-write
+    def install_signal_handlers(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self._on_signal, sig)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not supported on this platform (Windows)
+
+    def _on_signal(self, sig: signal.Signals):
+        logger.info("Received %s, shutting down", sig.name)
+        if not self.stopping:
+            asyncio.create_task(self.bot.close())
+
+    # Track an interaction being handled, use as `with shutdown.track():`
+    def track(self):
+        return _Tracked(self)
+
+    # Reply to an interaction that arrives while shutting down, returns whether it was refused
+    async def refuse(self, interaction: discord.Interaction) -> bool:
+        if not self.stopping:
+            return False
+        self.report["refused"] = self.report.get("refused", 0) + 1
+        if interaction.type is not discord.InteractionType.autocomplete and not interaction.response.is_done():
+            try:
+                await interaction.response.send_message("The bot is restarting, please try again in a moment.", ephemeral=True)
+            except discord.HTTPException:
+                pass
+        return True
+
+    def _remaining(self, started: float) -> float:
+        return max(self.deadline - (time.monotonic() - started), 0.0)
+
+    async def drain(self) -> Dict[str, Any]:
+        self.stopping = True
+        started = time.monotonic()
+        logger.info("Shutting down, draining for up to %ss", self.deadline)
+
+        # Interactions already being handled
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self._remaining(started))
+        except asyncio.TimeoutError:
+            pass
+        self.report["interactions_unfinished"] = self.in_flight
+
+        # Writes already queued on the guild actors
+        self.report["actor_jobs_unfinished"] = await self.bot.actors.drain(self._remaining(started))
+
+        # Let every cog save what it needs to pick up after the restart
+        for name, cog in list(self.bot.cogs.items()):
+            prepare = getattr(cog, "prepare_shutdown", None)
+            if prepare is None:
+                continue
+            try:
+                self.report.update(await prepare() or {})
+            except Exception:
+                logger.exception("Cog %s failed to prepare for shutdown", name)
+
+        # Stickies are reposted on the next message after the restart anyway
+        skipped = 0
+        for sticky in self.bot.stickies.stickies.values():
+            if sticky.timer and not sticky.timer.done():
+                sticky.timer.cancel()
+                skipped += 1
+        self.report["sticky_reposts_skipped"] = skipped
+
+        # Jobs stay in the database until they finish, so unfinished ones run again on restart
+        self.report["jobs_unfinished"] = await self.bot.scheduler.drain(self._remaining(started))
+
+        # Buffered log entries go out through the outbound queue
+        self.bot.log_digest.flush_all()
+        await self.bot.outbound.drain(self._remaining(started))
+        self.report["outbound_dropped"] = self.bot.outbound.discard()
+
+        self.report["drain_seconds"] = round(time.monotonic() - started, 2)
+        dropped = self.report["outbound_dropped"] + self.report["interactions_unfinished"]
+        log = logger.warning if dropped else logger.info
+        log("Drain finished: %s", ", ".join(f"{key}={value}" for key, value in self.report.items()))
+        return self.report
+
+
+class _Tracked:
+    __slots__ = ("shutdown",)
+
+    def __init__(self, shutdown: GracefulShutdown):
+        self.shutdown = shutdown
+
+    def __enter__(self):
+        self.shutdown.in_flight += 1
+        self.shutdown._idle.clear()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown.in_flight -= 1
+        if self.shutdown.in_flight == 0:
+            self.shutdown._idle.set()
+        return False
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+class Sticky:
+    """A message kept at the bottom of a channel."""
+
+    __slots__ = ("guild_id", "channel_id", "content", "message_id", "persist", "timer")
+
+    def __init__(self, guild_id: int, channel_id: int, content: str, message_id: Optional[int], persist: Optional[Callable[["Sticky"], None]]):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.content = content
+        self.message_id = message_id
+        self.persist = persist
+        self.timer: Optional[asyncio.Task] = None
+
+
+class StickyManager:
+    """
+    Debounced sticky message engine.
+
+    Each registered channel keeps its sticky's message ID in memory. A message
+    in the channel (re)starts a quiet period timer, and only once the channel
+    has been quiet for `quiet_period` seconds is the old sticky deleted by ID
+    (no fetch) and the new one posted. A join wave of intros therefore costs
+    one delete and one send instead of a fetch, delete and send per message.
+    """
+
+    def __init__(self, bot, quiet_period: float = 5.0):
+        self.bot = bot
+        self.quiet_period = quiet_period
+        self.stickies: Dict[int, Sticky] = {}
+        self.reposts = 0
+        self.debounced = 0
+
+    # Start managing a sticky, persist is called with the sticky after every repost
+    def register(self, guild_id: int, channel_id: int, content: str, message_id=None, persist: Optional[Callable[[Sticky], None]] = None) -> Sticky:
+        self.unregister(channel_id)
+        sticky = Sticky(guild_id, channel_id, content, int(message_id) if message_id else None, persist)
+        self.stickies[channel_id] = sticky
+        return sticky
+
+    # Stop managing a channel's sticky, returns it if there was one
+    def unregister(self, channel_id: int) -> Optional[Sticky]:
+        sticky = self.stickies.pop(channel_id, None)
+        if sticky and sticky.timer:
+            sticky.timer.cancel()
+        return sticky
+
+    def get(self, channel_id: int) -> Optional[Sticky]:
+        return self.stickies.get(channel_id)
+
+    # Every sticky in a guild
+    def for_guild(self, guild_id: int) -> List[Sticky]:
+        return [s for s in self.stickies.values() if s.guild_id == guild_id]
+
+    # Note activity in a channel, returns whether the channel has a sticky
+    def touch(self, channel_id: int) -> bool:
+        sticky = self.stickies.get(channel_id)
+        if sticky is None:
+            return False
+        if sticky.timer and not sticky.timer.done():
+            sticky.timer.cancel()
+            self.debounced += 1
+        sticky.timer = asyncio.create_task(self._repost_later(sticky))
+        return True
+
+    async def _repost_later(self, sticky: Sticky):
+        await asyncio.sleep(self.quiet_period)
+        sticky.timer = None
+        await self.repost(sticky)
+
+    # Move a sticky to the bottom of its channel
+    async def repost(self, sticky: Sticky):
+        channel = self.bot.get_channel(sticky.channel_id)
+        if channel is None:
+            logger.warning("Sticky channel %s not found in guild %s", sticky.channel_id, sticky.guild_id)
+            return
+
+        # Delete the previous sticky straight from its ID
+        if sticky.message_id:
+            try:
+                await channel.get_partial_message(sticky.message_id).delete()
+            except (discord.NotFound, discord.Forbidden):
+                pass  # Message already deleted or can't be deleted
+
+        message = await self.bot.outbound.send(channel, sticky.content, coalesce=False)
+        if message is None:
+            return
+        sticky.message_id = message.id
+        self.reposts += 1
+        if sticky.persist:
+            sticky.persist(sticky)
+
+    # Sticky metrics
+    def stats(self) -> Dict[str, int]:
+        return {
+            "stickies": len(self.stickies),
+            "pending": sum(1 for s in self.stickies.values() if s.timer and not s.timer.done()),
+            "reposts": self.reposts,
+            "debounced": self.debounced,
+        }
@@ -0,0 +1,348 @@
+import asyncio
+import codecs
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import Storage
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library codec
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Tokens at the levels the streaming loader builds itself. A string running
+# into the end of the buffer matches too, so a token cut off by a chunk
+# boundary can be spotted and matched again after the next read.
+TOKEN = re.compile(r'\s*(?:("(?:[^"\\]|\\.)*(?:"|\\?\Z))|([{}\[\]:,])|([^\s{}\[\]:,"]+))')
+
+
+# Regex matching a complete object or array nested at most `depth` levels,
+# so the end of a leaf value can be found without decoding it in Python.
+# Runs of plain text alternate with strings and inner containers, which all
+# start with a different character, so a failed match never backtracks.
+def _container_pattern(depth: int) -> str:
+    string = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+    text = r'[^{}\[\]"]*'
+    container = None
+    for _ in range(depth):
+        item = f"(?:{string}|{container})" if container else string
+        inner = f"{text}(?:{item}{text})*"
+        container = rf"(?:\{{{inner}\}}|\[{inner}\])"
+    return container
+
+
+# A user record with a list of warnings, each a flat object, is three levels deep
+LEAF = re.compile(_container_pattern(3))
+# An object member whose value is a leaf, with the separator after it
+MEMBER = re.compile(rf'\s*("[^"\\]*(?:\\.[^"\\]*)*")\s*:\s*({_container_pattern(3)})\s*([,}}])')
+
+
+def dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class StreamingLoader:
+    """
+    Incremental loader for large JSON files.
+
+    The file is read and decoded in `chunk_size` pieces. Containers near the
+    root are built token by token, and every value `leaf_depth` levels deep
+    or more is decoded in one go by the json module's C scanner as soon as
+    its text is in. For the database that is each user record (table,
+    document, "data", "users", user), so the whole file is never held in
+    memory next to the objects built from it.
+    """
+
+    def __init__(self, path: str, leaf_depth: int = 5, chunk_size: int = 1 << 20, progress: Optional[Callable[[int, int], None]] = None):
+        self.path = path
+        self.leaf_depth = leaf_depth
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.decoder = json.JSONDecoder()
+        self.keys: Dict[str, str] = {}
+        self.file = None
+        self.text_decoder = None
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        self.total = 0
+
+    def load(self) -> Any:
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        with open(self.path, "rb") as self.file:
+            self.total = os.fstat(self.file.fileno()).st_size
+            return self._value(0)
+
+    # Drop the consumed text and read the next chunk, returns False at the end of the file
+    def _fill(self, size: Optional[int] = None) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(size or self.chunk_size)
+        self.eof = not chunk
+        text = self.text_decoder.decode(chunk, final=self.eof)
+        if self.eof and not text:
+            return False
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        self.bytes_read += len(chunk)
+        if self.progress:
+            self.progress(self.bytes_read, self.total)
+        return True
+
+    def _token(self) -> re.Match:
+        while True:
+            match = TOKEN.match(self.buf, self.pos)
+            # A token touching the end of the buffer may continue in the next chunk
+            if match and (match.end() < len(self.buf) or self.eof):
+                self.pos = match.end()
+                return match
+            if not self._fill():
+                if match:
+                    self.pos = match.end()
+                    return match
+                raise ValueError(f"Unexpected end of JSON in {self.path}")
+
+    def _value(self, depth: int, match: Optional[re.Match] = None) -> Any:
+        match = match or self._token()
+        string, punct, literal = match.groups()
+        if punct in ("{", "["):
+            if depth >= self.leaf_depth:
+                return self._leaf(match.start(2))
+            return self._object(depth) if punct == "{" else self._array(depth)
+        if punct:
+            raise ValueError(f"Unexpected {punct!r} in {self.path}")
+        return loads(string if string is not None else literal)
+
+    def _object(self, depth: int) -> Dict[str, Any]:
+        obj = {}
+        match = self._token()
+        if match.group(2) == "}":
+            return obj
+        while True:
+            if match.group(1) is None:
+                raise ValueError(f"Expected an object key in {self.path}")
+            key = loads(match.group(1))
+            if self._token().group(2) != ":":
+                raise ValueError(f"Expected ':' after {key!r} in {self.path}")
+            obj[key] = self._value(depth + 1)
+            separator = self._token().group(2)
+            if separator == "}":
+                return obj
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' after {key!r} in {self.path}")
+
+            # Members holding leaves (each user in "users") are matched whole
+            # while they're in the buffer, one regex match and decode each
+            if orjson is not None and depth + 1 >= self.leaf_depth:
+                while True:
+                    member = MEMBER.match(self.buf, self.pos)
+                    if not member or member.end() == len(self.buf):
+                        break
+                    key, value, separator = member.groups()
+                    obj[orjson.loads(key)] = orjson.loads(value)
+                    self.pos = member.end()
+                    if separator == "}":
+                        return obj
+            match = self._token()
+
+    def _array(self, depth: int) -> list:
+        array = []
+        match = self._token()
+        if match.group(2) == "]":
+            return array
+        while True:
+            array.append(self._value(depth + 1, match))
+            separator = self._token().group(2)
+            if separator == "]":
+                return array
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in {self.path}")
+            match = self._token()
+
+    # Reuse one string object per distinct key, as a single json.loads would
+    def _share_keys(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            keys = self.keys
+            return {keys.setdefault(key, key): self._share_keys(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._share_keys(item) for item in value]
+        return value
+
+    # Decode the container starting at `start` in one go, reading more until all of it is in
+    def _leaf(self, start: int) -> Any:
+        self.pos = start
+        # Fast path: find the end with a regex and let orjson decode it, its
+        # key cache shares key strings between records
+        if orjson is not None:
+            while True:
+                match = LEAF.match(self.buf, self.pos)
+                if match:
+                    self.pos = match.end()
+                    return orjson.loads(match.group())
+                # Nested deeper than LEAF handles, or cut off by the end of the buffer
+                if len(self.buf) - self.pos > self.chunk_size or not self._fill():
+                    break
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off by the end of the buffer, read at least
+                # as much again so a large value isn't rescanned per chunk
+                if not self._fill(max(self.chunk_size, len(self.buf) - self.pos)):
+                    raise
+                continue
+            self.pos = end
+            return self._share_keys(value)
+
+
+class FastJSONStorage(Storage):
+    """
+    TinyDB storage using orjson (or the standard library if it isn't installed).
+
+    The file format is the same as TinyDB's JSONStorage, so existing database
+    files load unchanged. Reads stream the file through StreamingLoader, so
+    startup never holds the raw file and the parsed database at once. Writes
+    go to a temporary file that is fsynced and renamed over the database, so
+    a crash mid-write never leaves a truncated database behind.
+    """
+
+    def __init__(self, path: str, create_dirs: bool = False, **kwargs):
+        super().__init__()
+        self.path = path
+        if create_dirs:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return None
+        # An empty file is an empty database
+        if size == 0:
+            return None
+
+        # Imported here so the storage doesn't pull in discord.py for offline tools
+        from utils.runtime import current_rss_mb
+
+        started = time.perf_counter()
+        next_report = [0.1]
+
+        # Log every 10% of a file big enough to take a while
+        def progress(read: int, total: int):
+            if total >= 8 * (1 << 20) and read / total >= next_report[0]:
+                logger.info("Loading %s: %d%% (%.1f MB)", self.path, read * 100 // total, read / (1 << 20))
+                next_report[0] = read / total + 0.1
+
+        data = StreamingLoader(self.path, progress=progress).load()
+        logger.info(
+            "Loaded %s (%.1f MB) in %.2fs, RSS %.1f MB",
+            self.path, size / (1 << 20), time.perf_counter() - started, current_rss_mb()
+        )
+        return data
+
+    def write(self, data: Dict[str, Dict[str, Any]]):
+        self.write_raw(dumps(data))
+
+    # Atomically replace the database with already encoded data, safe to call from a worker thread
+    def write_raw(self, raw: bytes):
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        pass
+
+
+class FlushingCachingMiddleware(CachingMiddleware):
+    """
+    TinyDB's CachingMiddleware, only written to disk when flushed.
+
+    Every read and write is served from memory, and `flush` (called on a
+    timer and at shutdown) writes the cache to the storage if anything
+    changed since the last flush.
+    """
+
+    # Never flush on write count, the owner flushes explicitly
+    WRITE_CACHE_SIZE = float("inf")
+
+    def __init__(self, storage_cls):
+        super().__init__(storage_cls)
+        # Keeps overlapping flushes from renaming files out of order
+        self._flush_lock = asyncio.Lock()
+        # Each encoded snapshot gets a generation, and a write older than the last
+        # one on disk is skipped. A sync flush or a cancelled flush_async (whose
+        # thread keeps writing) can't then put older data over newer
+        self._write_lock = threading.Lock()
+        self._generation = 0
+        self._written_generation = 0
+
+    @property
+    def dirty(self) -> bool:
+        return self._cache_modified_count > 0
+
+    # Number of writes waiting for the next flush
+    @property
+    def pending_writes(self) -> int:
+        return self._cache_modified_count
+
+    def _encode(self):
+        self._generation += 1
+        return dumps(self.cache), self._generation
+
+    # Write a snapshot unless a newer one is already on disk, safe to call from a worker thread
+    def _write(self, raw: bytes, generation: int):
+        with self._write_lock:
+            if generation <= self._written_generation:
+                return
+            self.storage.write_raw(raw)
+            self._written_generation = generation
+
+    # Flush on the calling thread, ordered with any flush_async still writing
+    def flush(self):
+        if not self.dirty:
+            return
+        raw, generation = self._encode()
+        pending = self._cache_modified_count
+        self._cache_modified_count = 0
+        try:
+            self._write(raw, generation)
+        except Exception:
+            self._cache_modified_count += pending
+            raise
+
+    # Flush without blocking the event loop on disk I/O. The cache is encoded
+    # first, on the loop, so it can keep changing while the file is written.
+    async def flush_async(self):
+        async with self._flush_lock:
+            if not self.dirty:
+                return
+            raw, generation = self._encode()
+            pending = self._cache_modified_count
+            self._cache_modified_count = 0
+            try:
+                await asyncio.to_thread(self._write, raw, generation)
+            except Exception:
+                # Keep the changes marked as unwritten so the next flush retries
+                self._cache_modified_count += pending
+                raise
@@ -0,0 +1,302 @@
+import functools
+import glob
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+import discord
+from discord import app_commands
+
+logger = logging.getLogger(__name__)
+
+# OpenTelemetry span kinds and status codes, as they appear in OTLP JSON
+SPAN_KINDS = {
+    "internal": "SPAN_KIND_INTERNAL",
+    "server": "SPAN_KIND_SERVER",
+    "client": "SPAN_KIND_CLIENT",
+    "consumer": "SPAN_KIND_CONSUMER",
+}
+STATUS_OK = "STATUS_CODE_OK"
+STATUS_ERROR = "STATUS_CODE_ERROR"
+
+# The span the running code is in
+_current_span: ContextVar[Optional["Span"]] = ContextVar("trace_span", default=None)
+
+
+class Span:
+    """One timed operation in a trace. Unsampled spans only carry the sampling decision."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start", "end", "attributes", "status", "message", "sampled")
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: Optional[str], sampled: bool, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}" if sampled else ""
+        self.parent_id = parent_id
+        self.start = time.time_ns()
+        self.end = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = STATUS_OK
+        self.message = None
+        self.sampled = sampled
+
+    def set_attribute(self, key: str, value: Any):
+        if self.sampled:
+            self.attributes[key] = value
+
+    # The span in OTLP JSON, one line of the trace file
+    def to_otel(self, service_name: str) -> Dict[str, Any]:
+        span = {
+            "resource": {"service.name": service_name},
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": SPAN_KINDS.get(self.kind, SPAN_KINDS["internal"]),
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": [{"key": key, "value": otel_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status},
+        }
+        if self.message:
+            span["status"]["message"] = self.message
+        return span
+
+
+# An attribute value in OTLP JSON
+def otel_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class _SpanContext:
+    """Context manager that makes a span current for the code inside it."""
+
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self.tracer = tracer
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self.token)
+        self.tracer.end_span(self.span, exc)
+        return False
+
+
+class _NoSpan:
+    """Stands in for the children of an unsampled span, does nothing at all."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """
+    Span based tracing written to JSON lines files.
+
+    `span` opens a span under whichever span is current (tracked with a
+    context variable, so it follows awaits and the tasks they create). Root
+    spans are sampled at `sample_rate` and their children follow the
+    decision, so an unsampled trace costs a context variable lookup per
+    child. A span whose parent has already ended (a long lived task started
+    inside a command) starts a new trace. Finished spans are queued to a
+    writer thread that appends them to a daily file in `directory`, one
+    OTLP JSON span per line, and deletes files older than `retention_days`.
+    """
+
+    def __init__(self, directory: str = "data/traces", sample_rate: float = 0.1, service_name: str = "dweller-bot", retention_days: int = 7):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.service_name = service_name
+        self.retention_days = retention_days
+        self.queue: "queue.SimpleQueue[Optional[Span]]" = queue.SimpleQueue()
+        self.thread: Optional[threading.Thread] = None
+        self.traces = 0
+        self.spans = 0
+        self.written = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    # Open a span, use as `with tracer.span(...) as span:`. sample_rate overrides
+    # the tracer's rate if this span starts a trace.
+    def span(self, name: str, kind: str = "internal", attributes: Optional[Dict[str, Any]] = None, sample_rate: Optional[float] = None):
+        if not self.enabled:
+            return NO_SPAN
+        parent = _current_span.get()
+        if parent is not None and parent.end is None:
+            if not parent.sampled:
+                return NO_SPAN
+            span = Span(name, kind, parent.trace_id, parent.span_id, True, attributes)
+        else:
+            rate = self.sample_rate if sample_rate is None else sample_rate
+            sampled = random.random() < rate
+            span = Span(name, kind, f"{random.getrandbits(128):032x}" if sampled else "", None, sampled, attributes)
+            if sampled:
+                self.traces += 1
+        return _SpanContext(self, span)
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None):
+        span.end = time.time_ns()
+        if not span.sampled:
+            return
+        if error is not None:
+            span.status = STATUS_ERROR
+            span.message = f"{type(error).__name__}: {error}"
+        self.spans += 1
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._write, name="trace-writer", daemon=True)
+            self.thread.start()
+        self.queue.put(span)
+
+    # Append queued spans to today's file, in batches
+    def _write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        day = None
+        while True:
+            spans = [self.queue.get()]
+            while True:
+                try:
+                    spans.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = None in spans
+            spans = [span for span in spans if span is not None]
+            try:
+                today = datetime.now().strftime("%Y-%m-%d")
+                if today != day:
+                    day = today
+                    self._remove_old_files()
+                with open(os.path.join(self.directory, f"traces-{today}.jsonl"), "a", encoding="utf-8") as f:
+                    for span in spans:
+                        f.write(json.dumps(span.to_otel(self.service_name), separators=(",", ":"), default=str) + "\n")
+                self.written += len(spans)
+            except Exception:
+                self.errors += 1
+                logger.exception("Failed to write %s trace spans", len(spans))
+            if done:
+                return
+
+    def _remove_old_files(self):
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for path in glob.glob(os.path.join(self.directory, "traces-*.jsonl")):
+            if os.path.basename(path)[len("traces-"):-len(".jsonl")] < cutoff:
+                os.remove(path)
+
+    # Write every queued span and stop the writer
+    def close(self, timeout: float = 5.0):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    # Tracing metrics
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "traces": self.traces,
+            "spans": self.spans,
+            "written": self.written,
+            "write_errors": self.errors,
+        }
+
+
+# Wrap an object's public methods (or just `names`) in spans called "<prefix>.<method>"
+def instrument(obj: Any, prefix: str, tracer: Tracer, names: Optional[Iterable[str]] = None, kind: str = "internal"):
+    if names is None:
+        names = [name for name, _ in inspect.getmembers(type(obj), callable) if not name.startswith("_")]
+    for name in names:
+        method = getattr(obj, name)
+        # Generators run after the call returns, a span around the call would time nothing
+        if inspect.isgeneratorfunction(method) or inspect.isasyncgenfunction(method):
+            continue
+        setattr(obj, name, _traced(method, f"{prefix}.{name}", tracer, kind))
+
+
+def _traced(method, span_name: str, tracer: Tracer, kind: str):
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def traced_async(*args, **kwargs):
+            with tracer.span(span_name, kind):
+                return await method(*args, **kwargs)
+        return traced_async
+
+    @functools.wraps(method)
+    def traced(*args, **kwargs):
+        with tracer.span(span_name, kind):
+            return method(*args, **kwargs)
+    return traced
+
+
+# Trace every Discord REST request, both the bot's HTTP client and the
+# webhook adapter that interaction responses and followups go through
+def instrument_http(http: discord.http.HTTPClient, tracer: Tracer):
+    # The webhook adapter is a discord.py internal, fail at startup if it has moved
+    try:
+        from discord.webhook.async_ import async_context
+        adapter = async_context.get()
+    except (ImportError, LookupError) as e:
+        raise RuntimeError(f"discord.py {discord.__version__} no longer has a shared webhook adapter to trace") from e
+    if not callable(getattr(adapter, "request", None)):
+        raise RuntimeError(f"discord.py {discord.__version__} webhook adapter has no request method to trace")
+
+    def wrap(request):
+        @functools.wraps(request)
+        async def traced_request(route, *args, **kwargs):
+            path = getattr(route, "path", None) or getattr(route, "url", "")
+            with tracer.span(f"discord {route.method} {path}", "client", {"http.method": route.method, "http.route": path}):
+                return await request(route, *args, **kwargs)
+        return traced_request
+
+    http.request = wrap(http.request)
+    adapter.request = wrap(adapter.request)
+
+
+class TracingCommandTree(app_commands.CommandTree):
+    """Command tree that runs each application command and autocomplete in a root span."""
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        tracer: Optional[Tracer] = getattr(self.client, "tracer", None)
+        if tracer is None:
+            return await super()._call(interaction)
+
+        name = (interaction.data or {}).get("name", "unknown")
+        prefix = "autocomplete" if interaction.type is discord.InteractionType.autocomplete else "interaction"
+        attributes = {
+            "discord.interaction.type": interaction.type.name,
+            "discord.command": name,
+            "discord.guild_id": interaction.guild_id or 0,
+            "discord.user_id": interaction.user.id,
+        }
+        with tracer.span(f"{prefix} /{name}", "server", attributes):
+            return await super()._call(interaction)